@@ -3,6 +3,7 @@ from app.models import user, project, task,membership
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import Uuid
 from app.core.database import Base
 from app.core.config import settings
 
@@ -30,6 +31,27 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def comparison_options(dialect_name: str) -> dict:
+    """Keep autogenerate / ``alembic check`` from reporting differences that
+    only exist because of the database in use."""
+
+    def include_object(object, name, type_, reflected, compare_to):
+        # indexes declared with .ddl_if(dialect=...) only exist on that database
+        ddl_if = getattr(object, "_ddl_if", None)
+        if type_ == "index" and not reflected and ddl_if is not None and ddl_if.dialect:
+            dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+            return dialect_name in dialects
+        return True
+
+    def compare_type(context, inspected_column, metadata_column, inspected_type, metadata_type):
+        # SQLite has no UUID type: the column is created as UUID and reflected as NUMERIC
+        if dialect_name == "sqlite" and isinstance(metadata_type, Uuid):
+            return False
+        return None
+
+    return {"include_object": include_object, "compare_type": compare_type}
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -48,6 +70,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        **comparison_options(url.partition(":")[0].partition("+")[0]),
     )
 
     with context.begin_transaction():
@@ -69,7 +92,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            **comparison_options(connection.dialect.name),
         )
 
         with context.begin_transaction():
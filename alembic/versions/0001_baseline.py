@@ -0,0 +1,101 @@
+"""baseline schema with indexes for the hot queries
+
+Revision ID: 0001_baseline
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'projects',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('owner_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.Enum('active', 'archived', 'completed', name='projectstatus'), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_projects_name', 'projects', ['name'])
+    op.create_index('ix_projects_owner_id', 'projects', ['owner_id'])
+    op.create_index(
+        'ix_projects_live_created_at', 'projects', ['created_at', 'id'],
+        postgresql_where=sa.text('is_deleted = false'),
+        sqlite_where=sa.text('is_deleted = 0'),
+    )
+
+    op.create_table(
+        'project_members',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('role', sa.Enum('owner', 'admin', 'member', 'viewer', name='memberrole'), nullable=False),
+        sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'user_id', name='_project_user_uc'),
+    )
+    op.create_index('ix_project_members_user_id', 'project_members', ['user_id', 'project_id'])
+
+    op.create_table(
+        'tasks',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('assignee_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', sa.Enum('backlog', 'todo', 'in_progress', 'done', name='taskstatus'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['assignee_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'])
+    op.create_index('ix_tasks_assignee_id', 'tasks', ['assignee_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index('ix_project_members_user_id', table_name='project_members')
+    op.drop_table('project_members')
+    op.drop_index('ix_projects_live_created_at', table_name='projects')
+    op.drop_index('ix_projects_owner_id', table_name='projects')
+    op.drop_index('ix_projects_name', table_name='projects')
+    op.drop_table('projects')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='taskstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='memberrole').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='projectstatus').drop(op.get_bind(), checkfirst=True)
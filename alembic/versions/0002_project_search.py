@@ -0,0 +1,44 @@
+"""project search indexes (pg_trgm + full-text)
+
+Revision ID: 0002_project_search
+Revises: 0001_baseline
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.project import PROJECT_SEARCH_DDL
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_project_search'
+down_revision: Union[str, Sequence[str], None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(PROJECT_SEARCH_DDL)
+    op.create_index(
+        'ix_projects_name_trgm', 'projects', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_projects_search_document', 'projects',
+        [sa.text('project_search_document(name, description)')],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_projects_search_document', table_name='projects')
+    op.drop_index('ix_projects_name_trgm', table_name='projects')
+    op.execute('DROP FUNCTION IF EXISTS project_search_document(text, text)')
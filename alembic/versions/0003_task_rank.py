@@ -0,0 +1,53 @@
+"""fractional rank for tasks within a board column
+
+Revision ID: 0003_task_rank
+Revises: 0002_project_search
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.ranking import ranks_between
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_task_rank'
+down_revision: Union[str, Sequence[str], None] = '0002_project_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column(
+        'rank', sa.String(length=255).with_variant(sa.String(length=255, collation='C'), 'postgresql'),
+        nullable=True))
+
+    # existing cards keep their creation order within each column
+    bind = op.get_bind()
+    tasks = sa.table('tasks', sa.column('id'), sa.column('project_id'), sa.column('status'),
+                     sa.column('created_at'), sa.column('rank'))
+    rows = bind.execute(sa.select(tasks.c.id, tasks.c.project_id, tasks.c.status).order_by(
+        tasks.c.project_id, tasks.c.status, tasks.c.created_at, tasks.c.id)).all()
+    for _, column in groupby(rows, key=lambda row: (row.project_id, row.status)):
+        ids = [row.id for row in column]
+        bind.execute(
+            tasks.update().where(tasks.c.id == sa.bindparam('task_id')).values(rank=sa.bindparam('new_rank')),
+            [{'task_id': task_id, 'new_rank': rank} for task_id, rank in zip(ids, ranks_between(None, None, len(ids)))],
+        )
+
+    with op.batch_alter_table('tasks') as batch:
+        batch.alter_column('rank', existing_type=sa.String(length=255), nullable=False)
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.create_index('ix_tasks_project_status_rank', 'tasks', ['project_id', 'status', 'rank'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_status_rank', table_name='tasks')
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'])
+    with op.batch_alter_table('tasks') as batch:
+        batch.drop_column('rank')
@@ -0,0 +1,31 @@
+"""project and board version counters for ETags
+
+Revision ID: 0004_project_versions
+Revises: 0003_task_rank
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_project_versions'
+down_revision: Union[str, Sequence[str], None] = '0003_task_rank'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('projects', sa.Column('board_version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('projects') as batch:
+        batch.drop_column('board_version')
+        batch.drop_column('version')
@@ -0,0 +1,90 @@
+"""per-column task counters and status transition history
+
+Revision ID: 0005_board_stats
+Revises: 0004_project_versions
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import ServerTimestamp
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_board_stats'
+down_revision: Union[str, Sequence[str], None] = '0004_project_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('backlog', 'todo', 'in_progress', 'done')
+# the type already exists on Postgres (tasks.status)
+task_status = sa.Enum(*STATUSES, name='taskstatus').with_variant(
+    postgresql.ENUM(*STATUSES, name='taskstatus', create_type=False), 'postgresql')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_status_counts',
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('status', task_status, nullable=False),
+        sa.Column('count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'status'),
+    )
+    op.create_table(
+        'task_status_transitions',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('task_id', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('from_status', task_status, nullable=True),
+        sa.Column('to_status', task_status, nullable=False),
+        sa.Column('changed_at', ServerTimestamp, server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_status_transitions_project_changed_at', 'task_status_transitions',
+                    ['project_id', 'changed_at'])
+    op.create_index('ix_task_status_transitions_task_id', 'task_status_transitions', ['task_id', 'changed_at'])
+
+    bind = op.get_bind()
+    projects = sa.table('projects', sa.column('id', sa.UUID()))
+    tasks = sa.table('tasks', sa.column('id', sa.UUID()), sa.column('project_id', sa.UUID()),
+                     sa.column('status'), sa.column('created_at', ServerTimestamp))
+    counts = sa.table('project_status_counts', sa.column('project_id', sa.UUID()), sa.column('status'),
+                      sa.column('count'))
+    transitions = sa.table('task_status_transitions', sa.column('id', sa.UUID()), sa.column('task_id', sa.UUID()),
+                           sa.column('project_id', sa.UUID()), sa.column('to_status'),
+                           sa.column('changed_at', ServerTimestamp))
+
+    existing = {(row.project_id, row.status): row.count for row in bind.execute(
+        sa.select(tasks.c.project_id, tasks.c.status, sa.func.count().label('count'))
+        .group_by(tasks.c.project_id, tasks.c.status))}
+    project_ids = bind.execute(sa.select(projects.c.id)).scalars().all()
+    rows = [{'project_id': project_id, 'status': status, 'count': existing.get((project_id, status), 0)}
+            for project_id in project_ids for status in STATUSES]
+    if rows:
+        bind.execute(counts.insert(), rows)
+
+    now = datetime.now(timezone.utc)
+    # history starts with each existing task entering its current column when
+    # it was created; earlier moves were never recorded
+    history = [{'id': uuid.uuid4(), 'task_id': row.id, 'project_id': row.project_id, 'to_status': row.status,
+                'changed_at': row.created_at or now}
+               for row in bind.execute(sa.select(tasks.c.id, tasks.c.project_id, tasks.c.status, tasks.c.created_at))]
+    for start in range(0, len(history), 1000):
+        bind.execute(transitions.insert(), history[start:start + 1000])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_status_transitions_task_id', table_name='task_status_transitions')
+    op.drop_index('ix_task_status_transitions_project_changed_at', table_name='task_status_transitions')
+    op.drop_table('task_status_transitions')
+    op.drop_table('project_status_counts')
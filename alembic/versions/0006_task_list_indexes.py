@@ -0,0 +1,35 @@
+"""covering indexes for the task listing endpoint
+
+Revision ID: 0006_task_list_indexes
+Revises: 0005_board_stats
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_task_list_indexes'
+down_revision: Union[str, Sequence[str], None] = '0005_board_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_created_at', 'tasks', ['project_id', 'created_at', 'id'],
+                    postgresql_include=['status', 'assignee_id', 'title'])
+    # the new assignee index starts with assignee_id, so it replaces the old one
+    op.create_index('ix_tasks_assignee_created_at', 'tasks', ['assignee_id', 'created_at', 'id'],
+                    postgresql_include=['status', 'project_id', 'title'])
+    op.drop_index('ix_tasks_assignee_id', table_name='tasks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_assignee_id', 'tasks', ['assignee_id'])
+    op.drop_index('ix_tasks_assignee_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_project_created_at', table_name='tasks')
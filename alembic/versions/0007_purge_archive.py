@@ -0,0 +1,88 @@
+"""archive tables for purged projects
+
+Revision ID: 0007_purge_archive
+Revises: 0006_task_list_indexes
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import ServerTimestamp
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_purge_archive'
+down_revision: Union[str, Sequence[str], None] = '0006_task_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def existing_enum(name, *values):
+    # the types already exist on Postgres (projects, project_members, tasks)
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), 'postgresql')
+
+
+project_status = existing_enum('projectstatus', 'active', 'archived', 'completed')
+member_role = existing_enum('memberrole', 'owner', 'admin', 'member', 'viewer')
+task_status = existing_enum('taskstatus', 'backlog', 'todo', 'in_progress', 'done')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'archived_projects',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('owner_id', sa.UUID(), nullable=False),
+        sa.Column('status', project_status, nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.Column('created_at', ServerTimestamp, nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('board_version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', ServerTimestamp, server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'archived_project_members',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('role', member_role, nullable=False),
+        sa.Column('joined_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['archived_projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_archived_project_members_project_id', 'archived_project_members', ['project_id'])
+    op.create_table(
+        'archived_tasks',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('assignee_id', sa.UUID(), nullable=True),
+        sa.Column('status', task_status, nullable=False),
+        sa.Column('created_at', ServerTimestamp, nullable=True),
+        sa.Column('rank', sa.String(length=255), nullable=False),
+        sa.Column('archived_at', ServerTimestamp, server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_archived_tasks_project_id', 'archived_tasks', ['project_id'])
+    op.create_index('ix_projects_deleted_at', 'projects', ['deleted_at'],
+                    postgresql_where=sa.text('is_deleted = true'), sqlite_where=sa.text('is_deleted = 1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_deleted_at', table_name='projects')
+    op.drop_index('ix_archived_tasks_project_id', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
+    op.drop_index('ix_archived_project_members_project_id', table_name='archived_project_members')
+    op.drop_table('archived_project_members')
+    op.drop_table('archived_projects')
@@ -0,0 +1,185 @@
+import importlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._data)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# authenticated users keyed by (user_id, token id); see deps.get_current_user
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id) -> None:
+    principal_cache.delete_where(lambda key: key[0] == user_id)
+
+
+# generation tokens outlive the entries they guard
+_GENERATION_TTL = 24 * 3600.0
+
+
+class ResponseCache:
+    """Serialized read responses, invalidated through generation tokens.
+
+    Every entry key embeds the current generation of its scope (a project or
+    a user). Invalidating a scope replaces that token, orphaning all of its
+    entries at once. A missing token counts as a fresh generation, so an
+    evicted token only causes misses, never stale hits. Take keys *before*
+    reading the database: a read racing a write then stores its result under
+    the generation the write retires.
+
+    The backend needs ``get(key)``, ``set(key, value, ttl=None)`` and
+    ``delete(key)`` with string keys; values are ``(body, etag)`` tuples.
+    """
+
+    def __init__(self, backend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _generation(self, scope: str) -> str:
+        token_key = f"gen:{scope}"
+        token = self.backend.get(token_key)
+        if token is None:
+            token = uuid.uuid4().hex
+            self.backend.set(token_key, token, ttl=_GENERATION_TTL)
+        return token
+
+    def key(self, scope: str, *parts: Any) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return f"{scope}:{self._generation(scope)}:" + "|".join(map(str, parts))
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[bytes, str]]:
+        if key is None:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: Optional[str], body: bytes, etag: str) -> None:
+        if key is not None:
+            self.backend.set(key, (body, etag), ttl=self.ttl)
+
+    def invalidate(self, *scopes: str) -> None:
+        if not self.enabled:
+            return
+        for scope in scopes:
+            self.backend.set(f"gen:{scope}", uuid.uuid4().hex, ttl=_GENERATION_TTL)
+        with self._lock:
+            self.invalidations += len(scopes)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if hasattr(self.backend, "stats"):
+            stats["backend"] = self.backend.stats()
+        return stats
+
+
+def _response_cache_backend():
+    if settings.RESPONSE_CACHE_BACKEND:
+        module_name, _, attr = settings.RESPONSE_CACHE_BACKEND.partition(":")
+        return getattr(importlib.import_module(module_name), attr)()
+    return TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+# serialized project detail / list responses; see routers.projects
+response_cache = ResponseCache(
+    _response_cache_backend() if settings.RESPONSE_CACHE_ENABLED else None,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+
+def project_scope(project_id) -> str:
+    return f"project:{project_id}"
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
@@ -6,6 +7,109 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # serve requests from an AsyncEngine/AsyncSession instead of the threadpool;
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with an async driver swapped in
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # read replicas for GET endpoints, comma-separated (async drivers are
+    # swapped in like for DATABASE_URL); each is pinged every
+    # REPLICA_HEALTH_CHECK_SECONDS, and a user's reads stay on the primary for
+    # REPLICA_STICKY_SECONDS after their own write
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    REPLICA_STICKY_SECONDS: float = 5.0
+
+    # connection pool (per engine, i.e. per worker process); ignored for SQLite
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # server-side statement_timeout in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Argon2 cost parameters; stored hashes with other parameters are
+    # transparently rehashed on the next successful login
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 102400
+    ARGON2_PARALLELISM: int = 8
+    # dedicated hashing threads and how many extra requests may queue for
+    # them before new ones are rejected with 503
+    HASH_POOL_WORKERS: int = 4
+    HASH_POOL_QUEUE_LIMIT: int = 32
+
+    # bulk task endpoints: items accepted per request / rows per INSERT statement
+    TASK_BULK_MAX_ITEMS: int = 5000
+    TASK_BULK_CHUNK_SIZE: int = 500
+    # items accepted per POST /projects/{id}/members/batch
+    MEMBER_BATCH_MAX_ITEMS: int = 1000
+
+    # rewrite a board column's ranks in the background once a moved task's
+    # rank key grows past this many characters
+    TASK_RANK_REBALANCE_LENGTH: int = 24
+
+    # realtime board events: "module:Class" of the app.core.events.Broker that
+    # links worker processes, events buffered per slow subscriber before it is
+    # dropped, and the idle keep-alive interval of the stream
+    EVENTS_BROKER: str = "app.core.events:LocalBroker"
+    EVENTS_SUBSCRIBER_BUFFER: int = 256
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # max-age sent with ETag'd GET responses; 0 makes clients revalidate every time
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # serialized project detail / list responses, invalidated on writes;
+    # RESPONSE_CACHE_BACKEND is "module:Class" of a shared store (default: in-process LRU)
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_BACKEND: str = ""
+    RESPONSE_CACHE_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+
+    # render project lists and boards straight from row tuples (orjson when
+    # installed), skipping ORM entities and pydantic validation of trusted data
+    FAST_JSON: bool = False
+
+    # logging: level, JSON lines (false: plain text), records buffered for the
+    # writer thread before new ones are dropped, share of requests whose DEBUG
+    # lines are kept
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
+
+    # token-bucket rate limits per route class: sustained requests per minute
+    # and burst size, keyed by user id from the bearer token or else client IP
+    # ("auth" is login and sign-up, always per IP); 0 disables a class.
+    # RATE_LIMIT_BACKEND is "module:Class" of a shared app.core.ratelimit.BucketStore
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_BACKEND: str = ""
+    RATE_LIMIT_STORE_SIZE: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_AUTH_PER_MINUTE: float = 10
+    RATE_LIMIT_AUTH_BURST: int = 5
+    RATE_LIMIT_READ_PER_MINUTE: float = 600
+    RATE_LIMIT_READ_BURST: int = 100
+    RATE_LIMIT_WRITE_PER_MINUTE: float = 120
+    RATE_LIMIT_WRITE_BURST: int = 30
+
+    # soft-deleted projects can be restored for PURGE_RETENTION_DAYS; after that
+    # app.workers.purge moves them with their members and tasks to the archive
+    # tables (PURGE_ARCHIVE=false deletes them instead), PURGE_BATCH_SIZE rows
+    # per transaction. PURGE_INTERVAL_SECONDS > 0 also runs it inside the API
+    # process; otherwise run ``python -m app.workers.purge`` separately
+    PURGE_RETENTION_DAYS: int = 30
+    PURGE_ARCHIVE: bool = True
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_INTERVAL_SECONDS: float = 0
+
+    # shared secret for the /ops/ endpoints, sent as X-Ops-Token; empty turns them off
+    OPS_TOKEN: str = ""
+
+    # authenticated-user cache used by deps.get_current_user (0 disables it)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
     class Config:
         env_file = ".env"
 
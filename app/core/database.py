@@ -1,8 +1,71 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, DateTime
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+from app.core.instrumentation import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: Optional[str] = None) -> str:
+    """``url`` (default: the primary) with its driver swapped for an async one."""
+    if url is None:
+        if settings.ASYNC_DATABASE_URL:
+            return settings.ASYNC_DATABASE_URL
+        url = settings.DATABASE_URL
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def engine_options(url: str, *, use_async: bool = False) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if use_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Type for server-generated timestamps that serve as keyset sort keys. SQLite's
+# CURRENT_TIMESTAMP has no fractional seconds, so bind datetimes in that same
+# text form there; otherwise cursor comparisons never match the stored value.
+ServerTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_url = get_async_database_url()
+    async_engine = create_async_engine(async_url, **engine_options(async_url, use_async=True))
+    instrument_engine(async_engine.sync_engine)
+    # objects returned to the routers must stay readable after commit, since
+    # lazy loads are not possible outside the session's greenlet
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
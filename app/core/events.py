@@ -0,0 +1,230 @@
+"""Per-project event fan-out for the realtime board stream.
+
+Services call ``publish`` after committing. The event is encoded once and
+handed to the configured broker, which delivers it to the ``Hub`` of every
+worker process; each hub then appends the same pre-encoded frame to the
+buffer of every local subscriber of that project. Nothing on this path
+touches the database.
+
+A subscriber that falls ``EVENTS_SUBSCRIBER_BUFFER`` events behind is
+dropped and told so, rather than slowing down everyone else; clients are
+expected to reload the board and resubscribe.
+
+Access is checked when a stream opens, so events that take it away end
+streams too: ``member.removed`` revokes the removed user's subscriptions to
+that project and ``project.deleted`` revokes all of them, right after the
+event itself is delivered.
+"""
+import asyncio
+import importlib
+import json
+import threading
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.responses import render_json
+
+
+class Event:
+    __slots__ = ("project_id", "type", "data", "_frame")
+
+    def __init__(self, project_id: uuid.UUID, type: str, data: str):
+        self.project_id = project_id
+        self.type = type
+        # already JSON-encoded
+        self.data = data
+        self._frame: Optional[bytes] = None
+
+    @classmethod
+    def create(cls, project_id: uuid.UUID, type: str, data: dict) -> "Event":
+        return cls(project_id, type, render_json(data).decode())
+
+    @property
+    def frame(self) -> bytes:
+        # Server-Sent Events wire format, built once and shared by all subscribers
+        if self._frame is None:
+            self._frame = f"event: {self.type}\ndata: {self.data}\n\n".encode()
+        return self._frame
+
+    def dumps(self) -> str:
+        return json.dumps({"project_id": str(self.project_id), "type": self.type, "data": self.data})
+
+    @classmethod
+    def loads(cls, raw) -> "Event":
+        message = json.loads(raw)
+        return cls(uuid.UUID(message["project_id"]), message["type"], message["data"])
+
+
+class Broker:
+    """Carries events between worker processes.
+
+    ``publish`` may be called from any thread and must not block; the broker
+    passes every event it receives (including its own) to ``deliver``.
+    Implementations for a shared backend can serialize with ``Event.dumps``
+    and ``Event.loads``.
+    """
+
+    async def start(self, deliver: Callable[[Event], None]) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, event: Event) -> None:
+        raise NotImplementedError
+
+
+class LocalBroker(Broker):
+    """In-process broker; only correct with a single worker."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[Event], None]] = None
+
+    async def start(self, deliver: Callable[[Event], None]) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    def publish(self, event: Event) -> None:
+        if self._deliver is not None:
+            self._deliver(event)
+
+
+def load_broker(path: str) -> Broker:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def _revokes(event: Event, subscription: "Subscription") -> bool:
+    if event.type == "project.deleted":
+        return True
+    if event.type == "member.removed":
+        return str(subscription.user_id) == json.loads(event.data)["user_id"]
+    return False
+
+
+class Subscription:
+    __slots__ = ("project_id", "user_id", "lagged", "revoked", "_pending", "_ready", "_limit")
+
+    def __init__(self, project_id: uuid.UUID, limit: int, user_id: Optional[uuid.UUID] = None):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.lagged = False
+        self.revoked = False
+        self._pending: deque = deque()
+        self._ready = asyncio.Event()
+        self._limit = limit
+
+    def _push(self, event: Event) -> bool:
+        if len(self._pending) >= self._limit:
+            self.lagged = True
+            self._ready.set()
+            return False
+        self._pending.append(event)
+        self._ready.set()
+        return True
+
+    def _revoke(self) -> None:
+        self.revoked = True
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[Event]:
+        """Wait up to ``timeout`` seconds and return every buffered event."""
+        if not self._pending and not self.lagged and not self.revoked:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+
+class Hub:
+    def __init__(self):
+        self._subscribers: Dict[uuid.UUID, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._broker: Optional[Broker] = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self, broker: Optional[Broker] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._broker = broker or load_broker(settings.EVENTS_BROKER)
+        await self._broker.start(self.deliver)
+
+    async def stop(self) -> None:
+        broker, self._broker = self._broker, None
+        if broker is not None:
+            await broker.stop()
+
+    def publish(self, project_id: uuid.UUID, type: str, data: dict) -> None:
+        """Announce a committed change to every subscriber of ``project_id``."""
+        broker = self._broker
+        if broker is None:
+            return
+        with self._lock:
+            self.published += 1
+        broker.publish(Event.create(project_id, type, data))
+
+    def deliver(self, event: Event) -> None:
+        # called by the broker, possibly from a worker thread
+        if event.project_id not in self._subscribers or self._loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._fan_out(event)
+        else:
+            self._loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _fan_out(self, event: Event) -> None:
+        subscribers = self._subscribers.get(event.project_id)
+        if not subscribers:
+            return
+        for subscription in list(subscribers):
+            if subscription._push(event):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+                self.unsubscribe(subscription)
+            if _revokes(event, subscription):
+                subscription._revoke()
+                self.unsubscribe(subscription)
+
+    def subscribe(self, project_id: uuid.UUID, user_id: Optional[uuid.UUID] = None) -> Subscription:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        subscription = Subscription(project_id, settings.EVENTS_SUBSCRIBER_BUFFER, user_id)
+        self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.project_id]
+
+    def stats(self) -> dict:
+        return {
+            "broker": type(self._broker).__name__ if self._broker else None,
+            "projects": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+hub = Hub()
+publish = hub.publish
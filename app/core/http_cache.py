@@ -0,0 +1,53 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak validator over the values that determine a representation."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def cache_headers(etag: str) -> dict:
+    # responses depend on the bearer token, so shared caches must not store them
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+        "Vary": "Authorization",
+    }
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Tag ``response``; return a 304 to send instead when the client is current."""
+    headers = cache_headers(etag)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def cached_response(request: Request, body: bytes, etag: str) -> Response:
+    """Send a pre-serialized JSON body, or a 304 when the client already has it."""
+    headers = cache_headers(etag)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
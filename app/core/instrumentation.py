@@ -0,0 +1,68 @@
+"""Application metrics: HTTP latency per route and database work per request."""
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from starlette.requests import Request
+
+from app.core.metrics import Counter, Gauge, HistogramMetric
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+request_duration = HistogramMetric(
+    "http_request_duration_seconds", "Time until the response headers were ready.", ("method", "route"))
+requests_in_flight = Gauge("http_requests_in_flight", "Requests currently being handled.")
+request_queries = HistogramMetric(
+    "http_request_db_queries", "SQL statements executed per request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS)
+request_query_time = HistogramMetric(
+    "http_request_db_seconds", "Time spent executing SQL per request.", ("method", "route"))
+query_duration = HistogramMetric("db_query_duration_seconds", "Duration of individual SQL statements.")
+
+# [statement count, seconds] for the current request; a list so that worker
+# threads, which run with a copy of the request context, add to the same value
+_request_db: ContextVar[Optional[List[float]]] = ContextVar("request_db", default=None)
+
+
+def route_template(request: Request) -> str:
+    # the matched path template keeps label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def begin_request() -> None:
+    _request_db.set([0, 0.0])
+
+
+def end_request(request: Request, status: int, elapsed: float) -> None:
+    method, route = request.method, route_template(request)
+    requests_total.labels(method, route, status).inc()
+    request_duration.labels(method, route).observe(elapsed)
+    queries, seconds = _request_db.get() or (0, 0.0)
+    request_queries.labels(method, route).observe(queries)
+    request_query_time.labels(method, route).observe(seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    query_duration.observe(elapsed)
+    current = _request_db.get()
+    if current is not None:
+        current[0] += 1
+        current[1] += elapsed
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement run on ``engine`` (pass ``AsyncEngine.sync_engine`` for async)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
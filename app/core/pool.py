@@ -0,0 +1,66 @@
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Histogram, HistogramMetric
+
+# seconds spent waiting for a pooled connection, across all engines
+checkout_wait = HistogramMetric(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.").labels()
+
+# per-request accumulator; a list so that worker threads, which run with a
+# copy of the request context, add to the same value
+_request_wait: ContextVar[Optional[List[float]]] = ContextVar("db_pool_wait", default=None)
+
+
+def begin_request() -> None:
+    _request_wait.set([0.0])
+
+
+def request_wait() -> float:
+    wait = _request_wait.get()
+    return wait[0] if wait else 0.0
+
+
+class _CheckoutTimingMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # this pool's share of checkout_wait, for the per-engine stats
+        self.checkout_wait = Histogram()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            checkout_wait.observe(waited)
+            self.checkout_wait.observe(waited)
+            wait = _request_wait.get()
+            if wait is not None:
+                wait[0] += waited
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"status": pool.status()}
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, _CheckoutTimingMixin):
+        stats["checkout_wait_seconds"] = pool.checkout_wait.snapshot()
+    return stats
@@ -0,0 +1,167 @@
+"""Fractional ordering keys ("fractional indexing").
+
+Keys are base-62 strings that sort in byte order. A key consists of an
+integer part, whose first character encodes its length ("a0", "a1", ...,
+"az", "b00", ...), followed by an optional fraction. A new key can always
+be generated strictly between two existing ones, so moving an item only
+rewrites that item. Appending grows keys logarithmically; repeated inserts
+at the same spot grow them linearly, which is what rebalancing fixes.
+
+Keys must be compared with a byte-order collation ("C" in Postgres).
+"""
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ZERO = DIGITS[0]
+_SMALLEST_INTEGER = "A" + _ZERO * 26
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a < b as fractions; "" is zero and None is one
+    if b is not None:
+        n = 0
+        while (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"invalid rank head: {head!r}")
+
+
+def _integer_part(key: str) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"invalid rank: {key!r}")
+    return key[:length]
+
+
+def _validate(key: str) -> None:
+    if key == _SMALLEST_INTEGER:
+        raise ValueError(f"invalid rank: {key!r}")
+    integer = _integer_part(key)
+    if key[len(integer):].endswith(_ZERO):
+        raise ValueError(f"invalid rank: {key!r}")
+
+
+def _increment_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    carry = True
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) + 1
+        if d == len(DIGITS):
+            digits[i] = _ZERO
+        else:
+            digits[i] = DIGITS[d]
+            carry = False
+            break
+    if not carry:
+        return head + "".join(digits)
+    if head == "Z":
+        return "a" + _ZERO
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    borrow = True
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) - 1
+        if d == -1:
+            digits[i] = DIGITS[-1]
+        else:
+            digits[i] = DIGITS[d]
+            borrow = False
+            break
+    if not borrow:
+        return head + "".join(digits)
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def rank_between(a: Optional[str], b: Optional[str]) -> str:
+    """Return a key strictly between ``a`` and ``b`` (None means open-ended)."""
+    if a is not None:
+        _validate(a)
+    if b is not None:
+        _validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"{a!r} is not below {b!r}")
+
+    if a is None:
+        if b is None:
+            return "a" + _ZERO
+        integer_b = _integer_part(b)
+        fraction_b = b[len(integer_b):]
+        if integer_b == _SMALLEST_INTEGER:
+            return integer_b + _midpoint("", fraction_b)
+        if integer_b < b:
+            return integer_b
+        result = _decrement_integer(integer_b)
+        if result is None:
+            raise ValueError("cannot rank below the smallest key")
+        return result
+
+    integer_a = _integer_part(a)
+    fraction_a = a[len(integer_a):]
+    if b is None:
+        result = _increment_integer(integer_a)
+        return result if result is not None else integer_a + _midpoint(fraction_a, None)
+
+    integer_b = _integer_part(b)
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, b[len(integer_b):])
+    result = _increment_integer(integer_a)
+    if result is None:
+        raise ValueError("cannot rank above the largest key")
+    if result < b:
+        return result
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def ranks_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    """Return ``n`` ascending keys between ``a`` and ``b``, spread to keep them short."""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [rank_between(a, b)]
+    if b is None:
+        keys = [rank_between(a, None)]
+        for _ in range(n - 1):
+            keys.append(rank_between(keys[-1], None))
+        return keys
+    if a is None:
+        keys = [rank_between(None, b)]
+        for _ in range(n - 1):
+            keys.append(rank_between(None, keys[-1]))
+        return keys[::-1]
+    middle = n // 2
+    key = rank_between(a, b)
+    return ranks_between(a, key, middle) + [key] + ranks_between(key, b, n - middle - 1)
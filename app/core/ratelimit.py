@@ -0,0 +1,175 @@
+"""Token-bucket rate limiting applied by a middleware in ``app.main``.
+
+Each request draws one token from a bucket chosen by its route class and
+caller: the user id from a valid bearer token, otherwise the client IP.
+Buckets refill continuously at ``rate`` tokens per second up to ``burst``.
+A request that finds its bucket empty is answered with 429 and a
+``Retry-After`` of the seconds until the next token.
+
+The bucket state lives in a ``BucketStore``. The default keeps it in
+process, so with several workers each enforces its own share of the
+limit; ``RATE_LIMIT_BACKEND`` plugs in a shared store.
+"""
+import importlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+rate_limited = Counter(
+    "http_requests_rate_limited_total", "Requests rejected with 429 by route class.", ("route_class",))
+
+# endpoints that run Argon2 for anonymous callers
+AUTH_ROUTES = {("POST", "/auth/token"), ("POST", "/users/")}
+EXEMPT_PREFIXES = ("/metrics", "/ops/")
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class Limit(NamedTuple):
+    rate: float  # tokens per second
+    burst: int
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: int) -> Optional["Limit"]:
+        # 0 turns the limit off
+        return cls(requests / 60.0, max(1, burst)) if requests > 0 else None
+
+
+class BucketStore:
+    """Holds token buckets by key.
+
+    ``acquire`` takes ``cost`` tokens from the bucket at ``key`` if it has
+    them and returns 0, otherwise leaves it untouched and returns the seconds
+    until enough tokens will have accumulated. A bucket seen for the first
+    time starts full. Shared implementations must make the read-refill-take
+    step atomic (e.g. a server-side script).
+    """
+
+    async def acquire(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BucketStore):
+    """In-process buckets, least recently used evicted beyond ``maxsize``.
+
+    An evicted bucket comes back full, which only errs towards allowing.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.RATE_LIMIT_STORE_SIZE
+        # key -> [tokens, updated_at]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, limit: Limit, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(limit.burst), now]
+                if len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(limit.burst), bucket[0] + (now - bucket[1]) * limit.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / limit.rate
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"buckets": len(self._buckets), "maxsize": self.maxsize}
+
+
+def load_store(path: str) -> BucketStore:
+    if not path:
+        return MemoryBucketStore()
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def route_class(request: Request) -> Optional[str]:
+    """``auth``, ``read`` or ``write``; None for unlimited endpoints."""
+    method, path = request.method, request.url.path
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    if (method, path) in AUTH_ROUTES:
+        return "auth"
+    return "read" if method in READ_METHODS else "write"
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def caller(request: Request) -> str:
+    # only the signature is checked here; get_current_user still loads the user
+    from app.security import decode_access_token
+
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+        except Exception:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{client_ip(request)}"
+
+
+class RateLimiter:
+    def __init__(self, store: BucketStore, limits: Dict[str, Limit], enabled: bool = True):
+        self.store = store
+        self.limits = limits
+        self.enabled = enabled
+
+    async def check(self, request: Request) -> Optional[int]:
+        """Return None to let the request through, else its ``Retry-After`` in seconds."""
+        if not self.enabled:
+            return None
+        kind = route_class(request)
+        limit = self.limits.get(kind) if kind else None
+        if limit is None:
+            return None
+        # anonymous-only endpoints are limited per IP even with a token attached
+        key = f"{kind}:ip:{client_ip(request)}" if kind == "auth" else f"{kind}:{caller(request)}"
+        wait = await self.store.acquire(key, limit)
+        if not wait:
+            return None
+        rate_limited.labels(kind).inc()
+        return max(1, math.ceil(wait))
+
+    def stats(self) -> dict:
+        stats = {
+            "enabled": self.enabled,
+            "limits": {kind: {"per_minute": round(limit.rate * 60, 3), "burst": limit.burst}
+                       for kind, limit in self.limits.items() if limit},
+            "rejected": {key[0]: child.value for key, child in rate_limited._collect()},
+        }
+        if hasattr(self.store, "stats"):
+            stats["store"] = self.store.stats()
+        return stats
+
+
+rate_limiter = RateLimiter(
+    load_store(settings.RATE_LIMIT_BACKEND) if settings.RATE_LIMIT_ENABLED else None,
+    limits={
+        "auth": Limit.per_minute(settings.RATE_LIMIT_AUTH_PER_MINUTE, settings.RATE_LIMIT_AUTH_BURST),
+        "read": Limit.per_minute(settings.RATE_LIMIT_READ_PER_MINUTE, settings.RATE_LIMIT_READ_BURST),
+        "write": Limit.per_minute(settings.RATE_LIMIT_WRITE_PER_MINUTE, settings.RATE_LIMIT_WRITE_BURST),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,164 @@
+"""Read replicas for the read-only endpoints; see ``deps.get_read_db``.
+
+Sessions go to the next healthy replica in round-robin order, or to the
+primary when no replica is configured or healthy. A user who committed a
+write in the last ``REPLICA_STICKY_SECONDS`` is kept on the primary so they
+read their own writes despite replication lag. The stickiness lives in this
+process; with several workers, a read that lands on another worker can
+still see the replica's older state.
+
+Replicas are pinged every ``REPLICA_HEALTH_CHECK_SECONDS``. A disconnect seen
+by a request marks the replica down at once, and the next successful ping
+brings it back.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import uuid
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import engine_options, get_async_database_url
+from app.core.instrumentation import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+_ACTOR_KEY = "actor_id"
+
+
+class Replica:
+    def __init__(self, name: str, url: str, use_async: bool):
+        self.name = name
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        if use_async:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+            async_url = get_async_database_url(url)
+            self.engine = create_async_engine(async_url, **engine_options(async_url, use_async=True))
+            sync_engine = self.engine.sync_engine
+            self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False,
+                                                   info={"replica": name})
+        else:
+            self.engine = sync_engine = create_engine(url, **engine_options(url))
+            self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine,
+                                             info={"replica": name})
+        instrument_engine(sync_engine)
+        event.listen(sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect:
+            self.mark_down(context.original_exception)
+
+    def mark_down(self, error: BaseException) -> None:
+        if self.healthy:
+            logger.warning("replica marked down", extra={"replica": self.name, "error": str(error)})
+        self.healthy = False
+        self.last_error = str(error)
+
+    async def ping(self) -> None:
+        try:
+            if hasattr(self.engine, "sync_engine"):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            else:
+                await run_in_threadpool(self._ping_sync)
+        except Exception as error:
+            self.mark_down(error)
+            return
+        if not self.healthy:
+            logger.info("replica back up", extra={"replica": self.name})
+        self.healthy = True
+
+    def _ping_sync(self) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str], use_async: bool):
+        self.replicas = [Replica(f"replica{n}", url, use_async) for n, url in enumerate(urls)]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # users with a recent commit, read from the primary until the entry expires
+        self.recent_writers = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.REPLICA_STICKY_SECONDS)
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self, user_id: Optional[uuid.UUID] = None) -> Optional[Replica]:
+        """The replica to read from, or None for the primary."""
+        if not self.replicas:
+            return None
+        if user_id is not None and self.recent_writers.get(user_id) is not None:
+            replica = None
+        else:
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            replica = healthy[next(self._turn) % len(healthy)] if healthy else None
+        with self._lock:
+            if replica is None:
+                self.primary_reads += 1
+            else:
+                self.replica_reads += 1
+        return replica
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.gather(*(replica.ping() for replica in self.replicas))
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [{"name": replica.name, "healthy": replica.healthy, "last_error": replica.last_error}
+                         for replica in self.replicas],
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_users": self.recent_writers.stats()["size"],
+        }
+
+
+def _replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+
+replica_set = ReplicaSet(_replica_urls(), use_async=settings.DB_ASYNC)
+
+
+def note_actor(db, user_id: uuid.UUID) -> None:
+    """Remember who acts through ``db``, so their commits make their reads sticky."""
+    if replica_set.enabled:
+        db.info[_ACTOR_KEY] = user_id
+
+
+def is_replica(db) -> bool:
+    return "replica" in db.info
+
+
+@event.listens_for(Session, "after_commit")
+def _stick_to_primary(session: Session) -> None:
+    user_id = session.info.get(_ACTOR_KEY)
+    if user_id is not None:
+        replica_set.recent_writers.set(user_id, True)
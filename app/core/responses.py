@@ -0,0 +1,43 @@
+"""JSON rendering for payloads built from trusted database rows.
+
+Routes with a ``response_model`` are already serialized by pydantic's Rust
+core; this path is for plain dicts assembled from row tuples, which skip
+model validation altogether. orjson is used when installed and matches
+pydantic's output for the types we store (UUID, datetime, enums).
+"""
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib fallback produces the same JSON
+    orjson = None
+
+
+def json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # pydantic writes UTC as "Z"
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def render_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
@@ -1,31 +1,132 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional, Union
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import SessionLocal, AsyncSessionLocal
+from app.core.cache import principal_cache
+from app.core.replicas import replica_set, note_actor
 from app import models
 from app import security
+from app.models.membership import MemberRole
+from app.services import project_service
+import hmac
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-def get_db():
+DbSession = Union[Session, AsyncSession]
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+
+async def run_db(db: DbSession, fn, *args, **kwargs):
+    """Call a sync service function ``fn(session, ...)`` without blocking the event loop.
+
+    Async sessions run it through ``AsyncSession.run_sync`` on the event loop;
+    sync sessions fall back to the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def release_db(db: DbSession) -> None:
+    """Return the session's connection to the pool ahead of a long-lived response."""
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+def _load_principal(db: Session, user_id: uuid.UUID):
+    user = db.get(models.user.User, user_id)
+    if user is not None:
+        # detach so the instance can outlive this request's session
+        db.expunge(user)
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: DbSession = Depends(get_db)):
     # print("controle inside get_current_user with token :",token)
     from jose import JWTError
     try:
         payload = security.decode_access_token(token)
-        print("the payload has :", payload)
+        logger.debug("token accepted", extra={"user_id": payload.get("sub")})
         user_id = uuid.UUID(payload.get("sub"))
         # print("the user_id inside get_current_user is :", user_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
-    user = db.get(models.user.User, user_id)
+    # the signature and expiry are checked above, so a cached user for this
+    # exact token can be served without touching the database
+    cache_key = (user_id, payload.get("jti") or payload.get("iat"))
+    # commits on this request's session keep the user's reads on the primary for a while
+    note_actor(db, user_id)
+    user = principal_cache.get(cache_key)
+    if user is not None:
+        return user
+    user = await run_db(db, _load_principal, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal_cache.set(cache_key, user)
     return user
+
+async def get_read_db(current_user=Depends(get_current_user), db: DbSession = Depends(get_db)):
+    """Session for read-only endpoints: a healthy replica when configured.
+
+    Falls back to the request's primary session when there is no healthy
+    replica or the caller wrote something moments ago (read-your-writes).
+    """
+    replica = replica_set.pick(current_user.id)
+    if replica is None:
+        yield db
+        return
+    if isinstance(db, AsyncSession):
+        async with replica.sessionmaker() as session:
+            yield session
+        return
+    session = replica.sessionmaker()
+    try:
+        yield session
+    finally:
+        await run_in_threadpool(session.close)
+
+def require_ops(x_ops_token: Optional[str] = Header(None)):
+    """Guard for the ``/ops/`` endpoints, which expose pool, cache and replica internals."""
+    if not settings.OPS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_ops_token or not hmac.compare_digest(x_ops_token.encode(), settings.OPS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ops token")
+
+def require_project_role(*roles: MemberRole, detail: str = "Not authorized", include_deleted: bool = False,
+                         load_members: bool = True, read_only: bool = False):
+    """Dependency factory guarding ``/projects/{project_id}`` routes.
+
+    Loads the project and the caller's membership in one query and rejects
+    callers whose role is not in ``roles`` (any member when none are given).
+    The services reuse the same lookup instead of querying again, as long as
+    the route takes the same session: ``get_read_db`` with ``read_only``,
+    else ``get_db``.
+    """
+    allowed = roles or tuple(MemberRole)
+    session = get_read_db if read_only else get_db
+
+    async def dependency(project_id: uuid.UUID, db: DbSession = Depends(session), current_user=Depends(get_current_user)):
+        access = await run_db(db, project_service.get_project_access, project_id, current_user.id,
+                              include_deleted=include_deleted, load_members=load_members)
+        project_service.check_role(access, allowed, detail)
+        return access
+
+    return dependency
@@ -1,13 +1,93 @@
-from fastapi import FastAPI
-from app.routers import  users, projects, tasks, auth
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.routers import  users, projects, tasks, auth, ops, metrics
+from app.core import pool, instrumentation
+from app.core.log import setup_logging, new_request_id, request_id_var
+from app.core.events import hub
+from app.core.ratelimit import rate_limiter
+from app.core.replicas import replica_set
+from app.workers.purge import purge_worker
 # from app.core.database import engine, Base
 
+setup_logging()
+logger = logging.getLogger("app.requests")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await hub.start()
+    await replica_set.start()
+    await purge_worker.start()
+    yield
+    await purge_worker.stop()
+    await replica_set.stop()
+    await hub.stop()
+
+
 app = FastAPI(
     title="Collaborative Kanban Board API",
     description="A professional Kanban board API with team collaboration features",
+    lifespan=lifespan,
 )
 
 
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    instrumentation.begin_request()
+    instrumentation.requests_in_flight.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        instrumentation.requests_in_flight.dec()
+        instrumentation.end_request(request, status, time.perf_counter() - started)
+
+
+@app.middleware("http")
+async def track_pool_wait(request: Request, call_next):
+    # report time spent queued on connection checkout for this request
+    pool.begin_request()
+    response = await call_next(request)
+    waited = pool.request_wait()
+    if waited:
+        response.headers["Server-Timing"] = f"db-pool;dur={waited * 1000:.1f}"
+    return response
+
+
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    # runs before any database or Argon2 work; rejected requests skip the
+    # latency metrics but are counted per route class
+    retry_after = await rate_limiter.check(request)
+    if retry_after is not None:
+        return JSONResponse({"detail": "Too many requests"}, status_code=429,
+                            headers={"Retry-After": str(retry_after)})
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    # outermost: everything below logs with this request's correlation id
+    request_id = new_request_id(request.headers.get("x-request-id"))
+    token = request_id_var.set(request_id)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logger.debug("request completed", extra={
+            "method": request.method, "route": instrumentation.route_template(request),
+            "status": response.status_code, "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
+        return response
+    finally:
+        request_id_var.reset(token)
+
+
 @app.get("/")
 def read_root():
     return {
@@ -18,4 +98,6 @@ def read_root():
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(projects.router)
-app.include_router(tasks.router)
\ No newline at end of file
+app.include_router(tasks.router)
+app.include_router(ops.router)
+app.include_router(metrics.router)
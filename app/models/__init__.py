@@ -1,4 +1,5 @@
 from .user import User
 from .project import Project
 from .membership import ProjectMember
-from .task import Task
\ No newline at end of file
+from .task import Task, ProjectStatusCount, TaskStatusTransition
+from .archive import ArchivedProject, ArchivedProjectMember, ArchivedTask
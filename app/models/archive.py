@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Boolean, Index, func
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base, ServerTimestamp
+from app.models.project import ProjectStatus
+from app.models.membership import MemberRole
+from app.models.task import TaskStatus
+
+# Purged projects, see app.workers.purge. Rows keep the columns they had in
+# the live tables; there are no foreign keys into the live tables, since the
+# users they reference may go away independently.
+
+
+class ArchivedProject(Base):
+    __tablename__ = "archived_projects"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text)
+    owner_id = Column(UUID(as_uuid=True), nullable=False)
+    status = Column(Enum(ProjectStatus), nullable=False)
+    is_deleted = Column(Boolean, nullable=False, default=True)
+    created_at = Column(ServerTimestamp)
+    updated_at = Column(DateTime(timezone=True))
+    deleted_at = Column(DateTime(timezone=True))
+    version = Column(Integer, nullable=False)
+    board_version = Column(Integer, nullable=False)
+    archived_at = Column(ServerTimestamp, server_default=func.now(), nullable=False)
+
+    members = relationship("ArchivedProjectMember", lazy="selectin", cascade="all, delete-orphan")
+
+
+class ArchivedProjectMember(Base):
+    __tablename__ = "archived_project_members"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("archived_projects.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    role = Column(Enum(MemberRole), nullable=False)
+    joined_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_archived_project_members_project_id", "project_id"),
+    )
+
+
+class ArchivedTask(Base):
+    __tablename__ = "archived_tasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    # archived before their project, so not a foreign key
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    assignee_id = Column(UUID(as_uuid=True))
+    status = Column(Enum(TaskStatus), nullable=False)
+    created_at = Column(ServerTimestamp)
+    rank = Column(String(255), nullable=False)
+    archived_at = Column(ServerTimestamp, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_archived_tasks_project_id", "project_id"),
+    )
@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy.dialects.postgresql import UUID 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, func, UniqueConstraint, Enum
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, func, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum 
@@ -24,4 +24,9 @@ class ProjectMember(Base):
     project = relationship("Project", back_populates="members")
     user = relationship("User", back_populates="memberships")
 
-    __table_args__ = (UniqueConstraint("project_id", "user_id", name="_project_user_uc"),)
+    # the unique constraint serves (project_id, user_id) membership checks;
+    # ix_project_members_user_id serves "projects of this user" lookups
+    __table_args__ = (
+        UniqueConstraint("project_id", "user_id", name="_project_user_uc"),
+        Index("ix_project_members_user_id", "user_id", "project_id"),
+    )
@@ -1,8 +1,8 @@
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func,Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func,Enum, Boolean, Index, text, DDL, event
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.core.database import Base, ServerTimestamp
 import enum
 
 class ProjectStatus(str,enum.Enum):
@@ -21,10 +21,51 @@ class Project(Base):
     status=Column(Enum(ProjectStatus),default=ProjectStatus.active,nullable=False)
     is_deleted=Column(Boolean, default=False)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True))
+    # bumped on every change to the project or its members / its tasks; the
+    # ETags of project and board reads are derived from them
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    board_version = Column(Integer, nullable=False, default=1, server_default=text("1"))
 
     owner = relationship("User", back_populates="projects_owned")
-    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
+    # members are serialized with every ProjectRead; load them in one batched
+    # query per result set (async sessions cannot lazy-load at serialization)
+    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan", lazy="selectin")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_projects_owner_id", "owner_id"),
+        # list_projects only ever reads live projects, newest first
+        Index("ix_projects_live_created_at", "created_at", "id",
+              postgresql_where=text("is_deleted = false"),
+              sqlite_where=text("is_deleted = 0")),
+        # the purge worker's scan for expired soft-deleted projects
+        Index("ix_projects_deleted_at", "deleted_at",
+              postgresql_where=text("is_deleted = true"),
+              sqlite_where=text("is_deleted = 1")),
+        # Postgres-only search indexes, see project_service.list_projects:
+        # trigram GIN for ILIKE '%term%' on name, full-text GIN over name + description
+        Index("ix_projects_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_projects_search_document", func.project_search_document(name, description),
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+
+# the search document lives in an IMMUTABLE SQL function so that queries and
+# the expression index above share one parameter-free expression
+PROJECT_SEARCH_DDL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE OR REPLACE FUNCTION project_search_document(name text, description text)
+RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))
+$$;
+"""
+
+event.listen(
+    Project.__table__,
+    "before_create",
+    DDL(PROJECT_SEARCH_DDL).execute_if(dialect="postgresql"),
+)
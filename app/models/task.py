@@ -1,8 +1,8 @@
 import uuid
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from app.core.database import Base
+from app.core.database import Base, ServerTimestamp
 import enum
 from sqlalchemy.sql import func
 
@@ -21,7 +21,52 @@ class Task(Base):
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.backlog, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
+    # fractional ordering key within (project_id, status), see app.core.ranking;
+    # byte-order collation so Postgres sorts it like Python does
+    rank = Column(String(255).with_variant(String(255, collation="C"), "postgresql"), nullable=False)
 
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User")
+
+    __table_args__ = (
+        Index("ix_tasks_project_status_rank", "project_id", "status", "rank"),
+        # GET /tasks/ by project or by assignee, newest first; the INCLUDE
+        # columns (Postgres only) keep id/title/status reads index-only
+        Index("ix_tasks_project_created_at", "project_id", "created_at", "id",
+              postgresql_include=["status", "assignee_id", "title"]),
+        Index("ix_tasks_assignee_created_at", "assignee_id", "created_at", "id",
+              postgresql_include=["status", "project_id", "title"]),
+    )
+
+
+class ProjectStatusCount(Base):
+    """Number of a project's tasks in each column, kept current by task_service.
+
+    Every project has one row per ``TaskStatus`` from its creation on, so
+    writers only ever increment existing rows.
+    """
+    __tablename__ = "project_status_counts"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+
+class TaskStatusTransition(Base):
+    """Append-only history of column changes; ``from_status`` is empty on creation."""
+    __tablename__ = "task_status_transitions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(Enum(TaskStatus), nullable=True)
+    to_status = Column(Enum(TaskStatus), nullable=False)
+    changed_at = Column(ServerTimestamp, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # flow and throughput windows per project
+        Index("ix_task_status_transitions_project_changed_at", "project_id", "changed_at"),
+        # a task's own history, for cycle time
+        Index("ix_task_status_transitions_task_id", "task_id", "changed_at"),
+    )
@@ -1,20 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.deps import get_db
+from app.deps import DbSession, get_db, run_db
 from app.services import user_service
-from app.security import create_access_token
+from app.security import create_access_token, verify_and_update_async
 from app.schemas.auth import LoginRequest
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/token")
-def login_for_access_token(data:LoginRequest, db: Session = Depends(get_db)):
-    print("inside the login route")
-    user = user_service.authenticate_user(db, data.email, data.password)
-    if not user:
+async def login_for_access_token(data:LoginRequest, db: DbSession = Depends(get_db)):
+    user = await run_db(db, user_service.get_user_by_email, data.email)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_and_update_async(data.password, user.hashed_password)
+    if not verified:
+        logger.info("login failed", extra={"known_user": user is not None})
         raise HTTPException(status_code=400, detail="Incorrect username or password")
+    if new_hash:
+        # stored hash used outdated Argon2 parameters
+        await run_db(db, user_service.set_password_hash, user, new_hash)
     access_token_expires = timedelta(minutes=60)
     access_token = create_access_token(subject=str(user.id), expires_delta=access_token_expires)
+    logger.debug("login succeeded", extra={"user_id": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.cache import principal_cache, response_cache
+from app.core.database import engine, async_engine
+from app.core.events import hub
+from app.core.metrics import REGISTRY, CounterFunction, GaugeFunction
+from app.core.pool import pool_stats
+from app.security import hash_pool_stats
+
+router = APIRouter(tags=["ops"])
+
+
+def _engines():
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    return engines
+
+
+def _pool_gauge(field: str):
+    def read():
+        stats = {name: pool_stats(bound) for name, bound in _engines().items()}
+        return {(name,): values[field] for name, values in stats.items() if field in values}
+    return read
+
+
+# state owned by other components, read when scraped
+GaugeFunction("db_pool_checked_out", "Connections currently checked out.", _pool_gauge("checked_out"), ("engine",))
+GaugeFunction("db_pool_overflow", "Connections open beyond the pool size.", _pool_gauge("overflow"), ("engine",))
+GaugeFunction("password_hash_in_flight", "Hashing jobs running or queued.", lambda: {(): hash_pool_stats()["in_flight"]})
+CounterFunction("password_hash_rejected_total", "Hashing jobs shed with 503.",
+                lambda: {(): hash_pool_stats()["rejected"]})
+CounterFunction("cache_hits_total", "Cache hits.", lambda: {
+    ("principal",): principal_cache.hits, ("response",): response_cache.hits}, ("cache",))
+CounterFunction("cache_misses_total", "Cache misses.", lambda: {
+    ("principal",): principal_cache.misses, ("response",): response_cache.misses}, ("cache",))
+GaugeFunction("events_subscribers", "Open realtime event streams.", lambda: {(): hub.stats()["subscribers"]})
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
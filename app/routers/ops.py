@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from app.core.cache import principal_cache, response_cache
+from app.core.database import engine, async_engine
+from app.core.events import hub
+from app.core.pool import pool_stats
+from app.core.ratelimit import rate_limiter
+from app.core.replicas import replica_set
+from app.deps import require_ops
+from app.security import hash_pool_stats
+
+router = APIRouter(prefix="/ops", tags=["ops"], dependencies=[Depends(require_ops)])
+
+@router.get("/stats")
+def read_stats():
+    db_pool = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        db_pool["async"] = pool_stats(async_engine.sync_engine)
+    return {
+        "principal_cache": principal_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "db_pool": db_pool,
+        "hash_pool": hash_pool_stats(),
+        "events": hub.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "replicas": replica_set.stats(),
+    }
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.project import ProjectCreate, ProjectRead, ProjectList, ProjectUpdate, ProjectMemberCreate, ProjectMemberRead, MemberRole
-from app.services import project_service
-from app.deps import get_db, get_current_user
+from app.schemas.project import ProjectCreate, ProjectRead, ProjectList, ProjectUpdate, ProjectMemberCreate, ProjectMemberRead, MemberRole, ProjectMemberBatch, ProjectMemberBatchResult
+from app.services import project_service, task_service
+from app.routers.tasks import summarize
+from app.schemas.task import Board, BoardStats, TaskStatus
+from app.models.task import TaskStatus as TaskStatusModel
+from app.deps import DbSession, get_db, get_read_db, get_current_user, run_db, release_db, require_project_role
+from app.core.config import settings
+from app.core.events import hub
+from app.core.http_cache import make_etag, etag_matches, conditional, cache_headers, cached_response
+from app.core.cache import response_cache, project_scope, user_scope
+from app.core.replicas import is_replica
+from app.core.responses import FastJSONResponse, render_json
 from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timezone
 from typing import List, Optional
 import uuid
 
@@ -11,180 +22,377 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.post("/", response_model=ProjectRead)
-def create_project(project_in: ProjectCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def create_project(project_in: ProjectCreate, db: DbSession = Depends(get_db), current_user=Depends(get_current_user)):
     # print("project name from req :",project_in.name)
     # print("project description from req :",project_in.description)
     try:
-        project = project_service.create_project(
-            db, owner_id=current_user.id, project_in=project_in)
+        project = await run_db(
+            db, project_service.create_project, owner_id=current_user.id, project_in=project_in)
         return project
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to create project!!!")
 
 
+def _project_list_etag(rows, total, next_cursor, include_members: bool) -> str:
+    return make_etag("projects", include_members, total, next_cursor,
+                     *(f"{row.id}:{row.version}" for row in rows))
+
+
 @router.get("/", response_model=ProjectList)
-def list_projects(
+async def list_projects(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(25, ge=1, le=100),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page; replaces skip"),
+    include_total: bool = Query(True, description="Set false to skip counting all matching projects"),
+    include_members: bool = Query(True, description="Set false to skip loading members (returned empty)"),
+    db: DbSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
+    page = dict(user_id=current_user.id, skip=skip, limit=limit, search=search, cursor=cursor,
+                include_total=include_total)
+    cache_key = response_cache.key(user_scope(current_user.id), skip, limit, search, cursor, include_total, include_members)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, *cached)
+    if is_replica(db):
+        # a lagging replica could fill the cache with a page that predates the
+        # write that retired the previous entry
+        cache_key = None
     try:
-        items, total = project_service.list_projects(
-            db, user_id=current_user.id, skip=skip, limit=limit, search=search)
-        return {"items": items, "total": total}
+        if settings.FAST_JSON or request.headers.get("if-none-match"):
+            # the page as plain rows: enough to fingerprint it and to render it
+            # without ORM entities; fetched once, whether or not it is a 304
+            rows, total, next_cursor = await run_db(db, project_service.list_projects, as_rows=True, **page)
+            etag = _project_list_etag(rows, total, next_cursor, include_members)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers=cache_headers(etag))
+            items = await run_db(db, project_service.project_dicts, rows, with_members=include_members)
+            if settings.FAST_JSON:
+                body = render_json({"items": items, "total": total, "next_cursor": next_cursor})
+                response_cache.set(cache_key, body, etag)
+                return cached_response(request, body, etag)
+        else:
+            projects, total, next_cursor = await run_db(
+                db, project_service.list_projects, with_members=include_members, **page)
+            etag = _project_list_etag(projects, total, next_cursor, include_members)
+            items = [project_service.project_dict(project, include_members) for project in projects]
+        result = {"items": items, "total": total, "next_cursor": next_cursor}
+        if cache_key is not None:
+            body = ProjectList.model_validate(result, from_attributes=True).model_dump_json().encode()
+            response_cache.set(cache_key, body, etag)
+            return cached_response(request, body, etag)
+        response.headers.update(cache_headers(etag))
+        return result
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to get project list!!!")
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
-def get_project(
+async def get_project(
+    request: Request,
+    response: Response,
     project_id: uuid.UUID = Path(...),
-    db: Session = Depends(get_db),
+    include_members: bool = Query(True, description="Set false to skip loading members (returned empty)"),
+    include_deleted: bool = Query(False, description="Also return deleted and purged projects (to their owner)"),
+    db: DbSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
+    if include_deleted:
+        # rare, so neither cached nor given an ETag
+        try:
+            project = await run_db(db, project_service.get_project, project_id,
+                                   include_deleted=True, with_members=include_members)
+            if project.is_deleted:
+                if project.owner_id != current_user.id:
+                    raise HTTPException(status_code=404, detail="Project not found")
+            else:
+                access = await run_db(db, project_service.get_project_access, project_id, current_user.id,
+                                      load_members=False)
+                project_service.check_role(access, tuple(MemberRole), "Not a member of this project")
+        except SQLAlchemyError:
+            await run_db(db, Session.rollback)
+            raise HTTPException(status_code=400, detail="Failed to get project details!!!")
+        return project_service.project_dict(project, include_members)
     try:
-        project = project_service.get_project(db, project_id)
-    # ensure user is member
-    # if you want, enforce membership check here; service already checks on some ops
-        return project
+        # membership first: the cached body is shared by all members of the project
+        access = await run_db(db, project_service.get_project_access, project_id, current_user.id,
+                              load_members=False)
+        project_service.check_role(access, tuple(MemberRole), "Not a member of this project")
+        cache_key = response_cache.key(project_scope(project_id), include_members)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached_response(request, *cached)
+        if is_replica(db):
+            # see list_projects
+            cache_key = None
+        etag = make_etag("project", project_id, access.project.version, include_members)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=cache_headers(etag))
+        project = await run_db(db, project_service.get_project, project_id, with_members=include_members)
+        result = project_service.project_dict(project, include_members)
+        if cache_key is not None:
+            body = ProjectRead.model_validate(result, from_attributes=True).model_dump_json().encode()
+            response_cache.set(cache_key, body, etag)
+            return cached_response(request, body, etag)
+        response.headers.update(cache_headers(etag))
+        return result
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to get project details!!!")
 
 
-@router.put("/{project_id}", response_model=ProjectRead)
-def update_project(
+@router.get("/{project_id}/board", response_model=Board)
+async def get_board(
+    project_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Tasks per column"),
+    status: Optional[TaskStatus] = Query(None, description="Only this column (required with cursor)"),
+    cursor: Optional[str] = Query(None),
+    access=Depends(require_project_role(detail="Not a member of this project", load_members=False, read_only=True)),
+    db: DbSession = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    # the membership lookup already read the board version, so a current
+    # client costs no further queries
+    etag = make_etag("board", project_id, access.project.board_version, limit, status, cursor)
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        board = await run_db(
+            db, task_service.get_board, project_id, limit=limit,
+            status=TaskStatusModel(status.value) if status else None, cursor=cursor, as_rows=settings.FAST_JSON)
+        if settings.FAST_JSON:
+            return FastJSONResponse(board, headers=cache_headers(etag))
+        return board
+    except SQLAlchemyError as e:
+        await run_db(db, Session.rollback)
+        raise HTTPException(
+            status_code=400, detail="Failed to get project board!!!")
+
+
+@router.get("/{project_id}/stats", response_model=BoardStats)
+async def get_board_stats(
+    project_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    days: int = Query(14, ge=1, le=365, description="Length of the throughput / flow window"),
+    access=Depends(require_project_role(detail="Not a member of this project", load_members=False, read_only=True)),
+    db: DbSession = Depends(get_read_db),
+):
+    # the window moves at midnight UTC even when the board does not change
+    etag = make_etag("stats", project_id, access.project.board_version, days, datetime.now(timezone.utc).date())
+    not_modified = conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return await run_db(db, task_service.get_board_stats, project_id, days=days)
+    except SQLAlchemyError as e:
+        await run_db(db, Session.rollback)
+        raise HTTPException(
+            status_code=400, detail="Failed to get project stats!!!")
+
+
+@router.get("/{project_id}/events", response_class=StreamingResponse,
+            dependencies=[Depends(require_project_role(detail="Not a member of this project", load_members=False))])
+async def stream_events(project_id: uuid.UUID, db: DbSession = Depends(get_db), current_user=Depends(get_current_user)):
+    """Server-Sent Events stream of task, membership and project changes.
+
+    A client that falls too far behind receives a ``lagged`` event and the
+    stream ends; it should reload the board and reconnect. Losing access
+    (removal from the project, or its deletion) ends the stream with a
+    ``revoked`` event.
+    """
+    # membership was checked above; don't hold a connection for the whole stream
+    await release_db(db)
+
+    async def stream():
+        subscription = hub.subscribe(project_id, current_user.id)
+        try:
+            yield b": connected\n\n"
+            while True:
+                batch = await subscription.next_batch(settings.EVENTS_HEARTBEAT_SECONDS)
+                if batch:
+                    yield b"".join(event.frame for event in batch)
+                elif not (subscription.lagged or subscription.revoked):
+                    yield b": keep-alive\n\n"
+                if subscription.revoked:
+                    yield b"event: revoked\ndata: {}\n\n"
+                    return
+                if subscription.lagged:
+                    yield b"event: lagged\ndata: {}\n\n"
+                    return
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.put("/{project_id}", response_model=ProjectRead,
+            dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to update project"))])
+async def update_project(
     project_id: uuid.UUID,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        project = project_service.update_project(
-            db, project_id=project_id, user_id=current_user.id, project_in=payload)
+        project = await run_db(
+            db, project_service.update_project, project_id=project_id, user_id=current_user.id, project_in=payload)
         return project
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to update project details!!!")
 
 
-@router.delete("/{project_id}", status_code=204)
-def delete_project(
+@router.delete("/{project_id}", status_code=204,
+               dependencies=[Depends(require_project_role(MemberRole.owner, detail="Only owner can delete project"))])
+async def delete_project(
     project_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
 
     try:
-        project_service.soft_delete_project(
-            db, project_id=project_id, user_id=current_user.id)
+        await run_db(
+            db, project_service.soft_delete_project, project_id=project_id, user_id=current_user.id)
         return {"detail": "deleted"}
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to delete project!!!")
 
 
-@router.post("/{project_id}/restore", response_model=ProjectRead)
-def restore_project(
+@router.post("/{project_id}/restore", response_model=ProjectRead,
+             dependencies=[Depends(require_project_role(MemberRole.owner, detail="Only owner can restore project", include_deleted=True))])
+async def restore_project(
     project_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
 
     try:
-        project = project_service.restore_project(
-            db, project_id=project_id, user_id=current_user.id)
+        project = await run_db(
+            db, project_service.restore_project, project_id=project_id, user_id=current_user.id)
         return project
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to restore deleted project!!!")
 
 
-@router.post("/{project_id}/archive", response_model=ProjectRead)
-def archive_project(
+@router.post("/{project_id}/archive", response_model=ProjectRead,
+             dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to archive project"))])
+async def archive_project(
     project_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
 
-        project = project_service.archive_project(
-            db, project_id=project_id, user_id=current_user.id)
+        project = await run_db(
+            db, project_service.archive_project, project_id=project_id, user_id=current_user.id)
         return project
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to archive project!!!")
 
 
-@router.post("/{project_id}/transfer-ownership/{new_owner_id}", response_model=ProjectRead)
-def transfer_ownership(
+@router.post("/{project_id}/transfer-ownership/{new_owner_id}", response_model=ProjectRead,
+             dependencies=[Depends(require_project_role(MemberRole.owner, detail="Only current owner can transfer ownership"))])
+async def transfer_ownership(
     project_id: uuid.UUID,
     new_owner_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
 
     try:
-        project = project_service.transfer_ownership(
-            db, project_id=project_id, current_owner_id=current_user.id, new_owner_id=new_owner_id)
+        project = await run_db(
+            db, project_service.transfer_ownership, project_id=project_id, current_owner_id=current_user.id, new_owner_id=new_owner_id)
         return project
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to transfer project ownership!!!")
 
 
-@router.post("/{project_id}/members", response_model=ProjectMemberRead, status_code=201)
-def add_member(
+@router.post("/{project_id}/members", response_model=ProjectMemberRead, status_code=201,
+             dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to add members"))])
+async def add_member(
     project_id: uuid.UUID,
     payload: ProjectMemberCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        pm = project_service.add_member(
-            db, project_id=project_id, user_id=payload.user_id, adder_id=current_user.id, role=payload.role)
+        pm = await run_db(
+            db, project_service.add_member, project_id=project_id, user_id=payload.user_id, adder_id=current_user.id, role=payload.role)
         return pm
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to add member to project!!!")
 
 
-@router.delete("/{project_id}/members/{user_id}", status_code=204)
-def remove_member(
+@router.post("/{project_id}/members/batch", response_model=ProjectMemberBatchResult,
+             dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to manage members"))])
+async def batch_update_members(
+    project_id: uuid.UUID,
+    payload: ProjectMemberBatch,
+    db: DbSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Add, remove and re-role many members at once; each item reports its own outcome."""
+    if len(payload.items) > settings.MEMBER_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.MEMBER_BATCH_MAX_ITEMS} items per request")
+    try:
+        results = await run_db(
+            db, project_service.batch_update_members, project_id=project_id, actor_id=current_user.id, items=payload.items)
+    except SQLAlchemyError:
+        await run_db(db, Session.rollback)
+        raise HTTPException(
+            status_code=400, detail="Failed to update project members!!!")
+    return summarize(results)
+
+
+@router.delete("/{project_id}/members/{user_id}", status_code=204,
+               dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to remove members"))])
+async def remove_member(
     project_id: uuid.UUID,
     user_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        project_service.remove_member(
-            db, project_id=project_id, user_id=user_id, remover_id=current_user.id)
+        await run_db(
+            db, project_service.remove_member, project_id=project_id, user_id=user_id, remover_id=current_user.id)
         return {"detail": "member removed"}
     except SQLAlchemyError as e:
-        db.rollback()
+        await run_db(db, Session.rollback)
         raise HTTPException(
             status_code=400, detail="Failed to delete member from project!!!")
 
 
-@router.patch("/{project_id}/members/{user_id}/role", response_model=ProjectMemberRead)
-def change_member_role(
+@router.patch("/{project_id}/members/{user_id}/role", response_model=ProjectMemberRead,
+              dependencies=[Depends(require_project_role(MemberRole.owner, MemberRole.admin, detail="Not authorized to change roles"))])
+async def change_member_role(
     project_id: uuid.UUID,
     user_id: uuid.UUID,
     role: str,  # will accept enum name
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     # validate role string -> MemberRole
@@ -194,6 +402,6 @@ def change_member_role(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid role")
 
-    pm = project_service.change_member_role(
-        db, project_id=project_id, target_user_id=user_id, changer_id=current_user.id, new_role=new_role)
+    pm = await run_db(
+        db, project_service.change_member_role, project_id=project_id, target_user_id=user_id, changer_id=current_user.id, new_role=new_role)
     return pm
@@ -1,20 +1,127 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.task import TaskCreate, TaskRead, TaskStatus
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from pydantic import ValidationError
+from app.schemas.task import TaskCreate, TaskRead, TaskStatus, TaskMove, TaskBulkCreate, TaskBulkStatusUpdate, TaskBulkResult, TaskList
+from app.models.task import TaskStatus as TaskStatusModel
 from app.services import task_service
-from app.deps import get_db, get_current_user
+from app.core.config import settings
+from app.deps import DbSession, get_db, get_read_db, get_current_user, run_db
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+def summarize(results):
+    # the {succeeded, failed, results} body of every bulk endpoint
+    failed = sum(1 for result in results if result["outcome"] in ("error", "not_found"))
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+async def _ndjson_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+@router.get("/", response_model=TaskList, response_model_exclude_unset=True)
+async def list_tasks(
+    project_id: Optional[uuid.UUID] = Query(None),
+    assignee_id: Optional[uuid.UUID] = Query(None),
+    mine: bool = Query(False, description="Only tasks assigned to the caller (overrides assignee_id)"),
+    status: Optional[List[TaskStatus]] = Query(None, description="Repeat for several columns"),
+    created_after: Optional[datetime] = Query(None, description="Inclusive"),
+    created_before: Optional[datetime] = Query(None, description="Exclusive"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    db: DbSession = Depends(get_read_db),
+    current_user = Depends(get_current_user),
+):
+    selected = None
+    if fields:
+        selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in selected if name not in task_service.TASK_LIST_FIELDS]
+        if unknown or not selected:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}" if unknown
+                                else "No fields requested")
+    items, next_cursor = await run_db(
+        db, task_service.list_tasks, current_user.id, project_id=project_id,
+        assignee_id=current_user.id if mine else assignee_id,
+        statuses=[TaskStatusModel(s.value) for s in status] if status else None,
+        created_after=created_after, created_before=created_before, cursor=cursor, limit=limit, fields=selected)
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.post("/", response_model=TaskRead)
-def create_task(task_in: TaskCreate, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    # Authorization checks (e.g., is user member of project) should be here
-    task = task_service.create_task(db, task_in=task_in)
+async def create_task(task_in: TaskCreate, db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    task = await run_db(db, task_service.create_task, current_user.id, task_in=task_in)
     return task
 
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_create_tasks(payload: TaskBulkCreate, db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    if len(payload.items) > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request")
+    results = await run_db(db, task_service.bulk_create_tasks, current_user.id, payload.items)
+    return summarize(results)
+
+@router.post("/bulk/ndjson", response_model=TaskBulkResult)
+async def bulk_create_tasks_ndjson(request: Request, db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    """Stream one TaskCreate JSON object per line; every chunk is inserted and committed as it arrives."""
+    results, chunk, writable = [], [], set()
+    chunk_start = index = 0
+    async for line in _ndjson_lines(request):
+        if not line.strip():
+            continue
+        if index >= settings.TASK_BULK_MAX_ITEMS:
+            results.append({"index": index, "outcome": "error",
+                            "detail": f"Limit of {settings.TASK_BULK_MAX_ITEMS} tasks reached; remaining lines ignored"})
+            break
+        try:
+            chunk.append(TaskCreate(**json.loads(line)))
+        except (ValueError, TypeError, ValidationError):
+            # flush so that result indexes stay in line order
+            if chunk:
+                results += await run_db(db, task_service.bulk_create_tasks, current_user.id, chunk,
+                                        start_index=chunk_start, writable=writable)
+                chunk = []
+            results.append({"index": index, "outcome": "error", "detail": "Invalid task"})
+            chunk_start = index + 1
+        index += 1
+        if len(chunk) >= settings.TASK_BULK_CHUNK_SIZE:
+            results += await run_db(db, task_service.bulk_create_tasks, current_user.id, chunk,
+                                    start_index=chunk_start, writable=writable)
+            chunk, chunk_start = [], index
+    if chunk:
+        results += await run_db(db, task_service.bulk_create_tasks, current_user.id, chunk,
+                                start_index=chunk_start, writable=writable)
+    return summarize(results)
+
+@router.patch("/status/bulk", response_model=TaskBulkResult)
+async def bulk_update_status(payload: TaskBulkStatusUpdate, db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    if len(payload.task_ids) > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.TASK_BULK_MAX_ITEMS} tasks per request")
+    results = await run_db(db, task_service.bulk_update_task_status, current_user.id, payload.task_ids,
+                           TaskStatusModel(payload.status.value))
+    return summarize(results)
+
 @router.patch("/status/{task_id}/", response_model=TaskRead)
-def update_status(task_id: int, status: TaskStatus, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    task = task_service.update_task_status(db, task_id=task_id, status=status)
+async def update_status(task_id: uuid.UUID, status: TaskStatus, db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    task = await run_db(db, task_service.update_task_status, task_id=task_id, user_id=current_user.id,
+                        status=TaskStatusModel(status.value))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
+
+@router.patch("/{task_id}/move", response_model=TaskRead)
+async def move_task(task_id: uuid.UUID, payload: TaskMove, background_tasks: BackgroundTasks,
+                    db: DbSession = Depends(get_db), current_user = Depends(get_current_user)):
+    task, needs_rebalance = await run_db(
+        db, task_service.move_task, task_id, current_user.id,
+        status=TaskStatusModel(payload.status.value) if payload.status else None,
+        before_id=payload.before_id, after_id=payload.after_id)
+    if needs_rebalance:
+        background_tasks.add_task(task_service.rebalance_column, task.project_id, task.status)
+    return task
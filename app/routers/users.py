@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserRead
 from app.services import user_service
-from app.deps import get_db
+from app.security import hash_password_async
+from app.deps import DbSession, get_db, run_db
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/", response_model=UserRead)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    print("inside the register route")
-    existing = user_service.get_user_by_email(db, user_in.email)
+async def create_user(user_in: UserCreate, db: DbSession = Depends(get_db)):
+    existing = await run_db(db, user_service.get_user_by_email, user_in.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = user_service.create_user(db, user_in)
+    hashed = await hash_password_async(user_in.password)
+    user = await run_db(db, user_service.create_user, user_in, hashed_password=hashed)
+    logger.info("user registered", extra={"user_id": str(user.id)})
     return user
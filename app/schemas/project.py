@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 import uuid
 from datetime import datetime
+import enum
 from app.models.project import ProjectStatus
 from app.models.membership import MemberRole
 
@@ -25,7 +26,7 @@ class ProjectMemberBase(BaseModel):
     user_id:uuid.UUID
     role:Optional[MemberRole]= MemberRole.member
 
-class ProjectMemberCreate(BaseModel):
+class ProjectMemberCreate(ProjectMemberBase):
     pass
 
 class ProjectMemberRead(ProjectMemberBase):
@@ -36,6 +37,33 @@ class ProjectMemberRead(ProjectMemberBase):
         orm_mode=True
 
 
+class MemberBatchAction(str, enum.Enum):
+    add = "add"
+    remove = "remove"
+    set_role = "set_role"
+
+class ProjectMemberBatchItem(BaseModel):
+    action: MemberBatchAction
+    user_id: uuid.UUID
+    # add: defaults to member; set_role: required
+    role: Optional[MemberRole] = None
+
+class ProjectMemberBatch(BaseModel):
+    # applied in order, so one user may appear more than once
+    items: List[ProjectMemberBatchItem]
+
+class ProjectMemberBatchItemResult(BaseModel):
+    index: int
+    user_id: uuid.UUID
+    outcome: str  # added | removed | updated | unchanged | not_found | error
+    detail: Optional[str] = None
+
+class ProjectMemberBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[ProjectMemberBatchItemResult]
+
+
 class ProjectRead(ProjectBase):
     id: uuid.UUID
     owner_id: uuid.UUID
@@ -51,4 +79,7 @@ class ProjectRead(ProjectBase):
 
 class ProjectList(BaseModel):
     items:List[ProjectRead]
-    total:int
+    # None when the caller skipped the count (include_total=false)
+    total:Optional[int] = None
+    # pass back as ?cursor= to fetch the next page; None on the last page
+    next_cursor:Optional[str] = None
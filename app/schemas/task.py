@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 import uuid
-from typing import Optional
+from typing import Optional, List, Dict
 from enum import Enum
+from datetime import datetime
 
 class TaskStatus(str, Enum):
     backlog = "backlog"
@@ -22,6 +23,89 @@ class TaskRead(TaskBase):
     project_id: uuid.UUID 
     assignee_id: Optional[uuid.UUID]
     status: TaskStatus
+    rank: Optional[str] = None
 
     class Config:
         orm_mode = True
+
+class TaskListItem(BaseModel):
+    # only the fields asked for with ?fields= are present
+    id: Optional[uuid.UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    project_id: Optional[uuid.UUID] = None
+    assignee_id: Optional[uuid.UUID] = None
+    status: Optional[TaskStatus] = None
+    rank: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class TaskList(BaseModel):
+    items: List[TaskListItem]
+    next_cursor: Optional[str] = None
+
+class TaskMove(BaseModel):
+    # target column; defaults to the task's current one
+    status: Optional[TaskStatus] = None
+    # neighbours in the target column: the task to place it after / before;
+    # leave both empty to append to the end of the column
+    before_id: Optional[uuid.UUID] = None
+    after_id: Optional[uuid.UUID] = None
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate]
+
+class TaskBulkStatusUpdate(BaseModel):
+    task_ids: List[uuid.UUID]
+    status: TaskStatus
+
+class TaskBulkItemResult(BaseModel):
+    # index of the item in the request (line number for NDJSON), or task id
+    index: Optional[int] = None
+    id: Optional[uuid.UUID] = None
+    outcome: str  # created | updated | not_found | error
+    detail: Optional[str] = None
+
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    count: int
+    items: List[TaskRead]
+    # pass back with ?status=<column>&cursor= to load more of this column
+    next_cursor: Optional[str] = None
+
+class Board(BaseModel):
+    project_id: uuid.UUID
+    columns: List[BoardColumn]
+
+class ColumnCount(BaseModel):
+    status: TaskStatus
+    count: int
+
+class CycleTime(BaseModel):
+    # tasks that reached done in the window, timed from first leaving backlog
+    tasks: int
+    avg_seconds: Optional[float] = None
+    p50_seconds: Optional[float] = None
+    p85_seconds: Optional[float] = None
+
+class FlowDay(BaseModel):
+    # ISO date (UTC) and the column counts at the end of that day
+    date: str
+    counts: Dict[TaskStatus, int]
+
+class BoardStats(BaseModel):
+    project_id: uuid.UUID
+    columns: List[ColumnCount]
+    total: int
+    # tasks in progress right now
+    wip: int
+    days: int
+    # tasks that reached done in the last ``days`` days
+    throughput: int
+    cycle_time: CycleTime
+    # cumulative flow, oldest day first
+    flow: List[FlowDay]
@@ -1,20 +1,116 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
+from fastapi import HTTPException, status
+from concurrent.futures import ThreadPoolExecutor
 from app.core.config import settings
-from typing import Optional
+from app.core.metrics import HistogramMetric
+from contextlib import contextmanager
+from typing import Optional, Tuple
+import asyncio
+import threading
+import time
+import uuid
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# argon2-cffi releases the GIL, so a small thread pool keeps hashing off the
+# event loop and the request threadpool; a counter bounds running plus
+# queued jobs so a login storm is shed with 503 instead of piling up
+_hash_executor = ThreadPoolExecutor(max_workers=settings.HASH_POOL_WORKERS, thread_name_prefix="argon2")
+_HASH_CAPACITY = settings.HASH_POOL_WORKERS + settings.HASH_POOL_QUEUE_LIMIT
+_hash_lock = threading.Lock()
+_hash_in_flight = 0
+_hash_rejected = 0
+
+hash_duration = HistogramMetric(
+    "password_hash_duration_seconds", "Argon2 time per operation.", ("operation",))
+hash_queue_wait = HistogramMetric(
+    "password_hash_queue_wait_seconds", "Time hashing jobs waited for a hash pool thread.")
+
+@contextmanager
+def _timed(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        hash_duration.labels(operation).observe(time.perf_counter() - started)
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with _timed("hash"):
+        return pwd_context.hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    with _timed("verify"):
+        return pwd_context.verify(plain, hashed)
+
+def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    # returns a new hash when the stored one uses outdated parameters
+    with _timed("verify"):
+        return pwd_context.verify_and_update(plain, hashed)
+
+def _acquire_hash_slot() -> bool:
+    global _hash_in_flight, _hash_rejected
+    with _hash_lock:
+        if _hash_in_flight >= _HASH_CAPACITY:
+            _hash_rejected += 1
+            return False
+        _hash_in_flight += 1
+        return True
+
+def _release_hash_slot(_=None) -> None:
+    global _hash_in_flight
+    with _hash_lock:
+        _hash_in_flight -= 1
+
+async def _run_in_hash_pool(fn, *args):
+    if not _acquire_hash_slot():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    submitted = time.perf_counter()
+
+    def job():
+        hash_queue_wait.observe(time.perf_counter() - submitted)
+        return fn(*args)
+
+    try:
+        future = _hash_executor.submit(job)
+    except Exception:
+        _release_hash_slot()
+        raise
+    future.add_done_callback(_release_hash_slot)
+    return await asyncio.wrap_future(future)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+async def verify_and_update_async(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update, plain, hashed)
+
+def hash_pool_stats() -> dict:
+    with _hash_lock:
+        in_flight, rejected = _hash_in_flight, _hash_rejected
+    return {
+        "workers": settings.HASH_POOL_WORKERS,
+        "queue_limit": settings.HASH_POOL_QUEUE_LIMIT,
+        "in_flight": in_flight,
+        "rejected": rejected,
+    }
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode = {"sub": str(subject), "exp": expire}
+    now = datetime.utcnow()
+    expire = now + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    # jti identifies the token so the principal cache can key on it
+    to_encode = {"sub": str(subject), "exp": expire, "iat": now, "jti": uuid.uuid4().hex}
     encoded = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded
 
@@ -1,10 +1,19 @@
-from typing import Optional, Tuple, List
-from sqlalchemy.orm import Session
-from app.models.project import Project, ProjectStatus, ProjectMember
-from app.schemas.project import ProjectCreate, MemberRole, ProjectUpdate
+from typing import Optional, Tuple, List, NamedTuple, Iterable
+from sqlalchemy import tuple_, func, or_, and_, event, select, insert, update, delete
+from sqlalchemy.orm import Session, selectinload, raiseload, lazyload
+from app.models.project import Project, ProjectStatus
+from app.models.archive import ArchivedProject
+from app.models.membership import ProjectMember
+from app.models.user import User
+from app.models.task import ProjectStatusCount, TaskStatus
+from app.schemas.project import ProjectCreate, MemberRole, ProjectUpdate, ProjectRead, ProjectMemberRead, MemberBatchAction, ProjectMemberBatchItem
 import uuid
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core import events
+from app.core.cache import response_cache, project_scope, user_scope
 
 
 def create_project(db: Session, owner_id: uuid.UUID, project_in: ProjectCreate) -> Project:
@@ -21,6 +30,9 @@ def create_project(db: Session, owner_id: uuid.UUID, project_in: ProjectCreate)
     owner_member = ProjectMember(
         project_id=project.id, user_id=owner_id, role=MemberRole.owner)
     db.add(owner_member)
+    # board counters start at zero; task_service only increments them
+    db.add_all(ProjectStatusCount(project_id=project.id, status=status, count=0) for status in TaskStatus)
+    _stale_responses(db, user_scope(owner_id))
     try:
         db.commit()
     except Exception as e:
@@ -30,43 +42,271 @@ def create_project(db: Session, owner_id: uuid.UUID, project_in: ProjectCreate)
     return project
 
 
-def get_project(db: Session, project_id: uuid.UUID, *, include_deleted: bool = False) -> Project:
-    project = db.get(Project, project_id)
+def _members_loader(with_members: bool):
+    # one batched SELECT ... WHERE project_id IN (...) for the whole result
+    # set, or skip the members query entirely (serialize with project_dict, so
+    # nothing touches the unloaded relationship)
+    return selectinload(Project.members) if with_members else raiseload(Project.members)
+
+
+def get_project(db: Session, project_id: uuid.UUID, *, include_deleted: bool = False, with_members: bool = True) -> Project:
+    """Load a live project; ``include_deleted`` also finds soft-deleted and purged ones.
+
+    Purged projects come from the archive tables (see ``app.workers.purge``)
+    as an ``ArchivedProject``, which has the same attributes.
+    """
+    # populate_existing: the access check may already hold the row, loaded
+    # without members, and the identity map would hand that back untouched
+    project = db.get(Project, project_id, options=[_members_loader(with_members)], populate_existing=True)
+    if project is None and include_deleted:
+        members = selectinload(ArchivedProject.members) if with_members else raiseload(ArchivedProject.members)
+        project = db.get(ArchivedProject, project_id, options=[members])
     if not project or (project.is_deleted and not include_deleted):
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
+class ProjectAccess(NamedTuple):
+    project: Project
+    member: Optional[ProjectMember]  # the caller's membership, if any
+
+
+_ACCESS_CACHE_KEY = "project_access"
+_STALE_RESPONSES_KEY = "stale_responses"
+_MANAGERS = (MemberRole.owner, MemberRole.admin)
+
+
+def get_project_access(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, *, include_deleted: bool = False,
+                       load_members: bool = True) -> ProjectAccess:
+    """Load a project together with ``user_id``'s membership in one query.
+
+    The result is remembered on the session (one session per request), so the
+    ``require_project_role`` dependency and the service function it guards
+    share a single lookup. Pass ``load_members=False`` when the caller never
+    serializes the project, to skip the batched members query.
+    """
+    cache = db.info.setdefault(_ACCESS_CACHE_KEY, {})
+    access = cache.get((project_id, user_id))
+    if access is None:
+        query = db.query(Project, ProjectMember).outerjoin(
+            ProjectMember,
+            and_(ProjectMember.project_id == Project.id,
+                 ProjectMember.user_id == user_id),
+        ).filter(Project.id == project_id)
+        if not load_members:
+            query = query.options(lazyload(Project.members))
+        row = query.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        access = cache[(project_id, user_id)] = ProjectAccess(*row)
+    if access.project.is_deleted and not include_deleted:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return access
+
+
+def check_role(access: ProjectAccess, roles: Iterable[MemberRole], detail: str) -> None:
+    if not access.member or access.member.role not in roles:
+        raise HTTPException(status_code=403, detail=detail)
+
+
+def _touch(db: Session, project: Project, *user_ids: uuid.UUID) -> None:
+    # invalidates ETags handed out for this project and its members, and, once
+    # committed, the cached responses of the project and of every member's list.
+    # Task writes do not come through here: they change no project field (see
+    # task_service._touch_boards), and boards and stats are never cached
+    project.version = Project.version + 1
+    audience = {member.user_id for member in project.members} | set(user_ids)
+    _stale_responses(db, project_scope(project.id), *map(user_scope, audience))
+
+
+def _stale_responses(db: Session, *scopes: str) -> None:
+    db.info.setdefault(_STALE_RESPONSES_KEY, set()).update(scopes)
+
+
+def _find_member(project: Project, user_id: uuid.UUID) -> Optional[ProjectMember]:
+    # project.members is already loaded (selectin) with the project
+    return next((m for m in project.members if m.user_id == user_id), None)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_project_access(session: Session) -> None:
+    session.info.pop(_ACCESS_CACHE_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_responses(session: Session) -> None:
+    scopes = session.info.pop(_STALE_RESPONSES_KEY, None)
+    if scopes:
+        response_cache.invalidate(*scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_responses(session: Session) -> None:
+    session.info.pop(_STALE_RESPONSES_KEY, None)
+
+
+def _project_event(project: Project) -> dict:
+    return {"id": project.id, "name": project.name, "description": project.description,
+            "status": project.status, "owner_id": project.owner_id}
+
+
+def _member_event(member: ProjectMember) -> dict:
+    return {"project_id": member.project_id, "user_id": member.user_id, "role": member.role}
+
+
+def _decode_project_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    created_at, project_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), uuid.UUID(project_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_rank(project: Project, terms: List[str]) -> float:
+    # pure-Python stand-in for ts_rank + similarity on non-Postgres databases
+    name = project.name.lower()
+    description = (project.description or "").lower()
+    score = 0.0
+    for term in terms:
+        if name == term:
+            score += 3
+        elif name.startswith(term):
+            score += 2
+        elif term in name:
+            score += 1
+        if term in description:
+            score += 0.5
+    return score
+
+
+def _search_criteria(db: Session, search: str):
+    """Return (filter, rank) for a search; rank is None when ranking happens in Python."""
+    pattern = f"%{_escape_like(search)}%"
+    if db.get_bind().dialect.name == "postgresql":
+        # both predicates are served by GIN indexes (ix_projects_search_document,
+        # ix_projects_name_trgm) and combined with a BitmapOr
+        tsquery = func.websearch_to_tsquery("simple", search)
+        document = func.project_search_document(Project.name, Project.description)
+        rank = func.ts_rank(document, tsquery) + func.similarity(Project.name, search)
+        return or_(document.op("@@")(tsquery), Project.name.ilike(pattern, escape="\\")), rank
+
+    # like websearch_to_tsquery: every word, in the name or the description
+    def matches(term: str):
+        term_pattern = f"%{_escape_like(term)}%"
+        return or_(Project.name.ilike(term_pattern, escape="\\"),
+                   Project.description.ilike(term_pattern, escape="\\"))
+
+    return or_(matches(search), and_(*(matches(word) for word in dict.fromkeys(search.split())))), None
+
+
+_PROJECT_FIELDS = [name for name in ProjectRead.model_fields if name != "members"]
+_PROJECT_ROW_COLUMNS = [getattr(Project, name) for name in _PROJECT_FIELDS] + [Project.version]
+_MEMBER_FIELDS = list(ProjectMemberRead.model_fields)
+
+
 def list_projects(
     db: Session,
     user_id: uuid.UUID,
     skip: int = 0,
     limit: int = 25,
     search: Optional[str] = None,
-) -> Tuple[List[Project], int]:
-    # user must be a member to see project (join members)
-    query = db.query(Project).join(ProjectMember).filter(
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    with_members: bool = True,
+    as_rows: bool = False,
+) -> Tuple[List[Project], Optional[int], Optional[str]]:
+    """Return ``(items, total, next_cursor)`` for one page of the user's projects.
+
+    With ``as_rows`` the items are plain row tuples of the ``ProjectRead``
+    columns plus ``version``, without members or ORM identity tracking; see
+    ``project_dicts``.
+    """
+    # user must be a member to see project (join members); (project_id, user_id)
+    # is unique, so the join yields each project once and needs no DISTINCT
+    if as_rows:
+        query = db.query(*_PROJECT_ROW_COLUMNS)
+    else:
+        query = db.query(Project).options(_members_loader(with_members))
+    query = query.join(ProjectMember, ProjectMember.project_id == Project.id).filter(
         ProjectMember.user_id == user_id,
         Project.is_deleted == False
-    ).distinct()
-
-    if search:
-        query = query.filter(Project.name.ilike(f"%{search}%"))
+    )
 
-    total = query.count()
-    items = query.order_by(Project.created_at.desc()
-                           ).offset(skip).limit(limit).all()
-    return items, total
+    if search and search.strip():
+        # ranked results cannot be keyset-paginated by (created_at, id), so the
+        # cursor carries the offset of the next page instead
+        search = search.strip()
+        if cursor:
+            skip, = decode_cursor(cursor, 1)
+            if not isinstance(skip, int) or skip < 0:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        criteria, rank = _search_criteria(db, search)
+        query = query.filter(criteria)
+        total = query.count() if include_total else None
+        if rank is not None:
+            rows = query.order_by(rank.desc(), Project.created_at.desc(), Project.id.desc()
+                                  ).offset(skip).limit(limit + 1).all()
+        else:
+            terms = search.lower().split()
+            matches = query.order_by(Project.created_at.desc(), Project.id.desc()).all()
+            matches.sort(key=lambda project: _search_rank(project, terms), reverse=True)
+            rows = matches[skip:skip + limit + 1]
+        next_cursor = encode_cursor(skip + limit) if len(rows) > limit else None
+        return rows[:limit], total, next_cursor
+
+    total = query.count() if include_total else None
+
+    if cursor:
+        # keyset: continue strictly after the last row of the previous page
+        query = query.filter(
+            tuple_(Project.created_at, Project.id) < _decode_project_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.order_by(Project.created_at.desc(), Project.id.desc()
+                          ).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+    return items, total, next_cursor
+
+
+def project_dict(project: Project, with_members: bool = True) -> dict:
+    """Shape a loaded project (or archived project) like ``ProjectRead``.
+
+    ``members`` is empty when they were not loaded (``with_members=False``).
+    """
+    return {**{name: getattr(project, name) for name in _PROJECT_FIELDS},
+            "members": project.members if with_members else []}
+
+
+def project_dicts(db: Session, rows, with_members: bool = True) -> List[dict]:
+    """Shape ``list_projects(as_rows=True)`` rows like ``ProjectRead``, skipping validation.
+
+    Members of the whole page come from one extra query, as row tuples too.
+    """
+    members = {row.id: [] for row in rows}
+    if with_members and rows:
+        columns = [getattr(ProjectMember, name) for name in _MEMBER_FIELDS]
+        for project_id, *values in db.query(ProjectMember.project_id, *columns).filter(
+                ProjectMember.project_id.in_(members)):
+            members[project_id].append(dict(zip(_MEMBER_FIELDS, values)))
+    return [{**{name: getattr(row, name) for name in _PROJECT_FIELDS}, "members": members[row.id]}
+            for row in rows]
 
 
 def update_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, project_in: ProjectUpdate) -> Project:
-    project = get_project(db, project_id)
-    # only owner or admin can update project (we'll check membership)
-    member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=user_id).first()
-    if not member or member.role not in (MemberRole.owner, MemberRole.admin):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to update project")
+    access = get_project_access(db, project_id, user_id)
+    # only owner or admin can update project
+    check_role(access, _MANAGERS, "Not authorized to update project")
+    project = access.project
 
     if project_in.name is not None:
         project.name = project_in.name.strip()
@@ -74,6 +314,7 @@ def update_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, proje
         project.description = project_in.description
     if project_in.status is not None:
         project.status = project_in.status
+    _touch(db, project)
 
     try:
         db.commit()
@@ -81,62 +322,73 @@ def update_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, proje
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to update project")
     db.refresh(project)
+    events.publish(project.id, "project.updated", _project_event(project))
     return project
 
 
 def soft_delete_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID) -> None:
-    project = get_project(db, project_id)
+    project = get_project_access(db, project_id, user_id).project
     if project.owner_id != user_id:
         raise HTTPException(
             status_code=403, detail="Only owner can delete project")
 
     project.is_deleted = True
     project.deleted_at = datetime.utcnow()
+    _touch(db, project)
     try:
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to delete project")
+    events.publish(project.id, "project.deleted", {"id": project.id})
 
 
 def restore_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID) -> Project:
-    project = get_project(db, project_id, include_deleted=True)
+    project = get_project_access(db, project_id, user_id, include_deleted=True).project
     if project.owner_id != user_id:
         raise HTTPException(
             status_code=403, detail="Only owner can restore project")
+    # the purge worker holds this lock while it empties an expired project
+    db.refresh(project, with_for_update=True)
     if not project.is_deleted:
         raise HTTPException(status_code=400, detail="Project is not deleted")
+    deleted_at = project.deleted_at
+    if deleted_at and deleted_at.tzinfo:
+        deleted_at = deleted_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if deleted_at and deleted_at < datetime.utcnow() - timedelta(days=settings.PURGE_RETENTION_DAYS):
+        raise HTTPException(status_code=410, detail="Project is past its retention window and is being purged")
 
     project.is_deleted = False
     project.deleted_at = None
+    _touch(db, project)
     db.commit()
     db.refresh(project)
+    events.publish(project.id, "project.restored", _project_event(project))
     return project
 
 
 def archive_project(db: Session, project_id: uuid.UUID, user_id: uuid.UUID) -> Project:
-    project = get_project(db, project_id)
-    member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=user_id).first()
-    if not member or member.role not in (MemberRole.owner, MemberRole.admin):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to archive project")
+    access = get_project_access(db, project_id, user_id)
+    check_role(access, _MANAGERS, "Not authorized to archive project")
+    project = access.project
 
     project.status = ProjectStatus.archived
+    _touch(db, project)
     db.commit()
     db.refresh(project)
+    events.publish(project.id, "project.updated", _project_event(project))
     return project
 
 
 def transfer_ownership(db: Session, project_id: uuid.UUID, current_owner_id: uuid.UUID, new_owner_id: uuid.UUID) -> Project:
-    project = get_project(db, project_id)
+    access = get_project_access(db, project_id, current_owner_id)
+    project = access.project
     if project.owner_id != current_owner_id:
         raise HTTPException(
             status_code=403, detail="Only current owner can transfer ownership")
 
     # ensure new_owner is a member (add if not)
-    member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=new_owner_id).first()
+    member = _find_member(project, new_owner_id)
     if not member:
         new_member = ProjectMember(
             project_id=project.id, user_id=new_owner_id, role=MemberRole.owner)
@@ -145,52 +397,46 @@ def transfer_ownership(db: Session, project_id: uuid.UUID, current_owner_id: uui
         member.role = MemberRole.owner
 
     # demote previous owner to admin (or member)
-    prev_member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=current_owner_id).first()
+    prev_member = access.member
     if prev_member:
         prev_member.role = MemberRole.admin
 
     project.owner_id = new_owner_id
+    _touch(db, project, new_owner_id)
     db.commit()
     db.refresh(project)
+    events.publish(project.id, "project.ownership_transferred",
+                   {"id": project.id, "owner_id": new_owner_id, "previous_owner_id": current_owner_id})
     return project
 
 
 def add_member(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, adder_id: uuid.UUID, role: MemberRole = MemberRole.member) -> ProjectMember:
-    project = get_project(db, project_id)
+    access = get_project_access(db, project_id, adder_id)
     # only owner/admin can add members
-    adder = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=adder_id).first()
-    if not adder or adder.role not in (MemberRole.owner, MemberRole.admin):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to add members")
+    check_role(access, _MANAGERS, "Not authorized to add members")
+    project = access.project
 
-    existing = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=user_id).first()
-    if existing:
+    if _find_member(project, user_id):
         raise HTTPException(status_code=400, detail="User is already a member")
 
     pm = ProjectMember(project_id=project.id, user_id=user_id, role=role)
     db.add(pm)
+    _touch(db, project, user_id)
     try:
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to add member")
     db.refresh(pm)
+    events.publish(project.id, "member.added", _member_event(pm))
     return pm
 
 
 def remove_member(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, remover_id: uuid.UUID) -> None:
-    project = get_project(db, project_id)
-    remover = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=remover_id).first()
-    if not remover or remover.role not in (MemberRole.owner, MemberRole.admin):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to remove members")
+    access = get_project_access(db, project_id, remover_id)
+    check_role(access, _MANAGERS, "Not authorized to remove members")
 
-    member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=user_id).first()
+    member = _find_member(access.project, user_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
@@ -199,23 +445,20 @@ def remove_member(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, remove
             status_code=400, detail="Cannot remove project owner")
 
     db.delete(member)
+    _touch(db, access.project)
     try:
         db.commit()
     except Exception:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to remove member")
+    events.publish(project_id, "member.removed", {"project_id": project_id, "user_id": user_id})
 
 
 def change_member_role(db: Session, project_id: uuid.UUID, target_user_id: uuid.UUID, changer_id: uuid.UUID, new_role: MemberRole) -> ProjectMember:
-    project = get_project(db, project_id)
-    changer = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=changer_id).first()
-    if not changer or changer.role not in (MemberRole.owner, MemberRole.admin):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to change roles")
+    access = get_project_access(db, project_id, changer_id)
+    check_role(access, _MANAGERS, "Not authorized to change roles")
 
-    member = db.query(ProjectMember).filter_by(
-        project_id=project.id, user_id=target_user_id).first()
+    member = _find_member(access.project, target_user_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
@@ -225,6 +468,104 @@ def change_member_role(db: Session, project_id: uuid.UUID, target_user_id: uuid.
             status_code=400, detail="Use transfer ownership to change owner")
 
     member.role = new_role
+    _touch(db, access.project)
     db.commit()
     db.refresh(member)
+    events.publish(project_id, "member.role_changed", _member_event(member))
     return member
+
+
+def batch_update_members(db: Session, project_id: uuid.UUID, actor_id: uuid.UUID,
+                         items: List[ProjectMemberBatchItem]) -> List[dict]:
+    """Apply adds, removes and role changes in one transaction.
+
+    Items are checked in order against the members loaded with the project
+    (one permission check, one query for the users being added). Only the net
+    change is written: one multi-row INSERT, one DELETE and one UPDATE per
+    role. An item that fails is reported and skipped, the others still apply.
+
+    Events are the single-member ones (``member.added``, ``member.removed``,
+    ``member.role_changed``), published once per member whose membership
+    actually changed, after the commit.
+    """
+    access = get_project_access(db, project_id, actor_id)
+    check_role(access, _MANAGERS, "Not authorized to manage members")
+    project = access.project
+
+    original = {member.user_id: member.role for member in project.members}
+    roles = dict(original)  # user_id -> role as of the current item, None once removed
+    added_ids = {item.user_id for item in items
+                 if item.action == MemberBatchAction.add and item.user_id not in original}
+    known_users = set(db.execute(select(User.id).where(User.id.in_(added_ids))).scalars()) if added_ids else set()
+
+    results = []
+    for index, item in enumerate(items):
+        result = {"index": index, "user_id": item.user_id}
+        results.append(result)
+        current = roles.get(item.user_id)
+        if item.action == MemberBatchAction.add:
+            role = item.role or MemberRole.member
+            if current is not None:
+                result.update(outcome="error", detail="User is already a member")
+            elif item.user_id not in original and item.user_id not in known_users:
+                result.update(outcome="not_found", detail="User not found")
+            elif role == MemberRole.owner:
+                result.update(outcome="error", detail="Use transfer ownership to change owner")
+            else:
+                roles[item.user_id] = role
+                result["outcome"] = "added"
+        elif current is None:
+            result.update(outcome="not_found", detail="Member not found")
+        elif current == MemberRole.owner:
+            result.update(outcome="error", detail="Cannot remove project owner" if item.action == MemberBatchAction.remove
+                          else "Use transfer ownership to change owner")
+        elif item.action == MemberBatchAction.remove:
+            roles[item.user_id] = None
+            result["outcome"] = "removed"
+        elif item.role is None:
+            result.update(outcome="error", detail="A role is required")
+        elif item.role == MemberRole.owner:
+            result.update(outcome="error", detail="Use transfer ownership to change owner")
+        else:
+            roles[item.user_id] = item.role
+            result["outcome"] = "updated" if item.role != current else "unchanged"
+
+    inserted = [{"id": uuid.uuid4(), "project_id": project_id, "user_id": user_id, "role": role}
+                for user_id, role in roles.items() if role is not None and user_id not in original]
+    removed = [user_id for user_id, role in roles.items() if role is None and user_id in original]
+    changed = {}
+    for user_id, role in roles.items():
+        if role is not None and user_id in original and role != original[user_id]:
+            changed.setdefault(role, []).append(user_id)
+    if not (inserted or removed or changed):
+        return results
+
+    if inserted:
+        db.execute(insert(ProjectMember).values(inserted))
+    if removed:
+        db.execute(delete(ProjectMember).where(
+            ProjectMember.project_id == project_id, ProjectMember.user_id.in_(removed))
+            .execution_options(synchronize_session=False))
+    for role, user_ids in changed.items():
+        db.execute(update(ProjectMember).where(
+            ProjectMember.project_id == project_id, ProjectMember.user_id.in_(user_ids))
+            .values(role=role).execution_options(synchronize_session=False))
+    _touch(db, project, *(row["user_id"] for row in inserted))
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Failed to update members")
+    # one event per affected member, named and shaped like the single-member
+    # endpoints' events, so subscribers handle both alike (and a removed
+    # member's event streams are revoked the same way)
+    for row in inserted:
+        events.publish(project_id, "member.added",
+                       {"project_id": project_id, "user_id": row["user_id"], "role": row["role"]})
+    for user_id in removed:
+        events.publish(project_id, "member.removed", {"project_id": project_id, "user_id": user_id})
+    for role, user_ids in changed.items():
+        for user_id in user_ids:
+            events.publish(project_id, "member.role_changed",
+                           {"project_id": project_id, "user_id": user_id, "role": role})
+    return results
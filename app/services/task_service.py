@@ -1,21 +1,484 @@
-from sqlalchemy.orm import Session
-from app.models.task import Task, TaskStatus
-from app.schemas.task import TaskCreate
+import hashlib
+import statistics
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, List, Iterable, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, func, case, tuple_, true, or_, and_, insert, update, bindparam, BigInteger
+from sqlalchemy.orm import Session, aliased, Bundle
+from app.models.task import Task, TaskStatus, ProjectStatusCount, TaskStatusTransition
+from app.models.project import Project
+from app.models.membership import ProjectMember, MemberRole
+from app.schemas.task import TaskCreate, TaskRead
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core import events
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.ranking import rank_between, ranks_between
+from app.services import project_service
 
-def create_task(db: Session, task_in: TaskCreate):
-    task = Task(title=task_in.title, description=task_in.description, project_id=task_in.project_id,
-                assignee_id=task_in.assignee_id)
+# roles that may create, move and edit tasks
+_EDITORS = (MemberRole.owner, MemberRole.admin, MemberRole.member)
+
+def _column(project_id: uuid.UUID, status: TaskStatus):
+    return (Task.project_id == project_id, Task.status == status)
+
+def _last_rank(db: Session, project_id: uuid.UUID, status: TaskStatus) -> Optional[str]:
+    # served from the end of ix_tasks_project_status_rank
+    return db.query(func.max(Task.rank)).filter(*_column(project_id, status)).scalar()
+
+def _touch_boards(db: Session, project_ids: Iterable[uuid.UUID]) -> None:
+    # invalidates board ETags; runs in the caller's transaction. updated_at is
+    # pinned so the onupdate does not fire: task writes leave the project's own
+    # fields (and so its version, ETags and cached bodies) alone
+    db.execute(update(Project).where(Project.id.in_(set(project_ids)))
+               .values(board_version=Project.board_version + 1, updated_at=Project.updated_at)
+               .execution_options(synchronize_session=False))
+
+# (task id, project id, previous status or None for a new task, new status)
+StatusChange = Tuple[uuid.UUID, uuid.UUID, Optional[TaskStatus], TaskStatus]
+
+_status_counts = ProjectStatusCount.__table__
+
+def _record_status_changes(db: Session, changes: Iterable[StatusChange]) -> None:
+    """Append transition history and adjust the per-column counters.
+
+    Runs in the caller's transaction, so the counters always agree with the
+    tasks table; counter rows are updated in a fixed order to avoid deadlocks.
+    """
+    changes = [change for change in changes if change[2] != change[3]]
+    if not changes:
+        return
+    # pending new tasks must exist before their history rows reference them
+    db.flush()
+    rows = [{"id": uuid.uuid4(), "task_id": task_id, "project_id": project_id,
+             "from_status": from_status, "to_status": to_status}
+            for task_id, project_id, from_status, to_status in changes]
+    chunk_size = settings.TASK_BULK_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(TaskStatusTransition).values(rows[start:start + chunk_size]))
+
+    deltas = defaultdict(int)
+    for _, project_id, from_status, to_status in changes:
+        if from_status is not None:
+            deltas[project_id, from_status] -= 1
+        deltas[project_id, to_status] += 1
+    params = [{"counter_project": project_id, "counter_status": status, "delta": delta}
+              for (project_id, status), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1].value))
+              if delta]
+    if params:
+        db.execute(_status_counts.update()
+                   .where(_status_counts.c.project_id == bindparam("counter_project"),
+                          _status_counts.c.status == bindparam("counter_status"))
+                   .values(count=_status_counts.c.count + bindparam("delta")), params)
+
+def _task_event(task: Task) -> dict:
+    return {"id": task.id, "project_id": task.project_id, "title": task.title, "assignee_id": task.assignee_id,
+            "status": task.status, "rank": task.rank}
+
+def _check_editor(db: Session, project_id: uuid.UUID, user_id: uuid.UUID, detail: str) -> None:
+    access = project_service.get_project_access(db, project_id, user_id, load_members=False)
+    project_service.check_role(access, _EDITORS, detail)
+
+def create_task(db: Session, user_id: uuid.UUID, task_in: TaskCreate):
+    _check_editor(db, task_in.project_id, user_id, "Not allowed to add tasks to this project")
+    task = Task(id=uuid.uuid4(), title=task_in.title, description=task_in.description, project_id=task_in.project_id,
+                assignee_id=task_in.assignee_id, status=TaskStatus.backlog,
+                rank=rank_between(_last_rank(db, task_in.project_id, TaskStatus.backlog), None))
     db.add(task)
+    _record_status_changes(db, [(task.id, task.project_id, None, task.status)])
+    _touch_boards(db, [task.project_id])
     db.commit()
     db.refresh(task)
+    events.publish(task.project_id, "task.created", _task_event(task))
     return task
 
-def update_task_status(db: Session, task_id: int, status: TaskStatus):
-    task = db.get(Task, task_id)
+def update_task_status(db: Session, task_id: uuid.UUID, user_id: uuid.UUID, status: TaskStatus):
+    # locked so that concurrent moves of this task count once each
+    task = db.get(Task, task_id, with_for_update=True)
     if not task:
         return None
+    _check_editor(db, task.project_id, user_id, "Not allowed to change tasks in this project")
+    if task.status == status:
+        # nothing changes, so the board version and its ETags stay valid;
+        # the row lock goes with the request's transaction
+        return task
+    # lands at the bottom of its new column
+    task.rank = rank_between(_last_rank(db, task.project_id, status), None)
+    _record_status_changes(db, [(task.id, task.project_id, task.status, status)])
     task.status = status
-    db.add(task)
+    _touch_boards(db, [task.project_id])
     db.commit()
     db.refresh(task)
+    events.publish(task.project_id, "task.status_changed", _task_event(task))
     return task
+
+def _lock_column(db: Session, project_id: uuid.UUID, status: TaskStatus) -> None:
+    """Serialize rank changes in one column until the transaction ends.
+
+    Taken by ``move_task`` before it reads the column and by the rebalance
+    before it rewrites it, so a move never computes a rank from keys a
+    concurrent rebalance is replacing. A transaction-scoped advisory lock on
+    Postgres; SQLite already runs one writer at a time.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    digest = hashlib.blake2b(f"{project_id}:{status.value}".encode(), digest_size=8).digest()
+    key = int.from_bytes(digest, "big", signed=True)
+    db.execute(select(func.pg_advisory_xact_lock(bindparam("column_lock", key, type_=BigInteger))))
+
+def _neighbour_ranks(db: Session, task: Task, status: TaskStatus, before: Optional[Task], after: Optional[Task]):
+    others = _column(task.project_id, status) + (Task.id != task.id,)
+    if before is not None and after is not None:
+        return before.rank, after.rank
+    if before is not None:
+        return before.rank, db.query(func.min(Task.rank)).filter(*others, Task.rank > before.rank).scalar()
+    if after is not None:
+        return db.query(func.max(Task.rank)).filter(*others, Task.rank < after.rank).scalar(), after.rank
+    return db.query(func.max(Task.rank)).filter(*others).scalar(), None
+
+def move_task(db: Session, task_id: uuid.UUID, user_id: uuid.UUID, status: Optional[TaskStatus] = None,
+              before_id: Optional[uuid.UUID] = None, after_id: Optional[uuid.UUID] = None):
+    """Place a task between two neighbours, writing only the moved row.
+
+    Returns ``(task, needs_rebalance)``; the latter is set once the new rank
+    key has grown long enough that the column should be respread.
+    """
+    if task_id in (before_id, after_id):
+        raise HTTPException(status_code=400, detail="A task cannot be its own neighbour")
+    current = db.query(Task.project_id, Task.status).filter(Task.id == task_id).first()
+    if current is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    # without a status the task stays in the column it was read from
+    status = status or current.status
+    # the column lock comes before any row lock, in the same order as the rebalance
+    _lock_column(db, current.project_id, status)
+    wanted = {task_id, before_id, after_id} - {None}
+    tasks = {t.id: t for t in db.query(Task).filter(Task.id.in_(wanted)).with_for_update()}
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    _check_editor(db, task.project_id, user_id, "Not allowed to move tasks in this project")
+
+    before, after = tasks.get(before_id), tasks.get(after_id)
+    for neighbour_id, neighbour in ((before_id, before), (after_id, after)):
+        if neighbour_id and (neighbour is None or neighbour.project_id != task.project_id or neighbour.status != status):
+            raise HTTPException(status_code=400, detail="Neighbours must be tasks in the target column")
+
+    low, high = _neighbour_ranks(db, task, status, before, after)
+    rebalanced = low is not None and high is not None and low >= high
+    if rebalanced:
+        # equal ranks (e.g. concurrent appends) leave no room; respread first
+        _rebalance_column(db, task.project_id, status)
+        for neighbour in (before, after):
+            if neighbour is not None:
+                db.refresh(neighbour, ["rank"])
+        low, high = _neighbour_ranks(db, task, status, before, after)
+        if low is not None and high is not None and low >= high:
+            raise HTTPException(status_code=400, detail="before_id must come before after_id")
+
+    _record_status_changes(db, [(task.id, task.project_id, task.status, status)])
+    task.status = status
+    task.rank = rank_between(low, high)
+    _touch_boards(db, [task.project_id])
+    db.commit()
+    db.refresh(task)
+    if rebalanced:
+        _publish_rebalanced(task.project_id, status)
+    events.publish(task.project_id, "task.moved", _task_event(task))
+    return task, len(task.rank) > settings.TASK_RANK_REBALANCE_LENGTH
+
+def _publish_rebalanced(project_id: uuid.UUID, status: TaskStatus) -> None:
+    # every rank in the column changed; clients reload it rather than patch it
+    events.publish(project_id, "board.rebalanced", {"project_id": project_id, "status": status})
+
+def _rebalance_column(db: Session, project_id: uuid.UUID, status: TaskStatus) -> None:
+    ids = [task_id for task_id, in db.query(Task.id).filter(*_column(project_id, status))
+           .order_by(Task.rank, Task.id).with_for_update()]
+    ranks = ranks_between(None, None, len(ids))
+    chunk_size = settings.TASK_BULK_CHUNK_SIZE
+    for start in range(0, len(ids), chunk_size):
+        # ORM bulk UPDATE by primary key (executemany)
+        db.execute(update(Task), [{"id": task_id, "rank": rank}
+                                  for task_id, rank in zip(ids[start:start + chunk_size], ranks[start:start + chunk_size])])
+
+def rebalance_column(project_id: uuid.UUID, status: TaskStatus) -> None:
+    """Respread one column's rank keys; meant to run as a background task."""
+    with SessionLocal() as db:
+        _lock_column(db, project_id, status)
+        _rebalance_column(db, project_id, status)
+        _touch_boards(db, [project_id])
+        db.commit()
+    _publish_rebalanced(project_id, status)
+
+def _writable_project_ids(db: Session, user_id: uuid.UUID, project_ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+    # live projects among project_ids where the user may edit tasks, in one query
+    rows = db.query(ProjectMember.project_id).join(Project).filter(
+        ProjectMember.user_id == user_id,
+        ProjectMember.project_id.in_(set(project_ids)),
+        ProjectMember.role != MemberRole.viewer,
+        Project.is_deleted == False,
+    ).all()
+    return {project_id for project_id, in rows}
+
+def bulk_create_tasks(db: Session, user_id: uuid.UUID, items: List[TaskCreate], *, start_index: int = 0,
+                      writable: Optional[Set[uuid.UUID]] = None) -> List[dict]:
+    """Insert ``items`` with one multi-row INSERT per chunk and a single commit.
+
+    ``writable`` lets streaming callers reuse the permission lookup across chunks.
+    """
+    if writable is None:
+        writable = set()
+    unknown = {item.project_id for item in items} - writable
+    if unknown:
+        writable |= _writable_project_ids(db, user_id, unknown)
+
+    rows, results = [], []
+    accepted = [item for item in items if item.project_id in writable]
+    # append each project's new tasks below its current backlog, one query
+    last_ranks = dict(db.query(Task.project_id, func.max(Task.rank)).filter(
+        Task.project_id.in_({item.project_id for item in accepted}),
+        Task.status == TaskStatus.backlog,
+    ).group_by(Task.project_id).all()) if accepted else {}
+    new_ranks = {}
+    for project_id in {item.project_id for item in accepted}:
+        count = sum(1 for item in accepted if item.project_id == project_id)
+        new_ranks[project_id] = iter(ranks_between(last_ranks.get(project_id), None, count))
+    for index, item in enumerate(items, start=start_index):
+        if item.project_id not in writable:
+            results.append({"index": index, "outcome": "error", "detail": "Not allowed to add tasks to this project"})
+            continue
+        # ids are generated here so results can report them without RETURNING
+        task_id = uuid.uuid4()
+        rows.append({"id": task_id, "title": item.title, "description": item.description,
+                     "project_id": item.project_id, "assignee_id": item.assignee_id,
+                     "status": TaskStatus.backlog, "rank": next(new_ranks[item.project_id])})
+        results.append({"index": index, "id": task_id, "outcome": "created"})
+
+    chunk_size = settings.TASK_BULK_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(Task).values(rows[start:start + chunk_size]))
+    if rows:
+        _record_status_changes(db, [(row["id"], row["project_id"], None, row["status"]) for row in rows])
+        _touch_boards(db, {row["project_id"] for row in rows})
+    db.commit()
+    # one event per project rather than per task
+    created = {}
+    for row in rows:
+        created.setdefault(row["project_id"], []).append(row["id"])
+    for project_id, task_ids in created.items():
+        events.publish(project_id, "tasks.created", {"project_id": project_id, "ids": task_ids})
+    return results
+
+def bulk_update_task_status(db: Session, user_id: uuid.UUID, task_ids: List[uuid.UUID], status: TaskStatus) -> List[dict]:
+    """Move many tasks to ``status`` with a single UPDATE ... WHERE id IN (...).
+
+    The tasks are read (and locked) first for their previous status, which
+    the board counters and transition history need. Moved tasks keep their
+    rank keys, so they interleave with the target column by their previous
+    order rather than landing at its bottom.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    writable_projects = select(ProjectMember.project_id).join(Project).where(
+        ProjectMember.user_id == user_id,
+        ProjectMember.role != MemberRole.viewer,
+        Project.is_deleted == False,
+    )
+    found = db.execute(
+        select(Task.id, Task.project_id, Task.status)
+        .where(Task.id.in_(task_ids), Task.project_id.in_(writable_projects))
+        .with_for_update()
+    ).all()
+    changes = [(task_id, project_id, previous, status) for task_id, project_id, previous in found if previous != status]
+    moved = {}
+    for task_id, project_id, _, _ in changes:
+        moved.setdefault(project_id, []).append(task_id)
+    if changes:
+        db.execute(update(Task).where(Task.id.in_([change[0] for change in changes])).values(status=status)
+                   .execution_options(synchronize_session=False))
+        _record_status_changes(db, changes)
+        _touch_boards(db, moved)
+    db.commit()
+    for project_id, ids in moved.items():
+        events.publish(project_id, "tasks.status_changed", {"project_id": project_id, "ids": ids, "status": status})
+    updated = {task_id for task_id, _, _ in found}
+    return [{"id": task_id, "outcome": "updated" if task_id in updated else "not_found"} for task_id in task_ids]
+
+def _decode_board_cursor(cursor: str):
+    rank, task_id = decode_cursor(cursor, 2)
+    try:
+        return str(rank), uuid.UUID(task_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+_TASK_FIELDS = list(TaskRead.model_fields)
+
+def get_board(db: Session, project_id: uuid.UUID, limit: int = 50, status: Optional[TaskStatus] = None,
+              cursor: Optional[str] = None, as_rows: bool = False) -> dict:
+    """Read every column of a project's board (or one column) in a single query.
+
+    Window functions give each row its column's total count and its position
+    within the page, so only up to ``limit + 1`` rows per column come back.
+    With ``as_rows`` the tasks are plain dicts shaped like ``TaskRead``,
+    built from row tuples instead of ORM entities.
+    """
+    if cursor and status is None:
+        raise HTTPException(status_code=400, detail="A cursor needs the status of its column")
+    sort_key = (Task.rank, Task.id)
+    after = tuple_(*sort_key) > _decode_board_cursor(cursor) if cursor else true()
+    on_page = case((after, 1), else_=0)
+    inner = select(
+        Task,
+        func.count().over(partition_by=Task.status).label("column_count"),
+        on_page.label("on_page"),
+        # running count of rows past the cursor, i.e. position on this page
+        func.sum(on_page).over(partition_by=Task.status, order_by=sort_key).label("page_position"),
+        func.row_number().over(partition_by=Task.status, order_by=sort_key).label("column_row"),
+    ).where(Task.project_id == project_id)
+    if status is not None:
+        inner = inner.where(Task.status == status)
+    inner = inner.subquery()
+
+    if as_rows:
+        task = Bundle("task", *(inner.c[name] for name in _TASK_FIELDS))
+    else:
+        task = aliased(Task, inner)
+    rows = db.query(task, inner.c.column_count, inner.c.on_page).filter(or_(
+        and_(inner.c.on_page == 1, inner.c.page_position <= limit + 1),
+        # keeps the column's count even when the cursor is past its end
+        inner.c.column_row == 1,
+    )).order_by(inner.c.status, inner.c.column_row).all()
+
+    statuses = [status] if status is not None else list(TaskStatus)
+    columns = {s: {"status": s.value, "count": 0, "items": [], "next_cursor": None} for s in statuses}
+    for item, column_count, on_page in rows:
+        column = columns[item.status]
+        column["count"] = column_count
+        if not on_page:
+            continue
+        if len(column["items"]) < limit:
+            column["items"].append(item)
+        else:
+            last = column["items"][-1]
+            column["next_cursor"] = encode_cursor(last.rank, last.id)
+    if as_rows:
+        for column in columns.values():
+            column["items"] = [item._asdict() for item in column["items"]]
+    return {"project_id": project_id, "columns": list(columns.values())}
+
+TASK_LIST_FIELDS = [*TaskRead.model_fields, "created_at"]
+
+def _decode_task_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    created_at, task_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), uuid.UUID(task_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def list_tasks(db: Session, user_id: uuid.UUID, *, project_id: Optional[uuid.UUID] = None,
+               assignee_id: Optional[uuid.UUID] = None, statuses: Optional[List[TaskStatus]] = None,
+               created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+               cursor: Optional[str] = None, limit: int = 50,
+               fields: Optional[List[str]] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of the tasks ``user_id`` can see, newest first, as dicts of ``fields``.
+
+    Pages are keyset-paginated on ``(created_at, id)``. A project filter is
+    served by ``ix_tasks_project_created_at`` and an assignee filter by
+    ``ix_tasks_assignee_created_at``; on Postgres both carry id, title,
+    status and the other filter column, so the default ``fields`` of list
+    views are answered by index-only scans.
+    """
+    fields = fields or TASK_LIST_FIELDS
+    # the sort key is always read, for the cursor
+    names = list(dict.fromkeys([*fields, "created_at", "id"]))
+    query = db.query(*(getattr(Task, name) for name in names))
+    if project_id is not None:
+        access = project_service.get_project_access(db, project_id, user_id, load_members=False)
+        project_service.check_role(access, tuple(MemberRole), "Not a member of this project")
+        query = query.filter(Task.project_id == project_id)
+    else:
+        visible = select(ProjectMember.project_id).join(Project).where(
+            ProjectMember.user_id == user_id, Project.is_deleted == False)
+        query = query.filter(Task.project_id.in_(visible))
+    if assignee_id is not None:
+        query = query.filter(Task.assignee_id == assignee_id)
+    if statuses:
+        query = query.filter(Task.status.in_(statuses))
+    if created_after is not None:
+        query = query.filter(Task.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(Task.created_at < created_before)
+    if cursor:
+        query = query.filter(tuple_(Task.created_at, Task.id) < _decode_task_cursor(cursor))
+
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+    return [{name: getattr(row, name) for name in fields} for row in rows[:limit]], next_cursor
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    # nearest rank
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))]
+
+def get_board_stats(db: Session, project_id: uuid.UUID, days: int = 14) -> dict:
+    """Column counts, WIP, throughput, cycle time and a cumulative flow series.
+
+    Counts come from the maintained counters (one row per column). The
+    ``days``-long window reads only the transitions inside it: daily net
+    changes are subtracted backwards from today's counts to give each day's
+    closing counts, and tasks that reached done in the window yield
+    throughput and cycle time (first move out of backlog to reaching done).
+    """
+    counts = dict(db.query(ProjectStatusCount.status, ProjectStatusCount.count)
+                  .filter(ProjectStatusCount.project_id == project_id))
+    counts = {status: counts.get(status, 0) for status in TaskStatus}
+    today = datetime.now(timezone.utc).date()
+    since = datetime.combine(today - timedelta(days=days - 1), time.min, tzinfo=timezone.utc)
+    in_window = (TaskStatusTransition.project_id == project_id, TaskStatusTransition.changed_at >= since)
+
+    day = func.date(TaskStatusTransition.changed_at)
+    net = defaultdict(lambda: defaultdict(int))
+    for changed_on, from_status, to_status, moves in db.query(
+        day, TaskStatusTransition.from_status, TaskStatusTransition.to_status, func.count(),
+    ).filter(*in_window).group_by(day, TaskStatusTransition.from_status, TaskStatusTransition.to_status):
+        # a date on Postgres, ISO text on SQLite
+        changed_on = str(changed_on)[:10]
+        if from_status is not None:
+            net[changed_on][from_status] -= moves
+        net[changed_on][to_status] += moves
+
+    flow, closing = [], dict(counts)
+    for offset in range(days):
+        date = (today - timedelta(days=offset)).isoformat()
+        flow.append({"date": date, "counts": {status.value: count for status, count in closing.items()}})
+        for status, change in net[date].items():
+            closing[status] -= change
+    flow.reverse()
+
+    done = (db.query(TaskStatusTransition.task_id, func.max(TaskStatusTransition.changed_at).label("done_at"))
+            .filter(*in_window, TaskStatusTransition.to_status == TaskStatus.done)
+            .group_by(TaskStatusTransition.task_id).subquery())
+    started = aliased(TaskStatusTransition)
+    finished = db.query(done.c.done_at, func.min(started.changed_at)).outerjoin(started, and_(
+        started.task_id == done.c.task_id, started.from_status == TaskStatus.backlog,
+    )).group_by(done.c.task_id, done.c.done_at).all()
+    durations = sorted(max(0.0, (done_at - (started_at or done_at)).total_seconds()) for done_at, started_at in finished)
+
+    return {
+        "project_id": project_id,
+        "columns": [{"status": status.value, "count": count} for status, count in counts.items()],
+        "total": sum(counts.values()),
+        "wip": counts[TaskStatus.in_progress],
+        "days": days,
+        "throughput": len(durations),
+        "cycle_time": {
+            "tasks": len(durations),
+            "avg_seconds": statistics.fmean(durations) if durations else None,
+            "p50_seconds": _percentile(durations, 0.5) if durations else None,
+            "p85_seconds": _percentile(durations, 0.85) if durations else None,
+        },
+        "flow": flow,
+    }
@@ -1,7 +1,9 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.security import hash_password, verify_password
+from app.security import hash_password
+from app.core.cache import invalidate_principal
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
@@ -9,18 +11,31 @@ def get_user_by_email(db: Session, email: str):
 def get_user(db: Session, user_id: int):
     return db.get(User, user_id)
 
-def create_user(db: Session, user: UserCreate):
-    hashed = hash_password(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    # routers hash in the bounded hash pool and pass the result in
+    hashed = hashed_password or hash_password(user.password)
     db_user = User(email=user.email, hashed_password=hashed)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user:
-        return None
-    if not verify_password(password, user.hashed_password):
-        return None
+def set_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.commit()
+    invalidate_principal(user.id)
+    db.refresh(user)
     return user
+
+def update_password(db: Session, user: User, password: str):
+    return set_password_hash(db, user, hash_password(password))
+
+def delete_user(db: Session, user_id):
+    user = db.get(User, user_id)
+    if not user:
+        return False
+    db.delete(user)
+    db.commit()
+    invalidate_principal(user_id)
+    return True
@@ -0,0 +1,198 @@
+"""Purge soft-deleted projects once their retention window has passed.
+
+    python -m app.workers.purge [--once]
+
+Each expired project is emptied in bounded transactions of at most
+``PURGE_BATCH_SIZE`` tasks: the rows are copied to ``archived_tasks`` (unless
+``PURGE_ARCHIVE`` is off) and deleted along with their transition history.
+A last transaction moves the members and the project row itself. No
+transaction holds more than one batch of row locks, and a run that stops
+halfway simply continues with the same project next time.
+
+Every transaction starts by locking the project row, skipping projects
+another worker holds, so several workers can run at once on Postgres.
+Restores past the window are refused (see ``project_service.restore_project``)
+so a project cannot come back while it is half purged.
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import Counter
+from app.models.archive import ArchivedProject, ArchivedProjectMember, ArchivedTask
+from app.models.membership import ProjectMember
+from app.models.project import Project
+from app.models.task import ProjectStatusCount, Task, TaskStatusTransition
+
+logger = logging.getLogger(__name__)
+
+projects_purged = Counter("purge_projects_total", "Soft-deleted projects purged.")
+rows_purged = Counter("purge_rows_total", "Rows removed from the live tables by the purge worker.", ("table",))
+
+_TASK_COLUMNS = [column.name for column in ArchivedTask.__table__.columns if column.name != "archived_at"]
+_MEMBER_COLUMNS = [column.name for column in ArchivedProjectMember.__table__.columns]
+_PROJECT_COLUMNS = [column.name for column in ArchivedProject.__table__.columns if column.name != "archived_at"]
+
+
+def retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    # deleted_at is written as naive UTC by soft_delete_project
+    return (now or datetime.utcnow()) - timedelta(days=settings.PURGE_RETENTION_DAYS)
+
+
+def expired_project_ids(db: Session, cutoff: datetime, limit: int) -> List[uuid.UUID]:
+    return db.execute(
+        select(Project.id)
+        .where(Project.is_deleted == True, Project.deleted_at < cutoff)
+        .order_by(Project.deleted_at)
+        .limit(limit)
+    ).scalars().all()
+
+
+def _copy(db: Session, target, source, columns: List[str], condition) -> None:
+    db.execute(insert(target).from_select(
+        columns, select(*(source.__table__.c[name] for name in columns)).where(condition)))
+
+
+def _lock_expired(db: Session, project_id: uuid.UUID, cutoff: datetime) -> Optional[Project]:
+    # taken at the start of every transaction; restore_project takes the same
+    # lock before checking the window, so a project is never restored half purged
+    return db.execute(
+        select(Project).where(Project.id == project_id, Project.is_deleted == True, Project.deleted_at < cutoff)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+
+
+def _purge_task_batch(db: Session, project_id: uuid.UUID, cutoff: datetime, archive: bool, batch_size: int) -> int:
+    if _lock_expired(db, project_id, cutoff) is None:
+        db.rollback()
+        return -1
+    task_ids = db.execute(
+        select(Task.id).where(Task.project_id == project_id).limit(batch_size).with_for_update()
+    ).scalars().all()
+    if not task_ids:
+        return 0
+    if archive:
+        _copy(db, ArchivedTask, Task, _TASK_COLUMNS, Task.id.in_(task_ids))
+    transitions = db.execute(delete(TaskStatusTransition).where(TaskStatusTransition.task_id.in_(task_ids)))
+    db.execute(delete(Task).where(Task.id.in_(task_ids)))
+    db.commit()
+    rows_purged.labels("task_status_transitions").inc(transitions.rowcount or 0)
+    rows_purged.labels("tasks").inc(len(task_ids))
+    return len(task_ids)
+
+
+def _purge_project_row(db: Session, project_id: uuid.UUID, archive: bool) -> None:
+    # runs in the transaction that found no tasks left, still holding the lock
+    if archive:
+        # the project first: archived members reference it
+        _copy(db, ArchivedProject, Project, _PROJECT_COLUMNS, Project.id == project_id)
+        _copy(db, ArchivedProjectMember, ProjectMember, _MEMBER_COLUMNS, ProjectMember.project_id == project_id)
+    members = db.execute(delete(ProjectMember).where(ProjectMember.project_id == project_id))
+    db.execute(delete(ProjectStatusCount).where(ProjectStatusCount.project_id == project_id))
+    db.execute(delete(TaskStatusTransition).where(TaskStatusTransition.project_id == project_id))
+    db.execute(delete(Project).where(Project.id == project_id))
+    db.commit()
+    rows_purged.labels("project_members").inc(members.rowcount or 0)
+    rows_purged.labels("projects").inc()
+
+
+def purge_project(db: Session, project_id: uuid.UUID, cutoff: datetime, *, archive: Optional[bool] = None,
+                  batch_size: Optional[int] = None) -> bool:
+    """Purge one expired project; False if it was restored, taken or already gone."""
+    archive = settings.PURGE_ARCHIVE if archive is None else archive
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    tasks = 0
+    while True:
+        moved = _purge_task_batch(db, project_id, cutoff, archive, batch_size)
+        if moved < 0:
+            return False
+        if not moved:
+            break
+        tasks += moved
+    _purge_project_row(db, project_id, archive)
+    projects_purged.inc()
+    logger.info("project purged", extra={"project_id": str(project_id), "tasks": tasks, "archived": archive})
+    return True
+
+
+def purge_expired(now: Optional[datetime] = None, limit: Optional[int] = None) -> int:
+    """Purge every project whose retention has passed; returns how many were purged."""
+    cutoff = retention_cutoff(now)
+    purged = 0
+    with SessionLocal() as db:
+        while True:
+            project_ids = expired_project_ids(db, cutoff, min(limit - purged, 100) if limit else 100)
+            db.rollback()
+            if not project_ids:
+                return purged
+            progress = False
+            for project_id in project_ids:
+                if purge_project(db, project_id, cutoff):
+                    purged += 1
+                    progress = True
+            # projects skipped here are locked by another worker
+            if not progress or (limit and purged >= limit):
+                return purged
+
+
+class PurgeWorker:
+    """Runs ``purge_expired`` every ``interval`` seconds on the API's event loop."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(purge_expired)
+            except Exception:
+                logger.exception("purge run failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+purge_worker = PurgeWorker(settings.PURGE_INTERVAL_SECONDS)
+
+
+def main():
+    from app.core.log import setup_logging
+
+    parser = argparse.ArgumentParser(description="Purge soft-deleted projects past their retention window.")
+    parser.add_argument("--once", action="store_true", help="purge what is due and exit")
+    parser.add_argument("--interval", type=float, default=settings.PURGE_INTERVAL_SECONDS or 3600,
+                        help="seconds between runs (default: PURGE_INTERVAL_SECONDS or an hour)")
+    args = parser.parse_args()
+    setup_logging()
+    while True:
+        purged = purge_expired()
+        logger.info("purge run finished", extra={"projects": purged})
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
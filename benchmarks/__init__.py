@@ -0,0 +1,15 @@
+"""Benchmarks for the API hot paths; see ``benchmarks.api`` and ``benchmarks.serialization``.
+
+Importing the package fills in the settings the app requires, pointing at a
+throwaway SQLite database unless DATABASE_URL is already set.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# the suite deliberately exceeds the per-client limits
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
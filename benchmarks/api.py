@@ -0,0 +1,308 @@
+"""Load-test the API hot paths and compare the results against a baseline.
+
+    python -m benchmarks.api                              # in-process, throwaway SQLite
+    DATABASE_URL=postgresql://... python -m benchmarks.api   # in-process, throwaway Postgres
+    python -m benchmarks.api --url http://localhost:8000  # a running server
+    python -m benchmarks.api --save benchmarks/baseline.json
+    python -m benchmarks.api --compare benchmarks/baseline.json --max-regression 0.25
+
+Every scenario reports throughput, p50/p99 latency and SQL statements per
+request; the latter comes from the ``http_request_db_queries`` histogram on
+``/metrics``, so against a multi-worker server it only covers the worker
+that answered the scrape. Fixtures are created through the API with
+unique emails, so the same database can be reused between runs.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+PASSWORD = "benchmark-password"
+LIST_SIZES = (1, 25, 100)
+MEMBERS_PER_PROJECT = 5
+
+_QUERY_SAMPLE = re.compile(r'^http_request_db_queries_(sum|count)\{method="([^"]*)",route="([^"]*)"\} (\S+)$')
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str
+    # (client, fixtures, iteration) -> response
+    call: Callable
+    requests: int
+    concurrency: int
+
+
+@dataclass
+class Result:
+    name: str
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    queries: Optional[float]
+
+
+class Fixtures:
+    def __init__(self):
+        self.headers: Dict[str, dict] = {}
+        self.user_ids: Dict[str, str] = {}
+        self.project_ids: List[str] = []
+        self.emails: Dict[str, str] = {}
+
+
+def _ok(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text}")
+    return response
+
+
+async def seed(client: httpx.AsyncClient) -> Fixtures:
+    """Create the users, projects and memberships the scenarios run against."""
+    fixtures = Fixtures()
+    run = uuid.uuid4().hex[:8]
+    names = ["owner", "empty", *(f"member{n}" for n in range(MEMBERS_PER_PROJECT - 1)),
+             *(f"list{size}" for size in LIST_SIZES)]
+    for name in names:
+        email = f"{name}-{run}@example.com"
+        response = _ok(await client.post("/users/", json={"email": email, "password": PASSWORD}))
+        fixtures.user_ids[name] = response.json()["id"]
+        fixtures.emails[name] = email
+        token = _ok(await client.post("/auth/token", json={"email": email, "password": PASSWORD})).json()
+        fixtures.headers[name] = {"Authorization": f"Bearer {token['access_token']}"}
+
+    owner = fixtures.headers["owner"]
+    for n in range(max(LIST_SIZES)):
+        project = _ok(await client.post(
+            "/projects/", json={"name": f"Bench {n}", "description": "benchmark"}, headers=owner))
+        project_id = project.json()["id"]
+        fixtures.project_ids.append(project_id)
+        members = [f"member{m}" for m in range(MEMBERS_PER_PROJECT - 1)]
+        members += [f"list{size}" for size in LIST_SIZES if n < size]
+        for name in members:
+            _ok(await client.post(f"/projects/{project_id}/members",
+                                        json={"user_id": fixtures.user_ids[name]}, headers=owner))
+    return fixtures
+
+
+def scenarios(scale: float) -> List[Scenario]:
+    def count(n: int) -> int:
+        return max(1, int(n * scale))
+
+    def login(client, fx, i):
+        return client.post("/auth/token", json={"email": fx.emails["owner"], "password": PASSWORD})
+
+    def current_user(client, fx, i):
+        # the cheapest authenticated route: one indexed query besides auth
+        return client.get("/projects/", params={"limit": 1, "include_total": "false", "include_members": "false"},
+                          headers=fx.headers["empty"])
+
+    def list_projects(size):
+        def call(client, fx, i):
+            return client.get("/projects/", params={"limit": 100}, headers=fx.headers[f"list{size}"])
+        return call
+
+    def update_project(client, fx, i):
+        project_id = fx.project_ids[i % len(fx.project_ids)]
+        return client.put(f"/projects/{project_id}", json={"name": f"Bench {i}"}, headers=fx.headers["owner"])
+
+    def change_role(client, fx, i):
+        project_id = fx.project_ids[i % len(fx.project_ids)]
+        role = "admin" if (i // len(fx.project_ids)) % 2 == 0 else "member"
+        return client.patch(f"/projects/{project_id}/members/{fx.user_ids['member0']}/role",
+                            params={"role": role}, headers=fx.headers["owner"])
+
+    def batch_roles(client, fx, i):
+        # every non-owner member of one project in a single request
+        project_id = fx.project_ids[i % len(fx.project_ids)]
+        role = "admin" if (i // len(fx.project_ids)) % 2 == 0 else "member"
+        items = [{"action": "set_role", "user_id": fx.user_ids[f"member{m}"], "role": role}
+                 for m in range(MEMBERS_PER_PROJECT - 1)]
+        return client.post(f"/projects/{project_id}/members/batch", json={"items": items},
+                           headers=fx.headers["owner"])
+
+    def create_task(client, fx, i):
+        project_id = fx.project_ids[i % len(fx.project_ids)]
+        return client.post("/tasks/", json={"title": f"Task {i}", "project_id": project_id},
+                           headers=fx.headers["owner"])
+
+    return [
+        Scenario("auth_token", "POST", "/auth/token", login, count(40), 4),
+        Scenario("current_user", "GET", "/projects/", current_user, count(1000), 8),
+        *(Scenario(f"list_projects_{size}", "GET", "/projects/", list_projects(size), count(300), 8)
+          for size in LIST_SIZES),
+        Scenario("update_project", "PUT", "/projects/{project_id}", update_project, count(300), 8),
+        Scenario("change_member_role", "PATCH", "/projects/{project_id}/members/{user_id}/role",
+                 change_role, count(300), 8),
+        Scenario("batch_member_roles", "POST", "/projects/{project_id}/members/batch", batch_roles, count(300), 8),
+        Scenario("create_task", "POST", "/tasks/", create_task, count(500), 8),
+    ]
+
+
+async def _query_totals(client: httpx.AsyncClient) -> Dict[Tuple[str, str], Dict[str, float]]:
+    totals: Dict[Tuple[str, str], Dict[str, float]] = {}
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return totals
+    for line in response.text.splitlines():
+        match = _QUERY_SAMPLE.match(line)
+        if match:
+            kind, method, route, value = match.groups()
+            totals.setdefault((method, route), {})[kind] = float(value)
+    return totals
+
+
+def _queries_per_request(before, after, key) -> Optional[float]:
+    if key not in after:
+        return None
+    start = before.get(key, {})
+    requests = after[key].get("count", 0) - start.get("count", 0)
+    if not requests:
+        return None
+    return (after[key].get("sum", 0) - start.get("sum", 0)) / requests
+
+
+async def run_scenario(client: httpx.AsyncClient, fixtures: Fixtures, scenario: Scenario, warmup: int) -> Result:
+    for i in range(warmup):
+        await scenario.call(client, fixtures, i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(warmup, warmup + scenario.requests))
+    before = await _query_totals(client)
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await scenario.call(client, fixtures, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+    # scraped around the measured requests only, so warmup calls don't count
+    after = await _query_totals(client)
+    queries = _queries_per_request(before, after, (scenario.method, scenario.route))
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return Result(
+        name=scenario.name,
+        requests=len(latencies),
+        errors=errors,
+        throughput=round(len(latencies) / elapsed, 1),
+        p50_ms=round(quantiles[49] * 1000, 2),
+        p99_ms=round(quantiles[98] * 1000, 2),
+        queries=None if queries is None else round(queries, 2),
+    )
+
+
+def _client(url: Optional[str]) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=60)
+    import app.models  # noqa: F401
+    from app.core.database import Base, engine
+    from app.main import app as application
+
+    Base.metadata.create_all(engine)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url="http://bench", timeout=60)
+
+
+def _environment(url: Optional[str]) -> dict:
+    environment = {"python": platform.python_version(), "target": url or "in-process"}
+    if not url:
+        from app.core.config import settings
+        environment.update(database=settings.DATABASE_URL.partition(":")[0], db_async=settings.DB_ASYNC,
+                           fast_json=settings.FAST_JSON, response_cache=settings.RESPONSE_CACHE_ENABLED)
+    return environment
+
+
+def print_results(results: List[Result], baseline: Optional[Dict[str, dict]] = None) -> None:
+    header = f"{'scenario':<22}{'req':>6}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'queries':>9}"
+    if baseline:
+        header += f"{'p50 vs base':>13}{'req/s vs base':>15}"
+    print(header)
+    for result in results:
+        queries = "-" if result.queries is None else f"{result.queries:g}"
+        line = (f"{result.name:<22}{result.requests:>6}{result.errors:>5}{result.throughput:>9.1f}"
+                f"{result.p50_ms:>9.2f}{result.p99_ms:>9.2f}{queries:>9}")
+        base = (baseline or {}).get(result.name)
+        if base:
+            line += f"{_change(result.p50_ms, base['p50_ms']):>13}{_change(result.throughput, base['throughput']):>15}"
+        print(line)
+
+
+def _change(value: float, base: float) -> str:
+    return f"{(value - base) / base:+.0%}" if base else "-"
+
+
+def regressions(results: List[Result], baseline: Dict[str, dict], limit: float) -> List[str]:
+    failed = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base and base["p50_ms"] and (result.p50_ms - base["p50_ms"]) / base["p50_ms"] > limit:
+            failed.append(result.name)
+        # a whole extra statement per request; fractions come from occasional work like cache refills
+        if base and result.queries is not None and base.get("queries") is not None \
+                and result.queries >= base["queries"] + 1:
+            failed.append(f"{result.name} (queries)")
+    return failed
+
+
+async def main_async(args) -> int:
+    async with _client(args.url) as client:
+        print("seeding fixtures...", file=sys.stderr)
+        fixtures = await seed(client)
+        selected = [s for s in scenarios(args.scale) if not args.only or s.name in args.only]
+        results = []
+        for scenario in selected:
+            print(f"running {scenario.name}...", file=sys.stderr)
+            results.append(await run_scenario(client, fixtures, scenario, args.warmup))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {entry["name"]: entry for entry in json.load(f)["results"]}
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": _environment(args.url), "results": [asdict(r) for r in results]}, f, indent=2)
+            f.write("\n")
+    if baseline is not None and args.max_regression is not None:
+        failed = regressions(results, baseline, args.max_regression)
+        if failed:
+            print(f"regressed against {args.compare}: {', '.join(failed)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="benchmark a running server instead of the app in-process")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario's request count")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="run just these scenarios")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline file")
+    parser.add_argument("--compare", metavar="PATH", help="show changes against a baseline file")
+    parser.add_argument("--max-regression", type=float, metavar="RATIO",
+                        help="with --compare, exit 1 when a p50 grows by more than RATIO or a request gains a query")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
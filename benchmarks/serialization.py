@@ -0,0 +1,97 @@
+"""Compare the ORM + pydantic and row-tuple + orjson paths for list and board pages.
+
+    python -m benchmarks.serialization [--projects 100] [--members 8] [--tasks 200]
+
+Uses a throwaway SQLite database unless DATABASE_URL is set.
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.ranking import ranks_between
+from app.core.responses import render_json
+from app.models.membership import MemberRole, ProjectMember
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.schemas.project import ProjectList
+from app.schemas.task import Board
+from app.services import project_service, task_service
+
+
+def seed(projects: int, members: int, tasks: int):
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        users = [User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com", hashed_password="x")
+                 for _ in range(members)]
+        db.add_all(users)
+        project_ids = []
+        for n in range(projects):
+            project = Project(id=uuid.uuid4(), name=f"Project {n}", description="benchmark", owner_id=users[0].id)
+            db.add(project)
+            project_ids.append(project.id)
+            for i, user in enumerate(users):
+                db.add(ProjectMember(project_id=project.id, user_id=user.id,
+                                     role=MemberRole.owner if i == 0 else MemberRole.member))
+        db.flush()
+        statuses = list(TaskStatus)
+        ranks = ranks_between(None, None, tasks)
+        db.add_all(Task(title=f"Task {n}", project_id=project_ids[0], status=statuses[n % len(statuses)],
+                        rank=ranks[n]) for n in range(tasks))
+        db.commit()
+        return users[0].id, project_ids[0]
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--members", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    user_id, board_project_id = seed(args.projects, args.members, args.tasks)
+
+    def list_orm():
+        with SessionLocal() as db:
+            items, total, next_cursor = project_service.list_projects(db, user_id, limit=args.projects)
+            return ProjectList.model_validate({"items": items, "total": total, "next_cursor": next_cursor},
+                                              from_attributes=True).model_dump_json()
+
+    def list_rows():
+        with SessionLocal() as db:
+            rows, total, next_cursor = project_service.list_projects(db, user_id, limit=args.projects, as_rows=True)
+            items = project_service.project_dicts(db, rows)
+            return render_json({"items": items, "total": total, "next_cursor": next_cursor})
+
+    def board_orm():
+        with SessionLocal() as db:
+            board = task_service.get_board(db, board_project_id, limit=50)
+            return Board.model_validate(board, from_attributes=True).model_dump_json()
+
+    def board_rows():
+        with SessionLocal() as db:
+            return render_json(task_service.get_board(db, board_project_id, limit=50, as_rows=True))
+
+    print(f"{'case':<34}{'orm+pydantic':>14}{'rows+json':>12}{'speedup':>9}")
+    for name, slow, fast in (
+        (f"list {args.projects} projects x {args.members} members", list_orm, list_rows),
+        ("board 4 columns x 50 tasks", board_orm, board_rows),
+    ):
+        slow_time, fast_time = measure(slow, args.repeat), measure(fast, args.repeat)
+        print(f"{name:<34}{slow_time * 1000:>12.2f}ms{fast_time * 1000:>10.2f}ms{slow_time / fast_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Shared fixtures: the app against a throwaway SQLite database.
+
+The settings are read once at import time, so they are pinned here before
+anything from ``app`` is imported. Set TEST_DATABASE_URL to run against
+another (disposable) database; DATABASE_URL is never used, so the suite
+cannot wipe a development database.
+"""
+import itertools
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+os.environ.update(
+    DATABASE_URL=os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.sqlite",
+    SECRET_KEY="test-secret-key",
+    ALGORITHM="HS256",
+    ACCESS_TOKEN_EXPIRE_MINUTES="30",
+    DB_ASYNC="false",
+    DATABASE_REPLICA_URLS="",
+    RESPONSE_CACHE_ENABLED="false",
+    FAST_JSON="false",
+    RATE_LIMIT_ENABLED="false",
+    PURGE_INTERVAL_SECONDS="0",
+    OPS_TOKEN="",
+    LOG_LEVEL="WARNING",
+    # cheap Argon2 parameters keep sign-ups fast
+    ARGON2_TIME_COST="1",
+    ARGON2_MEMORY_COST="1024",
+    ARGON2_PARALLELISM="1",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (registers every table)
+from app.core.cache import principal_cache
+from app.core.database import Base, SessionLocal, engine
+from app.main import app as application
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    principal_cache.clear()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture
+def client():
+    with TestClient(application) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def signup(client):
+    """Register a user through the API; returns ``(user_id, auth headers)``."""
+    numbers = itertools.count()
+
+    def signup(name: str = "user"):
+        email = f"{name}-{next(numbers)}@example.com"
+        response = client.post("/users/", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        token = client.post("/auth/token", json={"email": email, "password": PASSWORD}).json()["access_token"]
+        return uuid.UUID(response.json()["id"]), {"Authorization": f"Bearer {token}"}
+
+    return signup
+
+
+@pytest.fixture
+def new_project(client):
+    """Create a project as ``headers``, adding ``members`` as {user_id: role}."""
+    numbers = itertools.count()
+
+    def new_project(headers, members=None, **fields):
+        fields.setdefault("name", f"Project {next(numbers)}")
+        response = client.post("/projects/", json=fields, headers=headers)
+        assert response.status_code == 200, response.text
+        project_id = response.json()["id"]
+        for user_id, role in (members or {}).items():
+            added = client.post(f"/projects/{project_id}/members",
+                                json={"user_id": str(user_id), "role": role}, headers=headers)
+            assert added.status_code == 201, added.text
+        return uuid.UUID(project_id)
+
+    return new_project
+
+
+@pytest.fixture
+def queries():
+    """Context manager collecting the SQL statements run on the app's engine."""
+
+    @contextmanager
+    def capture():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "after_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "after_cursor_execute", record)
+
+    return capture
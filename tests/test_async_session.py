@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.database import get_async_database_url
+from app.deps import run_db
+from app.services import user_service
+
+
+def test_async_url_swaps_the_driver():
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_database_url("postgresql://u:p@db/kanban") == "postgresql+asyncpg://u:p@db/kanban"
+    assert get_async_database_url("postgresql+psycopg2://db/kanban") == "postgresql+asyncpg://db/kanban"
+
+
+def test_run_db_calls_sync_services_through_an_async_session(signup):
+    user_id, _ = signup()
+
+    async def lookup():
+        engine = create_async_engine(get_async_database_url(settings.DATABASE_URL))
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                return await run_db(db, user_service.get_user, user_id)
+        finally:
+            await engine.dispose()
+
+    user = asyncio.run(lookup())
+    assert user is not None and user.id == user_id
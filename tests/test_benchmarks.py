@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+
+from app.main import app as application
+from benchmarks import api
+
+
+def result(name, p50_ms=10.0, queries=2.0):
+    return api.Result(name=name, requests=10, errors=0, throughput=100.0, p50_ms=p50_ms, p99_ms=p50_ms * 2,
+                      queries=queries)
+
+
+def test_regressions_flag_latency_and_extra_queries():
+    baseline = {"fast": {"p50_ms": 10.0, "queries": 2.0}, "chatty": {"p50_ms": 10.0, "queries": 2.0},
+                "noisy": {"p50_ms": 10.0, "queries": 2.0}}
+    results = [result("fast", p50_ms=12.0), result("chatty", queries=3.0), result("noisy", queries=2.6),
+               result("new", p50_ms=1000.0)]
+    assert api.regressions(results, baseline, limit=0.25) == ["chatty (queries)"]
+    assert api.regressions(results, baseline, limit=0.1) == ["fast", "chatty (queries)"]
+
+
+def test_queries_per_request_uses_the_scrape_difference():
+    key = ("GET", "/projects/")
+    before = {key: {"sum": 10.0, "count": 5.0}}
+    after = {key: {"sum": 40.0, "count": 15.0}}
+    assert api._queries_per_request(before, after, key) == 3.0
+    assert api._queries_per_request(after, after, key) is None
+    assert api._queries_per_request(before, {}, key) is None
+
+
+def test_every_scenario_runs_cleanly():
+    async def run():
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            fixtures = await api.seed(client)
+            return [await api.run_scenario(client, fixtures, scenario, warmup=1)
+                    for scenario in api.scenarios(scale=0.01)]
+
+    results = asyncio.run(run())
+    assert [r.name for r in results] == [s.name for s in api.scenarios(scale=1)]
+    for r in results:
+        assert r.errors == 0, r.name
+        assert r.queries is not None, r.name
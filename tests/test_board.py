@@ -0,0 +1,58 @@
+def add_tasks(client, headers, project_id, count, **fields):
+    items = [{"title": f"Task {index}", "project_id": str(project_id), **fields} for index in range(count)]
+    response = client.post("/tasks/bulk", json={"items": items}, headers=headers)
+    assert response.status_code == 200 and response.json()["failed"] == 0, response.text
+    return [result["id"] for result in response.json()["results"]]
+
+
+def board(client, headers, project_id, **params):
+    response = client.get(f"/projects/{project_id}/board", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return {column["status"]: column for column in response.json()["columns"]}
+
+
+def test_board_returns_every_column_in_one_query(client, signup, new_project, queries):
+    _, headers = signup()
+    project_id = new_project(headers)
+    task_ids = add_tasks(client, headers, project_id, 5)
+    client.patch("/tasks/status/bulk", json={"task_ids": task_ids[:2], "status": "done"}, headers=headers)
+
+    with queries() as statements:
+        columns = board(client, headers, project_id)
+    # the membership check and the board itself
+    assert len(statements) == 2
+    assert list(columns) == ["backlog", "todo", "in_progress", "done"]
+    assert {status: column["count"] for status, column in columns.items()} == \
+        {"backlog": 3, "todo": 0, "in_progress": 0, "done": 2}
+    assert {item["id"] for item in columns["done"]["items"]} == set(task_ids[:2])
+
+
+def test_column_pages_follow_the_cursor(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    task_ids = add_tasks(client, headers, project_id, 5)
+    columns = board(client, headers, project_id, limit=2)
+    seen = [item["id"] for item in columns["backlog"]["items"]]
+    cursor = columns["backlog"]["next_cursor"]
+    while cursor:
+        column = board(client, headers, project_id, limit=2, status="backlog", cursor=cursor)["backlog"]
+        assert column["count"] == 5
+        seen += [item["id"] for item in column["items"]]
+        cursor = column["next_cursor"]
+    assert seen == task_ids  # rank order is insertion order
+
+
+def test_cursor_needs_a_status(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    add_tasks(client, headers, project_id, 3)
+    cursor = board(client, headers, project_id, limit=1)["backlog"]["next_cursor"]
+    response = client.get(f"/projects/{project_id}/board", params={"cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_board_is_for_members_only(client, signup, new_project):
+    _, owner = signup()
+    _, outsider = signup()
+    project_id = new_project(owner)
+    assert client.get(f"/projects/{project_id}/board", headers=outsider).status_code == 403
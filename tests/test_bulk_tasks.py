@@ -0,0 +1,81 @@
+import json
+import uuid
+
+from app.core.config import settings
+
+
+def test_bulk_create_reports_each_item(client, signup, new_project, queries):
+    viewer_id, viewer = signup()
+    _, owner = signup()
+    own = new_project(owner, {viewer_id: "viewer"})
+    items = [{"title": f"Task {index}", "project_id": str(own)} for index in range(20)]
+    items.insert(3, {"title": "Elsewhere", "project_id": str(uuid.uuid4())})
+
+    with queries() as statements:
+        response = client.post("/tasks/bulk", json={"items": items}, headers=owner)
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (20, 1)
+    assert body["results"][3]["outcome"] == "error"
+    assert body["results"][3]["detail"] == "Not allowed to add tasks to this project"
+    assert [result["index"] for result in body["results"]] == list(range(21))
+    assert sum(1 for s in statements if s.startswith("INSERT INTO tasks")) == 1
+
+    # viewers may not add tasks
+    response = client.post("/tasks/bulk", json={"items": items[:1]}, headers=viewer)
+    assert response.json()["failed"] == 1
+
+
+def test_bulk_create_is_chunked(client, signup, new_project, queries, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_CHUNK_SIZE", 4)
+    _, headers = signup()
+    project_id = new_project(headers)
+    items = [{"title": f"Task {index}", "project_id": str(project_id)} for index in range(10)]
+    with queries() as statements:
+        client.post("/tasks/bulk", json={"items": items}, headers=headers)
+    assert sum(1 for s in statements if s.startswith("INSERT INTO tasks")) == 3
+    ranks = [task["rank"] for task in client.get(f"/projects/{project_id}/board", headers=headers)
+             .json()["columns"][0]["items"]]
+    assert len(ranks) == 10 and ranks == sorted(set(ranks))
+
+
+def test_bulk_create_has_a_size_limit(client, signup, new_project, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_BULK_MAX_ITEMS", 2)
+    _, headers = signup()
+    project_id = new_project(headers)
+    items = [{"title": "t", "project_id": str(project_id)}] * 3
+    assert client.post("/tasks/bulk", json={"items": items}, headers=headers).status_code == 413
+
+
+def test_ndjson_import_keeps_line_numbers(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    lines = [json.dumps({"title": "First", "project_id": str(project_id)}),
+             "{not json",
+             "",
+             json.dumps({"title": "Second", "project_id": str(project_id)})]
+    response = client.post("/tasks/bulk/ndjson", content="\n".join(lines).encode(), headers=headers)
+    results = response.json()["results"]
+    assert [(result["index"], result["outcome"]) for result in results] == \
+        [(0, "created"), (1, "error"), (2, "created")]
+
+
+def test_bulk_status_update(client, signup, new_project):
+    _, headers = signup()
+    _, outsider = signup()
+    project_id = new_project(headers)
+    created = client.post("/tasks/bulk", json={"items": [
+        {"title": f"Task {index}", "project_id": str(project_id)} for index in range(3)]}, headers=headers).json()
+    task_ids = [result["id"] for result in created["results"]]
+    missing = str(uuid.uuid4())
+
+    response = client.patch("/tasks/status/bulk", json={"task_ids": task_ids + [missing], "status": "done"},
+                            headers=headers).json()
+    assert (response["succeeded"], response["failed"]) == (3, 1)
+    assert (response["results"][-1]["id"], response["results"][-1]["outcome"]) == (missing, "not_found")
+
+    # other users' tasks look missing
+    response = client.patch("/tasks/status/bulk", json={"task_ids": task_ids, "status": "todo"},
+                            headers=outsider).json()
+    assert response["failed"] == 3
+    done = client.get(f"/projects/{project_id}/board", params={"status": "done"}, headers=headers).json()
+    assert done["columns"][0]["count"] == 3
@@ -0,0 +1,100 @@
+import pytest
+
+
+def revalidate(client, url, headers, etag):
+    return client.get(url, headers={**headers, "If-None-Match": etag})
+
+
+@pytest.mark.parametrize("path", ["", "/board", "/stats"])
+def test_unchanged_project_reads_answer_304(client, signup, new_project, path):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}{path}"
+    first = client.get(url, headers=headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Vary"] == "Authorization"
+    again = revalidate(client, url, headers, etag)
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == etag
+
+
+def test_project_writes_change_the_etag(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    etag = client.get(url, headers=headers).headers["ETag"]
+    client.put(url, json={"name": "Renamed"}, headers=headers)
+    response = revalidate(client, url, headers, etag)
+    assert response.status_code == 200 and response.json()["name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+
+def test_task_writes_change_the_board_etag(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}/board"
+    etag = client.get(url, headers=headers).headers["ETag"]
+    client.post("/tasks/bulk", json={"items": [{"title": "t", "project_id": str(project_id)}]}, headers=headers)
+    assert revalidate(client, url, headers, etag).status_code == 200
+
+
+def test_list_etag_follows_membership(client, signup, new_project):
+    _, owner = signup()
+    member_id, member = signup()
+    etag = client.get("/projects/", headers=member).headers["ETag"]
+    assert revalidate(client, "/projects/", member, etag).status_code == 304
+    new_project(owner, {member_id: "member"})
+    assert revalidate(client, "/projects/", member, etag).status_code == 200
+
+
+def test_revalidating_the_detail_skips_loading_it(client, signup, new_project, queries):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    etag = client.get(url, headers=headers).headers["ETag"]
+    with queries() as statements:
+        assert revalidate(client, url, headers, etag).status_code == 304
+    # the membership check also reads the version; the members are not loaded
+    assert len(statements) == 1
+
+
+def test_weak_comparison_and_lists(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}/board"
+    etag = client.get(url, headers=headers).headers["ETag"]
+    assert revalidate(client, url, headers, f'"other", {etag[2:]}').status_code == 304
+    assert revalidate(client, url, headers, "*").status_code == 304
+    assert revalidate(client, url, headers, '"other"').status_code == 200
+
+
+def test_task_writes_leave_the_project_etags_alone(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    detail = client.get(url, headers=headers)
+    listing = client.get("/projects/", headers=headers)
+    task = client.post("/tasks/", json={"title": "t", "project_id": str(project_id)}, headers=headers).json()
+    assert client.patch(f"/tasks/status/{task['id']}/", params={"status": "done"},
+                        headers=headers).status_code == 200
+    # the 304s stay correct because the project body did not change either
+    assert revalidate(client, url, headers, detail.headers["ETag"]).status_code == 304
+    assert revalidate(client, "/projects/", headers, listing.headers["ETag"]).status_code == 304
+    assert client.get(url, headers=headers).json() == detail.json()
+    assert client.get("/projects/", headers=headers).json() == listing.json()
+
+
+def test_a_stale_list_etag_fetches_the_page_once(client, signup, new_project, queries):
+    _, headers = signup()
+    new_project(headers)
+    stale = client.get("/projects/", headers=headers).headers["ETag"]
+    new_project(headers)
+    with queries() as plain:
+        expected = client.get("/projects/", headers=headers)
+    with queries() as revalidated:
+        response = revalidate(client, "/projects/", headers, stale)
+    assert response.status_code == 200 and response.json() == expected.json()
+    assert response.headers["ETag"] == expected.headers["ETag"]
+    # count, page and members, as without If-None-Match
+    assert len(revalidated) == len(plain) == 3
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from app.core.events import Hub, LocalBroker, hub
+
+
+def run_hub(scenario):
+    async def main():
+        local = Hub()
+        await local.start(LocalBroker())
+        try:
+            return await scenario(local)
+        finally:
+            await local.stop()
+
+    return asyncio.run(main())
+
+
+def test_events_reach_every_subscriber_of_the_project():
+    project_id = uuid.uuid4()
+
+    async def scenario(local):
+        first, second = local.subscribe(project_id), local.subscribe(project_id)
+        other = local.subscribe(uuid.uuid4())
+        local.publish(project_id, "task.created", {"id": uuid.uuid4()})
+        assert [e.type for e in await first.next_batch(1)] == ["task.created"]
+        assert [e.type for e in await second.next_batch(1)] == ["task.created"]
+        assert await other.next_batch(0.01) == []
+
+    run_hub(scenario)
+
+
+def test_slow_subscribers_are_dropped(monkeypatch):
+    monkeypatch.setattr("app.core.events.settings.EVENTS_SUBSCRIBER_BUFFER", 2)
+    project_id = uuid.uuid4()
+
+    async def scenario(local):
+        subscription = local.subscribe(project_id)
+        for _ in range(3):
+            local.publish(project_id, "task.created", {})
+        assert subscription.lagged
+        assert len(await subscription.next_batch(1)) == 2
+        assert local.stats()["subscribers"] == 0
+
+    run_hub(scenario)
+
+
+def test_member_removal_revokes_only_that_member():
+    project_id, removed, kept = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    async def scenario(local):
+        gone, stays = local.subscribe(project_id, removed), local.subscribe(project_id, kept)
+        local.publish(project_id, "member.removed", {"project_id": project_id, "user_id": removed})
+        # the removed member still learns why the stream ends
+        assert [e.type for e in await gone.next_batch(1)] == ["member.removed"]
+        assert gone.revoked and not stays.revoked
+        local.publish(project_id, "task.created", {})
+        assert await gone.next_batch(0.01) == []
+        assert [e.type for e in await stays.next_batch(1)] == ["member.removed", "task.created"]
+
+    run_hub(scenario)
+
+
+def test_project_deletion_revokes_everyone():
+    project_id = uuid.uuid4()
+
+    async def scenario(local):
+        subscriptions = [local.subscribe(project_id, uuid.uuid4()) for _ in range(3)]
+        local.publish(project_id, "project.deleted", {"id": project_id})
+        assert all(subscription.revoked for subscription in subscriptions)
+        assert local.stats()["subscribers"] == 0
+
+    run_hub(scenario)
+
+
+def wait_for_subscribers(count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while hub.stats()["subscribers"] < count:
+        assert time.monotonic() < deadline, "stream never subscribed"
+        time.sleep(0.01)
+
+
+def test_stream_ends_when_the_member_is_removed(client, signup, new_project):
+    _, owner = signup()
+    member_id, member = signup()
+    project_id = new_project(owner, {member_id: "member"})
+
+    def remove_member():
+        wait_for_subscribers(1)
+        client.delete(f"/projects/{project_id}/members/{member_id}", headers=owner)
+
+    remover = threading.Thread(target=remove_member)
+    remover.start()
+    response = client.get(f"/projects/{project_id}/events", headers=member)
+    remover.join()
+    assert response.status_code == 200
+    assert "event: member.removed" in response.text
+    assert response.text.endswith("event: revoked\ndata: {}\n\n")
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_stream_is_for_members_only(client, signup, new_project):
+    _, owner = signup()
+    _, outsider = signup()
+    project_id = new_project(owner)
+    assert client.get(f"/projects/{project_id}/events", headers=outsider).status_code == 403
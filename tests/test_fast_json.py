@@ -0,0 +1,50 @@
+import enum
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core import responses
+from app.core.config import settings
+
+
+class Color(enum.Enum):
+    red = "red"
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def renderer(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson is not installed")
+    return responses.render_json
+
+
+def test_both_encoders_agree_with_pydantic(renderer):
+    value = {"id": uuid.UUID(int=1), "at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+             "color": Color.red, "name": "Zoë"}
+    assert json.loads(renderer(value)) == {"id": "00000000-0000-0000-0000-000000000001",
+                                           "at": "2026-01-02T03:04:05Z", "color": "red", "name": "Zoë"}
+
+
+def test_unknown_types_are_refused(renderer):
+    with pytest.raises(TypeError):
+        renderer({"value": object()})
+
+
+@pytest.mark.parametrize("path", ["/projects/", "/projects/{id}/board"])
+def test_fast_path_returns_the_same_body(client, signup, new_project, monkeypatch, path):
+    member_id, _ = signup()
+    _, headers = signup()
+    project_id = new_project(headers, {member_id: "viewer"}, description="Quarterly goals")
+    client.post("/tasks/bulk", json={"items": [{"title": f"Task {index}", "project_id": str(project_id)}
+                                               for index in range(3)]}, headers=headers)
+    url = path.format(id=project_id)
+    slow = client.get(url, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    fast = client.get(url, headers=headers)
+    assert fast.status_code == slow.status_code == 200
+    assert fast.json() == slow.json()
+    assert fast.headers["ETag"] == slow.headers["ETag"]
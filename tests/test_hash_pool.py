@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app import security
+from app.models.user import User
+from tests.conftest import PASSWORD
+
+
+def test_full_pool_sheds_with_503(monkeypatch):
+    monkeypatch.setattr(security, "_HASH_CAPACITY", 1)
+    release = threading.Event()
+    before = security.hash_pool_stats()["rejected"]
+
+    async def scenario():
+        running = asyncio.ensure_future(security._run_in_hash_pool(release.wait))
+        await asyncio.sleep(0)
+        assert security.hash_pool_stats()["in_flight"] == 1
+        with pytest.raises(HTTPException) as exc:
+            await security._run_in_hash_pool(lambda: None)
+        assert exc.value.status_code == 503
+        assert exc.value.headers == {"Retry-After": "1"}
+        release.set()
+        await running
+
+    asyncio.run(scenario())
+    stats = security.hash_pool_stats()
+    assert stats["rejected"] == before + 1
+    assert stats["in_flight"] == 0
+
+
+def test_outdated_hashes_are_upgraded_on_verify():
+    argon2 = security.pwd_context.handler("argon2")
+    outdated = argon2.using(time_cost=security.settings.ARGON2_TIME_COST + 1).hash("secret")
+    verified, new_hash = asyncio.run(security.verify_and_update_async("secret", outdated))
+    assert verified and new_hash is not None
+    assert asyncio.run(security.verify_and_update_async("secret", new_hash)) == (True, None)
+
+
+def test_login_upgrades_an_outdated_hash(client, signup, db):
+    user_id, _ = signup("rehash")
+    argon2 = security.pwd_context.handler("argon2")
+    user = db.get(User, user_id)
+    user.hashed_password = argon2.using(time_cost=security.settings.ARGON2_TIME_COST + 1).hash(PASSWORD)
+    db.commit()
+    outdated = user.hashed_password
+
+    login = {"email": user.email, "password": PASSWORD}
+    assert client.post("/auth/token", json=login).status_code == 200
+    db.expire_all()
+    upgraded = db.get(User, user_id).hashed_password
+    assert upgraded != outdated and not security.pwd_context.needs_update(upgraded)
+    assert client.post("/auth/token", json={**login, "password": "wrong"}).status_code == 400
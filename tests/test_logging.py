@@ -0,0 +1,58 @@
+import json
+import logging
+import queue
+
+from app.core import log
+
+
+def make_record(level=logging.INFO, message="hello", request_id=None, **extra):
+    record = logging.makeLogRecord({"name": "app.test", "levelno": level, "levelname": logging.getLevelName(level),
+                                    "msg": message, **extra})
+    record.request_id = request_id
+    return record
+
+
+def test_request_id_is_echoed_or_minted(client):
+    assert client.get("/", headers={"X-Request-ID": "trace-123"}).headers["X-Request-ID"] == "trace-123"
+    minted = client.get("/").headers["X-Request-ID"]
+    assert len(minted) == 32
+    # anything that could forge log lines is replaced
+    assert client.get("/", headers={"X-Request-ID": "bad id\nforged"}).headers["X-Request-ID"] != "bad id\nforged"
+
+
+def test_json_lines_carry_the_request_id_and_extras():
+    line = log.JsonFormatter().format(make_record(request_id="abc", user_id="u1", status=201))
+    entry = json.loads(line)
+    assert entry["message"] == "hello" and entry["level"] == "INFO" and entry["logger"] == "app.test"
+    assert (entry["request_id"], entry["user_id"], entry["status"]) == ("abc", "u1", 201)
+
+
+def test_request_context_filter_stamps_the_current_request():
+    token = log.request_id_var.set("req-1")
+    try:
+        record = logging.makeLogRecord({})
+        assert log.RequestContextFilter().filter(record) and record.request_id == "req-1"
+    finally:
+        log.request_id_var.reset(token)
+
+
+def test_debug_sampling_keeps_or_drops_whole_requests():
+    sampler = log.DebugSamplingFilter(0.5)
+    assert sampler.filter(make_record(logging.INFO, request_id="x"))
+    decisions = {}
+    for index in range(200):
+        request_id = f"request-{index}"
+        kept = {sampler.filter(make_record(logging.DEBUG, request_id=request_id)) for _ in range(5)}
+        assert len(kept) == 1
+        decisions[request_id] = kept.pop()
+    assert 0 < sum(decisions.values()) < 200
+    assert not log.DebugSamplingFilter(0.0).filter(make_record(logging.DEBUG, request_id="any"))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = log._DroppingQueueHandler(queue.Queue(maxsize=1))
+    before = log.records_dropped.labels().value
+    handler.enqueue(make_record())
+    handler.enqueue(make_record())
+    assert handler.queue.qsize() == 1
+    assert log.records_dropped.labels().value == before + 1
@@ -0,0 +1,66 @@
+from app.core import events
+from app.core.config import settings
+
+
+def batch(client, project_id, headers, *items):
+    response = client.post(f"/projects/{project_id}/members/batch", json={"items": list(items)}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_batch_reports_each_item_and_publishes_per_member(client, signup, new_project, monkeypatch):
+    owner_id, owner = signup()
+    stays, leaves, joins = (signup()[0] for _ in range(3))
+    project_id = new_project(owner, {stays: "viewer", leaves: "member"})
+    sent = []
+    monkeypatch.setattr(events, "publish", lambda project_id, type, data: sent.append((type, data)))
+
+    body = batch(client, project_id, owner,
+                 {"action": "add", "user_id": str(joins)},
+                 {"action": "set_role", "user_id": str(stays), "role": "admin"},
+                 {"action": "remove", "user_id": str(leaves)},
+                 {"action": "remove", "user_id": str(owner_id)},
+                 {"action": "add", "user_id": str(stays)},
+                 {"action": "set_role", "user_id": str(leaves), "role": "viewer"})
+    assert [result["outcome"] for result in body["results"]] == [
+        "added", "updated", "removed", "error", "error", "not_found"]
+    assert (body["succeeded"], body["failed"]) == (3, 3)
+
+    assert sorted((type, data["user_id"], data.get("role")) for type, data in sent) == sorted([
+        ("member.added", joins, "member"),
+        ("member.role_changed", stays, "admin"),
+        ("member.removed", leaves, None),
+    ])
+    assert all(data["project_id"] == project_id for _, data in sent)
+
+    members = {member["user_id"]: member["role"]
+               for member in client.get(f"/projects/{project_id}", headers=owner).json()["members"]}
+    assert members == {str(owner_id): "owner", str(stays): "admin", str(joins): "member"}
+
+
+def test_net_changes_only(client, signup, new_project, monkeypatch):
+    _, owner = signup()
+    user_id, _ = signup()
+    project_id = new_project(owner)
+    sent = []
+    monkeypatch.setattr(events, "publish", lambda project_id, type, data: sent.append(type))
+
+    # added then removed again within the batch: nothing to write or announce
+    body = batch(client, project_id, owner,
+                 {"action": "add", "user_id": str(user_id)},
+                 {"action": "remove", "user_id": str(user_id)})
+    assert [result["outcome"] for result in body["results"]] == ["added", "removed"]
+    assert sent == []
+
+
+def test_batch_limits(client, signup, new_project, monkeypatch):
+    _, owner = signup()
+    member_id, member = signup()
+    project_id = new_project(owner, {member_id: "member"})
+    item = {"action": "remove", "user_id": str(member_id)}
+    assert client.post(f"/projects/{project_id}/members/batch", json={"items": [item]},
+                       headers=member).status_code == 403
+
+    monkeypatch.setattr(settings, "MEMBER_BATCH_MAX_ITEMS", 1)
+    assert client.post(f"/projects/{project_id}/members/batch", json={"items": [item, item]},
+                       headers=owner).status_code == 413
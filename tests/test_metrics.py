@@ -0,0 +1,64 @@
+import re
+
+
+def sample(text, name, **labels):
+    """Value of one sample in the exposition text, or None."""
+    for line in text.splitlines():
+        match = re.fullmatch(rf"{name}\{{(.*)\}} (\S+)", line)
+        if match and dict(re.findall(r'(\w+)="([^"]*)"', match.group(1))) == labels:
+            return float(match.group(2))
+    return None
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return response.text
+
+
+def test_requests_are_counted_by_route_template(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    route = dict(method="GET", route="/projects/{project_id}")
+    before = sample(scrape(client), "http_requests_total", status="200", **route) or 0
+    client.get(f"/projects/{project_id}", headers=headers)
+    client.get(f"/projects/{project_id}", headers=headers)
+    text = scrape(client)
+    assert sample(text, "http_requests_total", status="200", **route) == before + 2
+    # the path itself never becomes a label
+    assert str(project_id) not in text
+    assert sample(text, "http_request_duration_seconds_count", **route) >= 2
+
+
+def test_database_work_is_attributed_to_the_request(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    route = dict(method="GET", route="/projects/{project_id}/board")
+    before = scrape(client)
+    client.get(f"/projects/{project_id}/board", headers=headers)
+    after = scrape(client)
+    count = sample(after, "http_request_db_queries_count", **route)
+    total = sample(after, "http_request_db_queries_sum", **route)
+    assert count == (sample(before, "http_request_db_queries_count", **route) or 0) + 1
+    # the membership check and the board
+    assert total - (sample(before, "http_request_db_queries_sum", **route) or 0) == 2
+
+
+def test_unknown_paths_share_one_label(client):
+    client.get("/no/such/path")
+    assert sample(scrape(client), "http_requests_total", method="GET", route="unmatched", status="404") >= 1
+
+
+def test_component_gauges_are_exported(client):
+    text = scrape(client)
+    for name in ("password_hash_in_flight", "events_subscribers", "http_requests_in_flight"):
+        assert re.search(rf"^{name} \S+$", text, re.M), name
+    assert sample(text, "cache_hits_total", cache="principal") is not None
+
+
+def test_running_totals_are_counters(client):
+    text = scrape(client)
+    for name in ("cache_hits_total", "cache_misses_total", "password_hash_rejected_total"):
+        assert f"# TYPE {name} counter" in text, name
+    assert re.search(r"^password_hash_rejected_total \d+$", text, re.M)
@@ -0,0 +1,55 @@
+from sqlalchemy import create_engine, text
+
+from app.core import pool
+from app.core.config import settings
+from app.core.database import engine_options
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_stats
+
+
+def test_engine_options_follow_the_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 2500)
+    options = engine_options("postgresql://db/kanban")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (7, 3)
+    assert options["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+    options = engine_options("postgresql+asyncpg://db/kanban", use_async=True)
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+
+
+def test_sqlite_keeps_the_default_pool():
+    assert "poolclass" not in engine_options("sqlite:///./app.db")
+
+
+def test_checkouts_are_counted_and_timed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.sqlite", poolclass=InstrumentedQueuePool,
+                           pool_size=2, max_overflow=0)
+    before = pool.checkout_wait.snapshot()["count"]
+    pool.begin_request()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = pool_stats(engine)
+            assert (stats["size"], stats["checked_out"]) == (2, 1)
+        assert pool_stats(engine)["checked_out"] == 0
+        assert pool.checkout_wait.snapshot()["count"] == before + 1
+        assert pool.request_wait() > 0.0
+    finally:
+        engine.dispose()
+
+
+def test_checkout_wait_is_kept_per_engine(tmp_path):
+    first, second = (create_engine(f"sqlite:///{tmp_path}/{name}.sqlite", poolclass=InstrumentedQueuePool)
+                     for name in ("first", "second"))
+    try:
+        for _ in range(3):
+            with first.connect():
+                pass
+        assert pool_stats(first)["checkout_wait_seconds"]["count"] == 3
+        assert pool_stats(second)["checkout_wait_seconds"]["count"] == 0
+    finally:
+        first.dispose()
+        second.dispose()
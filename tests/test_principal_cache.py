@@ -0,0 +1,43 @@
+from app.core.config import settings
+from app.services import user_service
+
+
+def user_lookups(statements):
+    return [s for s in statements if "FROM users" in s]
+
+
+def test_repeated_requests_reuse_the_cached_principal(client, signup, queries):
+    _, headers = signup()
+    assert client.get("/projects/", headers=headers).status_code == 200
+    with queries() as statements:
+        assert client.get("/projects/", headers=headers).status_code == 200
+    assert user_lookups(statements) == []
+
+
+def test_password_change_invalidates_the_principal(client, signup, db, queries):
+    user_id, headers = signup()
+    client.get("/projects/", headers=headers)
+    user_service.update_password(db, user_service.get_user(db, user_id), "another password")
+    with queries() as statements:
+        client.get("/projects/", headers=headers)
+    assert len(user_lookups(statements)) == 1
+
+
+def test_deleted_user_is_rejected_at_once(client, signup, db):
+    user_id, headers = signup()
+    client.get("/projects/", headers=headers)
+    user_service.delete_user(db, user_id)
+    assert client.get("/projects/", headers=headers).status_code == 401
+
+
+def test_ops_stats_is_off_without_a_token(client):
+    assert client.get("/ops/stats").status_code == 404
+
+
+def test_ops_stats_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "OPS_TOKEN", "ops-secret")
+    assert client.get("/ops/stats").status_code == 401
+    assert client.get("/ops/stats", headers={"X-Ops-Token": "wrong"}).status_code == 401
+    response = client.get("/ops/stats", headers={"X-Ops-Token": "ops-secret"})
+    assert response.status_code == 200
+    assert "principal_cache" in response.json()
@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import project_service
+
+
+def access_lookups(statements):
+    return [s for s in statements if "FROM projects LEFT OUTER JOIN project_members" in s]
+
+
+def test_role_check_and_service_share_one_lookup(client, signup, new_project, queries):
+    _, owner = signup()
+    admin_id, admin = signup()
+    project_id = new_project(owner, {admin_id: "admin"})
+    with queries() as statements:
+        response = client.put(f"/projects/{project_id}", json={"name": "Renamed"}, headers=admin)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Renamed"
+    assert len(access_lookups(statements)) == 1
+
+
+@pytest.mark.parametrize("role, status", [("viewer", 403), ("member", 403), ("admin", 200)])
+def test_update_needs_a_manager(client, signup, new_project, role, status):
+    _, owner = signup()
+    user_id, headers = signup()
+    project_id = new_project(owner, {user_id: role})
+    assert client.put(f"/projects/{project_id}", json={"name": "x"}, headers=headers).status_code == status
+
+
+def test_outsiders_and_unknown_projects(client, signup, new_project):
+    _, owner = signup()
+    _, outsider = signup()
+    project_id = new_project(owner)
+    assert client.post(f"/projects/{project_id}/archive", headers=outsider).status_code == 403
+    assert client.post(f"/projects/{uuid.uuid4()}/archive", headers=owner).status_code == 404
+
+
+def test_deleted_projects_are_hidden_unless_asked_for(client, signup, new_project, db):
+    owner_id, owner = signup()
+    project_id = new_project(owner)
+    assert client.delete(f"/projects/{project_id}", headers=owner).status_code == 204
+    with pytest.raises(HTTPException) as exc:
+        project_service.get_project_access(db, project_id, owner_id)
+    assert exc.value.status_code == 404
+    access = project_service.get_project_access(db, project_id, owner_id, include_deleted=True)
+    assert access.project.is_deleted and access.member.user_id == owner_id
@@ -0,0 +1,55 @@
+import warnings
+
+import pytest
+from sqlalchemy.exc import SADeprecationWarning
+
+from app.core.config import settings
+
+
+def list_query_count(client, headers, queries, **params):
+    with queries() as statements:
+        response = client.get("/projects/", params={"limit": 100, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()["items"]
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+@pytest.mark.parametrize("include_members", [True, False])
+def test_listing_cost_does_not_grow_with_the_page(client, signup, new_project, queries, monkeypatch,
+                                                  include_members, fast_json):
+    monkeypatch.setattr(settings, "FAST_JSON", fast_json)
+    _, headers = signup()
+    member_ids = [signup()[0] for _ in range(2)]
+    members = {user_id: "member" for user_id in member_ids}
+    new_project(headers, members)
+    client.get("/projects/", headers=headers)  # warm the principal cache
+    one, items = list_query_count(client, headers, queries, include_members=include_members)
+    assert len(items) == 1
+
+    for _ in range(24):
+        new_project(headers, members)
+    many, items = list_query_count(client, headers, queries, include_members=include_members)
+    assert len(items) == 25
+    # count, page, and one batched members query
+    assert many == one <= (3 if include_members else 2)
+    if include_members:
+        assert all(len(item["members"]) == 3 for item in items)
+    else:
+        assert all(item["members"] == [] for item in items)
+
+
+def test_members_can_be_left_out_of_the_detail(client, signup, new_project, queries):
+    _, headers = signup()
+    member_id, _ = signup()
+    project_id = new_project(headers, {member_id: "member"})
+    url = f"/projects/{project_id}"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SADeprecationWarning)
+        with queries() as statements:
+            response = client.get(url, params={"include_members": False}, headers=headers)
+        assert response.json()["members"] == []
+        # the membership check and the project; no members query
+        assert len(statements) == 2
+        deleted = client.get(url, params={"include_members": False, "include_deleted": True}, headers=headers)
+        assert deleted.json()["members"] == []
+    assert len(client.get(url, headers=headers).json()["members"]) == 2
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.models.project import Project
+
+
+def walk(client, headers, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, limit=3, **({"cursor": cursor} if cursor else {}))
+        page = client.get("/projects/", params=query, headers=headers).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_pages_cover_every_project_once(client, signup, new_project):
+    _, headers = signup()
+    created = {str(new_project(headers)) for _ in range(7)}
+    ids = walk(client, headers)
+    assert len(ids) == 7 and set(ids) == created
+    # same order as one offset-paginated page
+    everything = client.get("/projects/", params={"limit": 100}, headers=headers).json()
+    assert ids == [item["id"] for item in everything["items"]]
+
+
+def test_cursor_survives_inserts_ahead_of_it(client, signup, new_project, db):
+    _, headers = signup()
+    for _ in range(4):
+        new_project(headers)
+    # created_at has one-second resolution on SQLite; keep the new project strictly newer
+    db.execute(update(Project).values(created_at=datetime(2020, 1, 1)))
+    db.commit()
+    first = client.get("/projects/", params={"limit": 2}, headers=headers).json()
+    new_project(headers)
+    rest = client.get("/projects/", params={"limit": 10, "cursor": first["next_cursor"]},
+                      headers=headers).json()
+    seen = [item["id"] for item in first["items"] + rest["items"]]
+    assert len(seen) == len(set(seen)) == 4
+
+
+def test_search_pages_by_offset_cursor(client, signup, new_project):
+    _, headers = signup()
+    for index in range(5):
+        new_project(headers, name=f"Roadmap {index}")
+    new_project(headers, name="Unrelated")
+    ids = walk(client, headers, search="roadmap")
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_total_is_optional(client, signup, new_project):
+    _, headers = signup()
+    new_project(headers)
+    assert client.get("/projects/", headers=headers).json()["total"] == 1
+    assert client.get("/projects/", params={"include_total": False}, headers=headers).json()["total"] is None
+
+
+def test_malformed_cursor_is_rejected(client, signup):
+    _, headers = signup()
+    assert client.get("/projects/", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.database import engine
+
+
+def search(client, headers, term, **params):
+    response = client.get("/projects/", params={"search": term, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [item["name"] for item in response.json()["items"]]
+
+
+@pytest.mark.skipif(engine.dialect.name == "postgresql", reason="ts_rank orders these differently")
+def test_best_matches_come_first(client, signup, new_project):
+    _, headers = signup()
+    new_project(headers, name="Old platform", description="moving off the roadmap tool")
+    new_project(headers, name="Product roadmap 2027")
+    new_project(headers, name="Roadmap")
+    new_project(headers, name="Hiring")
+    assert search(client, headers, "roadmap") == ["Roadmap", "Product roadmap 2027", "Old platform"]
+
+
+def test_every_word_is_matched(client, signup, new_project):
+    _, headers = signup()
+    new_project(headers, name="Mobile release")
+    new_project(headers, name="Web release")
+    new_project(headers, name="Mobile onboarding")
+    new_project(headers, name="Onboarding", description="for the next mobile release")
+    assert search(client, headers, "mobile release") == ["Mobile release", "Onboarding"]
+    assert search(client, headers, "release mobile") == ["Mobile release", "Onboarding"]
+
+
+def test_like_wildcards_are_literal(client, signup, new_project):
+    _, headers = signup()
+    new_project(headers, name="100% uptime")
+    new_project(headers, name="1000 users")
+    assert search(client, headers, "100%") == ["100% uptime"]
+    assert search(client, headers, "_") == []
+
+
+def test_search_only_sees_own_projects(client, signup, new_project):
+    _, owner = signup()
+    _, other = signup()
+    new_project(owner, name="Secret roadmap")
+    assert search(client, other, "roadmap") == []
+    assert client.get("/projects/", params={"search": "roadmap"}, headers=other).json()["total"] == 0
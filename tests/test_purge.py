@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.models.archive import ArchivedProject, ArchivedProjectMember, ArchivedTask
+from app.models.membership import ProjectMember
+from app.models.project import Project
+from app.models.task import ProjectStatusCount, Task, TaskStatusTransition
+from app.workers import purge
+
+
+def count(db, model, **filters):
+    return db.scalar(select(func.count()).select_from(model).filter_by(**filters))
+
+
+@pytest.fixture
+def deleted_project(client, signup, new_project, db):
+    """A deleted project with members and tasks; call with how many days ago it was deleted."""
+    def deleted_project(days_ago, tasks=5):
+        _, owner = signup()
+        member_id, _ = signup()
+        project_id = new_project(owner, {member_id: "member"})
+        client.post("/tasks/bulk", json={"items": [{"title": f"Task {index}", "project_id": str(project_id)}
+                                                   for index in range(tasks)]}, headers=owner)
+        assert client.delete(f"/projects/{project_id}", headers=owner).status_code == 204
+        db.execute(update(Project).where(Project.id == project_id)
+                   .values(deleted_at=datetime.utcnow() - timedelta(days=days_ago)))
+        db.commit()
+        return project_id, owner
+
+    return deleted_project
+
+
+def test_expired_projects_move_to_the_archive(client, db, deleted_project):
+    expired, owner = deleted_project(days_ago=settings.PURGE_RETENTION_DAYS + 1)
+    recent, _ = deleted_project(days_ago=1)
+    assert purge.purge_expired() == 1
+
+    assert db.get(Project, expired) is None
+    assert count(db, Task, project_id=expired) == count(db, ProjectMember, project_id=expired) == 0
+    assert count(db, TaskStatusTransition, project_id=expired) == 0
+    assert count(db, ProjectStatusCount, project_id=expired) == 0
+    assert count(db, ArchivedTask, project_id=expired) == 5
+    assert count(db, ArchivedProjectMember, project_id=expired) == 2
+    assert db.get(ArchivedProject, expired).is_deleted
+
+    # the one still inside its window is untouched
+    assert db.get(Project, recent) is not None and count(db, Task, project_id=recent) == 5
+
+    # the owner can still look it up; nobody can bring it back
+    response = client.get(f"/projects/{expired}", params={"include_deleted": True}, headers=owner)
+    assert response.status_code == 200 and len(response.json()["members"]) == 2
+    assert client.post(f"/projects/{expired}/restore", headers=owner).status_code == 404
+
+
+def test_batches_are_bounded(db, deleted_project, queries):
+    project_id, _ = deleted_project(days_ago=settings.PURGE_RETENTION_DAYS + 1, tasks=5)
+    with queries() as statements:
+        assert purge.purge_project(db, project_id, purge.retention_cutoff(), archive=True, batch_size=2)
+    # three task batches and the final project transaction
+    assert sum(1 for s in statements if s.startswith("INSERT INTO archived_tasks")) == 3
+    assert sum(1 for s in statements if s.startswith("DELETE FROM tasks")) == 3
+    assert count(db, ArchivedTask, project_id=project_id) == 5
+
+
+def test_archive_can_be_turned_off(db, deleted_project):
+    project_id, _ = deleted_project(days_ago=settings.PURGE_RETENTION_DAYS + 1)
+    assert purge.purge_project(db, project_id, purge.retention_cutoff(), archive=False)
+    assert db.get(Project, project_id) is None
+    assert db.get(ArchivedProject, project_id) is None
+    assert count(db, ArchivedTask, project_id=project_id) == 0
+
+
+def test_restored_or_missing_projects_are_skipped(db):
+    assert purge.purge_project(db, uuid.uuid4(), purge.retention_cutoff()) is False
+
+
+def test_restore_is_refused_past_the_window(client, deleted_project):
+    project_id, owner = deleted_project(days_ago=settings.PURGE_RETENTION_DAYS + 1)
+    assert client.post(f"/projects/{project_id}/restore", headers=owner).status_code == 410
+    recent, owner = deleted_project(days_ago=1)
+    response = client.post(f"/projects/{recent}/restore", headers=owner)
+    assert response.status_code == 200 and response.json()["is_deleted"] is False
+
+
+def test_worker_runs_on_an_interval(deleted_project, db):
+    project_id, _ = deleted_project(days_ago=settings.PURGE_RETENTION_DAYS + 1)
+
+    async def run():
+        worker = purge.PurgeWorker(interval=0.01)
+        await worker.start()
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if purge.projects_purged.labels().value > purged:
+                break
+        await worker.stop()
+        assert worker._task is None
+
+    purged = purge.projects_purged.labels().value
+    asyncio.run(run())
+    assert purge.projects_purged.labels().value > purged
+    assert db.get(ArchivedProject, project_id) is not None
+
+
+def test_worker_is_off_without_an_interval():
+    async def run():
+        worker = purge.PurgeWorker(interval=0)
+        await worker.start()
+        assert worker._task is None
+        await worker.stop()
+
+    asyncio.run(run())
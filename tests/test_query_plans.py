@@ -0,0 +1,67 @@
+"""The hot queries must be served from the indexes the migrations create."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.models.task import TaskStatus
+from app.services import project_service, task_service
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite's")
+
+
+def query_plans(fn, *args, **kwargs):
+    """Run ``fn`` and return the plan of every SELECT it issued, as text."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    event.listen(engine, "after_cursor_execute", record)
+    try:
+        fn(*args, **kwargs)
+    except HTTPException:
+        pass
+    finally:
+        event.remove(engine, "after_cursor_execute", record)
+    assert executed
+    with engine.connect() as conn:
+        return ["\n".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+                for statement, parameters in executed]
+
+
+def assert_no_scan(plan, table):
+    assert f"SCAN {table}\n" not in plan + "\n", plan
+
+
+def test_membership_lookup_uses_the_project_user_index(db):
+    plan, = query_plans(project_service.get_project_access, db, uuid.uuid4(), uuid.uuid4())
+    assert "SEARCH project_members USING INDEX sqlite_autoindex_project_members" in plan
+    assert "(project_id=? AND user_id=?)" in plan
+    assert_no_scan(plan, "projects")
+
+
+def test_project_listing_starts_from_the_members_index(db):
+    for plan in query_plans(project_service.list_projects, db, uuid.uuid4()):
+        assert "SEARCH project_members USING COVERING INDEX ix_project_members_user_id (user_id=?)" in plan
+        assert "SEARCH projects USING INDEX" in plan
+        assert_no_scan(plan, "projects")
+
+
+def test_deleted_projects_scan_uses_the_partial_index(db):
+    from app.workers.purge import expired_project_ids, retention_cutoff
+
+    plan, = query_plans(expired_project_ids, db, retention_cutoff(), 100)
+    assert "ix_projects_deleted_at" in plan
+
+
+def test_column_reads_use_the_project_status_index(db):
+    plan, = query_plans(task_service._last_rank, db, uuid.uuid4(), TaskStatus.todo)
+    assert "USING COVERING INDEX ix_tasks_project_status_rank (project_id=? AND status=?)" in plan
+
+    plan, = query_plans(task_service.get_board, db, uuid.uuid4(), status=TaskStatus.todo)
+    assert "ix_tasks_project_status_rank (project_id=? AND status=?)" in plan
+    assert_no_scan(plan, "tasks")
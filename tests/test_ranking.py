@@ -0,0 +1,97 @@
+"""Property checks for the fractional ranking keys, over seeded random inputs."""
+import random
+
+import pytest
+
+from app.core.ranking import _SMALLEST_INTEGER, _validate, rank_between, ranks_between
+
+SEEDS = range(20)
+
+
+def assert_between(key, a, b):
+    assert (a is None or a < key) and (b is None or key < b), (a, key, b)
+    _validate(key)  # usable as a bound in turn
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_random_inserts_keep_the_order(seed):
+    rng = random.Random(seed)
+    keys = []
+    for _ in range(300):
+        position = rng.randint(0, len(keys))
+        a = keys[position - 1] if position else None
+        b = keys[position] if position < len(keys) else None
+        key = rank_between(a, b)
+        assert_between(key, a, b)
+        keys.insert(position, key)
+    assert keys == sorted(set(keys))
+
+
+def test_repeated_inserts_at_the_head():
+    keys = [rank_between(None, None)]
+    for _ in range(500):
+        key = rank_between(None, keys[0])
+        assert_between(key, None, keys[0])
+        keys.insert(0, key)
+    assert keys == sorted(set(keys))
+
+
+def test_repeated_inserts_between_adjacent_keys():
+    a, b = "a0", "a1"
+    for _ in range(200):
+        key = rank_between(a, b)
+        assert_between(key, a, b)
+        # alternate sides so both bounds keep getting closer
+        a, b = (key, b) if len(key) % 2 else (a, key)
+
+
+def test_bottom_of_the_alphabet():
+    b = _SMALLEST_INTEGER + "1"
+    for _ in range(100):
+        key = rank_between(None, b)
+        assert key.startswith(_SMALLEST_INTEGER) and key < b
+        b = key
+    # the integer part itself is reserved so that something can always go first
+    with pytest.raises(ValueError):
+        rank_between(None, _SMALLEST_INTEGER)
+
+
+def test_top_of_the_alphabet():
+    a = "z" + "z" * 26
+    for _ in range(50):
+        key = rank_between(a, None)
+        assert_between(key, a, None)
+        a = key
+
+
+@pytest.mark.parametrize("a, b", [("a0", "a0"), ("a1", "a0"), ("a0V", "a0V")])
+def test_bounds_must_be_ascending(a, b):
+    with pytest.raises(ValueError):
+        rank_between(a, b)
+
+
+@pytest.mark.parametrize("key", ["", "a", "a00", "b1", "!0"])
+def test_invalid_keys_are_rejected(key):
+    with pytest.raises((ValueError, IndexError)):
+        rank_between(key, None)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_ranks_between_returns_n_ascending_keys(seed):
+    rng = random.Random(seed)
+    bounds = sorted({rank_between(None, None)} | set(ranks_between("a0", None, 30)))
+    a, b = sorted(rng.sample(bounds, 2))
+    for lower, upper in [(a, b), (None, b), (a, None), (None, None)]:
+        n = rng.randint(0, 200)
+        keys = ranks_between(lower, upper, n)
+        assert len(keys) == n
+        assert all(x < y for x, y in zip(keys, keys[1:]))
+        for key in keys:
+            assert_between(key, lower, upper)
+
+
+def test_ranks_between_adjacent_keys_stay_short():
+    keys = ranks_between("a0", "a1", 1000)
+    assert len(keys) == 1000 and keys == sorted(set(keys))
+    # spread out: log-length growth, not one character per key
+    assert max(map(len, keys)) <= 6
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import app.main
+from app.core.config import settings
+from app.core.ratelimit import Limit, MemoryBucketStore, RateLimiter
+
+
+def test_rate_limiting_is_opt_in():
+    assert settings.model_fields["RATE_LIMIT_ENABLED"].default is False
+
+
+def test_buckets_refill_over_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.core.ratelimit.time.monotonic", lambda: clock[0])
+    store = MemoryBucketStore(maxsize=10)
+    limit = Limit.per_minute(60, burst=2)  # one token per second
+
+    async def scenario():
+        assert await store.acquire("k", limit) == 0
+        assert await store.acquire("k", limit) == 0
+        assert await store.acquire("k", limit) == pytest.approx(1.0)
+        clock[0] += 0.5
+        assert await store.acquire("k", limit) == pytest.approx(0.5)
+        clock[0] += 0.5
+        assert await store.acquire("k", limit) == 0
+        # other keys have their own bucket
+        assert await store.acquire("other", limit) == 0
+
+    asyncio.run(scenario())
+
+
+def test_lru_eviction_bounds_the_store():
+    store = MemoryBucketStore(maxsize=2)
+    limit = Limit.per_minute(60, burst=1)
+    for key in "abc":
+        asyncio.run(store.acquire(key, limit))
+    assert store.stats()["buckets"] == 2
+
+
+def test_zero_disables_a_class():
+    assert Limit.per_minute(0, burst=5) is None
+
+
+def install_limiter(monkeypatch):
+    limiter = RateLimiter(MemoryBucketStore(), limits={
+        "auth": Limit.per_minute(1, burst=2),
+        "read": Limit.per_minute(1, burst=3),
+        "write": None,
+    })
+    monkeypatch.setattr(app.main, "rate_limiter", limiter)
+    return limiter
+
+
+def test_callers_get_429_with_retry_after(client, signup, monkeypatch):
+    _, first = signup()
+    _, second = signup()
+    install_limiter(monkeypatch)
+    for _ in range(3):
+        assert client.get("/projects/", headers=first).status_code == 200
+    response = client.get("/projects/", headers=first)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    # buckets are per user
+    assert client.get("/projects/", headers=second).status_code == 200
+    # writes are unlimited here, and metrics are never limited
+    assert client.post("/projects/", json={"name": "p"}, headers=first).status_code == 200
+    assert client.get("/metrics").status_code == 200
+
+
+def test_login_is_limited_per_ip(client, signup, monkeypatch):
+    _, headers = signup()
+    limiter = install_limiter(monkeypatch)
+    login = {"email": "nobody@example.com", "password": "x"}
+    for _ in range(2):
+        assert client.post("/auth/token", json=login).status_code == 400
+    # a bearer token does not move login into a per-user bucket
+    response = client.post("/auth/token", json=login, headers=headers)
+    assert response.status_code == 429
+    assert limiter.stats()["rejected"]["auth"] >= 1
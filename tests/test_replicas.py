@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app.deps
+from app.core import replicas
+from app.core.database import Base
+from app.core.replicas import ReplicaSet
+
+
+@pytest.fixture
+def replica_set(tmp_path, monkeypatch):
+    """One replica: a separate, empty database standing in for a lagging copy."""
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path}/replica.sqlite"], use_async=False)
+    Base.metadata.create_all(replica_set.replicas[0].engine)
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+    monkeypatch.setattr(app.deps, "replica_set", replica_set)
+    yield replica_set
+    replica_set.replicas[0].engine.dispose()
+
+
+def project_names(client, headers):
+    return [item["name"] for item in client.get("/projects/", headers=headers).json()["items"]]
+
+
+def test_reads_go_to_the_replica(client, signup, replica_set):
+    _, headers = signup()
+    assert project_names(client, headers) == []
+    assert (replica_set.replica_reads, replica_set.primary_reads) == (1, 0)
+
+
+def test_writers_read_their_own_writes(client, signup, new_project, replica_set):
+    user_id, headers = signup()
+    _, bystander = signup()
+    new_project(headers, name="Fresh")
+    # the write made this user sticky; the replica has not caught up
+    assert project_names(client, headers) == ["Fresh"]
+    assert replica_set.recent_writers.get(user_id) is True
+    assert replica_set.primary_reads == 1
+    # others are unaffected
+    client.get("/projects/", headers=bystander)
+    assert replica_set.replica_reads == 1
+    # once the window passes, reads return to the replica
+    replica_set.recent_writers.clear()
+    assert project_names(client, headers) == []
+
+
+def test_failed_replicas_are_skipped_until_they_answer(client, signup, new_project, replica_set):
+    _, headers = signup()
+    new_project(headers, name="Fresh")
+    replica_set.recent_writers.clear()
+    replica, = replica_set.replicas
+    replica.mark_down(OperationalError("SELECT 1", {}, Exception("connection refused")))
+    assert project_names(client, headers) == ["Fresh"]
+    assert "connection refused" in replica_set.stats()["replicas"][0]["last_error"]
+
+    asyncio.run(replica.ping())
+    assert replica.healthy
+    assert project_names(client, headers) == []
+
+
+def test_round_robin_over_healthy_replicas(tmp_path):
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path}/a.sqlite", f"sqlite:///{tmp_path}/b.sqlite"], use_async=False)
+    first, second = replica_set.replicas
+    assert [replica_set.pick() for _ in range(4)] == [first, second, first, second]
+    second.healthy = False
+    assert {replica_set.pick() for _ in range(3)} == {first}
+    first.healthy = False
+    assert replica_set.pick() is None
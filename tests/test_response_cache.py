@@ -0,0 +1,109 @@
+import pytest
+
+from app.core.cache import ResponseCache, TTLCache, response_cache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "backend", TTLCache(maxsize=1000, ttl=30))
+    monkeypatch.setattr(response_cache, "enabled", True)
+    return response_cache
+
+
+def test_detail_is_served_from_the_cache(client, signup, new_project, cache, queries):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    first = client.get(url, headers=headers)
+    with queries() as statements:
+        second = client.get(url, headers=headers)
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    # only the membership check
+    assert len(statements) == 1
+
+
+def test_outsiders_cannot_read_a_cached_detail(client, signup, new_project, cache):
+    _, owner = signup()
+    _, outsider = signup()
+    project_id = new_project(owner)
+    assert client.get(f"/projects/{project_id}", headers=owner).status_code == 200
+    assert client.get(f"/projects/{project_id}", headers=outsider).status_code == 403
+    assert client.get(f"/projects/{project_id}", params={"include_deleted": True},
+                      headers=outsider).status_code == 403
+
+
+def test_writes_invalidate_the_detail(client, signup, new_project, cache):
+    _, headers = signup()
+    member_id, _ = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    client.get(url, headers=headers)
+    client.put(url, json={"name": "Renamed"}, headers=headers)
+    assert client.get(url, headers=headers).json()["name"] == "Renamed"
+    client.post(f"{url}/members", json={"user_id": str(member_id), "role": "viewer"}, headers=headers)
+    assert len(client.get(url, headers=headers).json()["members"]) == 2
+
+
+def test_lists_are_cached_per_user(client, signup, new_project, cache):
+    _, owner = signup()
+    member_id, member = signup()
+    assert client.get("/projects/", headers=member).json()["items"] == []
+    project_id = new_project(owner)
+    client.get("/projects/", headers=owner)
+    # adding the member retires their cached list, not just the project's
+    client.post(f"/projects/{project_id}/members", json={"user_id": str(member_id), "role": "member"},
+                headers=owner)
+    assert [item["id"] for item in client.get("/projects/", headers=member).json()["items"]] == [str(project_id)]
+    client.delete(f"/projects/{project_id}/members/{member_id}", headers=owner)
+    assert client.get("/projects/", headers=member).json()["items"] == []
+
+
+def test_members_excluded_on_request(client, signup, new_project, cache):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    assert len(client.get(url, headers=headers).json()["members"]) == 1
+    assert client.get(url, params={"include_members": False}, headers=headers).json()["members"] == []
+
+
+def test_generations_orphan_old_entries():
+    class Store(dict):
+        def set(self, key, value, ttl=None):
+            self[key] = value
+
+        def delete(self, key):
+            self.pop(key, None)
+
+    cache = ResponseCache(Store(), ttl=60)
+    key = cache.key("project:1", "a")
+    cache.set(key, b"body", "etag")
+    assert cache.get(key) == (b"body", "etag")
+    cache.invalidate("project:1")
+    assert cache.get(cache.key("project:1", "a")) is None
+    assert ResponseCache(Store(), ttl=60, enabled=False).key("project:1") is None
+
+
+def test_deleted_projects_are_shown_to_their_owner_only(client, signup, new_project):
+    _, owner = signup()
+    member_id, member = signup()
+    project_id = new_project(owner, {member_id: "admin"})
+    url = f"/projects/{project_id}"
+    assert client.get(url, params={"include_deleted": True}, headers=member).status_code == 200
+    client.delete(url, headers=owner)
+    assert client.get(url, headers=owner).status_code == 404
+    assert client.get(url, params={"include_deleted": True}, headers=owner).json()["is_deleted"] is True
+    assert client.get(url, params={"include_deleted": True}, headers=member).status_code == 404
+
+
+def test_task_writes_leave_cached_bodies_correct(client, signup, new_project, cache, monkeypatch):
+    _, headers = signup()
+    project_id = new_project(headers)
+    url = f"/projects/{project_id}"
+    cached = client.get(url, headers=headers).json(), client.get("/projects/", headers=headers).json()
+    task = client.post("/tasks/", json={"title": "t", "project_id": str(project_id)}, headers=headers).json()
+    client.patch(f"/tasks/{task['id']}/move", json={"status": "done"}, headers=headers)
+    assert (client.get(url, headers=headers).json(), client.get("/projects/", headers=headers).json()) == cached
+    # and they still match what the database says now
+    monkeypatch.setattr(cache, "enabled", False)
+    assert (client.get(url, headers=headers).json(), client.get("/projects/", headers=headers).json()) == cached
@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.models.task import Task
+
+
+def add_tasks(client, headers, project_id, count, **fields):
+    items = [{"title": f"Task {index}", "project_id": str(project_id), **fields} for index in range(count)]
+    return [r["id"] for r in client.post("/tasks/bulk", json={"items": items}, headers=headers).json()["results"]]
+
+
+def list_tasks(client, headers, **params):
+    response = client.get("/tasks/", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_only_visible_projects_are_listed(client, signup, new_project):
+    _, owner = signup()
+    _, outsider = signup()
+    project_id = new_project(owner)
+    add_tasks(client, owner, project_id, 2)
+    assert len(list_tasks(client, owner)["items"]) == 2
+    assert list_tasks(client, outsider)["items"] == []
+    assert client.get("/tasks/", params={"project_id": str(project_id)}, headers=outsider).status_code == 403
+
+
+def test_filters_combine(client, signup, new_project, db):
+    me, headers = signup()
+    project_id = new_project(headers)
+    other_project = new_project(headers)
+    mine = add_tasks(client, headers, project_id, 3, assignee_id=str(me))
+    add_tasks(client, headers, project_id, 2)
+    add_tasks(client, headers, other_project, 2, assignee_id=str(me))
+    client.patch("/tasks/status/bulk", json={"task_ids": mine[:2], "status": "done"}, headers=headers)
+
+    assert len(list_tasks(client, headers, project_id=str(project_id))["items"]) == 5
+    assert len(list_tasks(client, headers, mine=True)["items"]) == 5
+    assert len(list_tasks(client, headers, assignee_id=str(me), project_id=str(project_id))["items"]) == 3
+    done = list_tasks(client, headers, project_id=str(project_id), status=["done", "todo"])["items"]
+    assert {item["id"] for item in done} == set(mine[:2])
+
+    db.execute(update(Task).where(Task.id.in_(map(uuid.UUID, mine))).values(created_at=datetime(2020, 1, 1)))
+    db.commit()
+    old = list_tasks(client, headers, created_before="2021-01-01T00:00:00")["items"]
+    assert {item["id"] for item in old} == set(mine)
+    recent = list_tasks(client, headers, project_id=str(project_id),
+                        created_after=(datetime(2020, 1, 1) + timedelta(days=1)).isoformat())["items"]
+    assert len(recent) == 2
+
+
+def test_cursor_walks_every_task_once(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    created = set(add_tasks(client, headers, project_id, 7))
+    seen, cursor = [], None
+    while True:
+        page = list_tasks(client, headers, limit=3, **({"cursor": cursor} if cursor else {}))
+        seen += [item["id"] for item in page["items"]]
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    assert len(seen) == 7 and set(seen) == created
+    assert client.get("/tasks/", params={"cursor": "garbage"}, headers=headers).status_code == 400
+
+
+def test_fields_limit_the_response(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    add_tasks(client, headers, project_id, 1)
+    item, = list_tasks(client, headers, fields="id, title,status")["items"]
+    assert set(item) == {"id", "title", "status"}
+    assert client.get("/tasks/", params={"fields": "id,secret"}, headers=headers).status_code == 400
+    assert client.get("/tasks/", params={"fields": " , "}, headers=headers).status_code == 400
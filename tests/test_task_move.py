@@ -0,0 +1,99 @@
+from app.core import events
+from app.core.config import settings
+from app.models.task import TaskStatus
+from app.services import task_service
+
+
+def add_tasks(client, headers, project_id, count):
+    items = [{"title": f"Task {index}", "project_id": str(project_id)} for index in range(count)]
+    return [result["id"] for result in client.post("/tasks/bulk", json={"items": items}, headers=headers)
+            .json()["results"]]
+
+
+def column(client, headers, project_id, status="backlog"):
+    board = client.get(f"/projects/{project_id}/board", params={"status": status}, headers=headers).json()
+    return board["columns"][0]["items"]
+
+
+def test_move_to_the_head_writes_one_row(client, signup, new_project, queries):
+    _, headers = signup()
+    project_id = new_project(headers)
+    first, second, third = add_tasks(client, headers, project_id, 3)
+    with queries() as statements:
+        response = client.patch(f"/tasks/{third}/move", json={"after_id": first}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [item["id"] for item in column(client, headers, project_id)] == [third, first, second]
+    assert sum(1 for s in statements if s.startswith("UPDATE tasks")) == 1
+
+
+def test_move_between_neighbours_in_another_column(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    a, b, c = add_tasks(client, headers, project_id, 3)
+    client.patch("/tasks/status/bulk", json={"task_ids": [a, b], "status": "todo"}, headers=headers)
+    response = client.patch(f"/tasks/{c}/move", json={"status": "todo", "before_id": a, "after_id": b},
+                            headers=headers)
+    assert response.json()["status"] == "todo"
+    assert [item["id"] for item in column(client, headers, project_id, "todo")] == [a, c, b]
+
+
+def test_neighbours_must_be_in_the_target_column(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    a, b = add_tasks(client, headers, project_id, 2)
+    assert client.patch(f"/tasks/{a}/move", json={"status": "done", "before_id": b},
+                        headers=headers).status_code == 400
+    assert client.patch(f"/tasks/{a}/move", json={"before_id": a}, headers=headers).status_code == 400
+
+
+def test_long_keys_trigger_a_rebalance(client, signup, new_project, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_RANK_REBALANCE_LENGTH", 4)
+    _, headers = signup()
+    project_id = new_project(headers)
+    first, *rest = add_tasks(client, headers, project_id, 8)
+    # keep squeezing tasks in right after the first one
+    for task_id in rest:
+        client.patch(f"/tasks/{task_id}/move", json={"before_id": first}, headers=headers)
+    items = column(client, headers, project_id)
+    assert [item["id"] for item in items] == [first] + rest[::-1]
+    assert max(len(item["rank"]) for item in items) <= 4
+
+
+def test_viewers_cannot_move_tasks(client, signup, new_project):
+    viewer_id, viewer = signup()
+    _, owner = signup()
+    project_id = new_project(owner, {viewer_id: "viewer"})
+    task_id, = add_tasks(client, owner, project_id, 1)
+    assert client.patch(f"/tasks/{task_id}/move", json={"status": "done"}, headers=viewer).status_code == 403
+
+
+def test_move_and_rebalance_take_the_column_lock_first(client, signup, new_project, queries, monkeypatch):
+    _, headers = signup()
+    project_id = new_project(headers)
+    first, second = add_tasks(client, headers, project_id, 2)
+    with queries() as statements:
+        taken = []
+        lock_column = task_service._lock_column
+        monkeypatch.setattr(task_service, "_lock_column",
+                            lambda db, *column: taken.append((column, len(statements))) or lock_column(db, *column))
+        client.patch(f"/tasks/{second}/move", json={"status": "todo"}, headers=headers)
+    (column_locked, position), = taken
+    assert column_locked == (project_id, TaskStatus.todo)
+    # before the task rows are loaded (and locked, on Postgres)
+    row_reads = [index for index, s in enumerate(statements) if s.startswith("SELECT tasks.id AS tasks_id, tasks.title")]
+    assert row_reads and row_reads[0] >= position
+
+    task_service.rebalance_column(project_id, TaskStatus.backlog)
+    assert taken[-1][0] == (project_id, TaskStatus.backlog)
+
+
+def test_rebalances_are_announced(client, signup, new_project, monkeypatch):
+    _, headers = signup()
+    project_id = new_project(headers)
+    first, second = add_tasks(client, headers, project_id, 2)
+    sent = []
+    monkeypatch.setattr(events, "publish", lambda project_id, type, data: sent.append((type, data)))
+    task_service.rebalance_column(project_id, TaskStatus.backlog)
+    assert sent == [("board.rebalanced", {"project_id": project_id, "status": TaskStatus.backlog})]
+    board = column(client, headers, project_id)
+    assert [item["id"] for item in board] == [first, second]
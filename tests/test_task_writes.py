@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from app.core import events
+
+
+def create(client, headers, project_id, title="Task"):
+    return client.post("/tasks/", json={"title": title, "project_id": str(project_id)}, headers=headers)
+
+
+def set_status(client, headers, task_id, status):
+    return client.patch(f"/tasks/status/{task_id}/", params={"status": status}, headers=headers)
+
+
+def stats(client, headers, project_id):
+    response = client.get(f"/projects/{project_id}/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    sent = []
+    monkeypatch.setattr(events, "publish", lambda project_id, type, data: sent.append(type))
+    return sent
+
+
+def test_outsiders_cannot_write_tasks(client, signup, new_project):
+    _, owner = signup()
+    _, outsider = signup()
+    viewer_id, viewer = signup()
+    project_id = new_project(owner, {viewer_id: "viewer"})
+    task_id = create(client, owner, project_id).json()["id"]
+    for headers in (outsider, viewer):
+        assert create(client, headers, project_id).status_code == 403
+        assert set_status(client, headers, task_id, "done").status_code == 403
+    assert create(client, owner, uuid.uuid4()).status_code == 404
+    assert set_status(client, owner, uuid.uuid4(), "done").status_code == 404
+    assert stats(client, owner, project_id)["total"] == 1
+
+
+def test_counters_and_history_follow_every_write(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    ids = [create(client, headers, project_id, f"Task {index}").json()["id"] for index in range(4)]
+    set_status(client, headers, ids[0], "in_progress")
+    set_status(client, headers, ids[0], "done")
+    client.patch("/tasks/status/bulk", json={"task_ids": ids[1:3], "status": "in_progress"}, headers=headers)
+    client.patch(f"/tasks/{ids[3]}/move", json={"status": "todo"}, headers=headers)
+
+    result = stats(client, headers, project_id)
+    assert {column["status"]: column["count"] for column in result["columns"]} == \
+        {"backlog": 0, "todo": 1, "in_progress": 2, "done": 1}
+    assert (result["total"], result["wip"], result["throughput"]) == (4, 2, 1)
+    assert result["cycle_time"]["tasks"] == 1
+    assert result["flow"][-1]["counts"] == {"backlog": 0, "todo": 1, "in_progress": 2, "done": 1}
+    assert len(result["flow"]) == 14
+
+
+def test_unchanged_status_writes_nothing(client, signup, new_project, published, queries):
+    _, headers = signup()
+    project_id = new_project(headers)
+    task_id = create(client, headers, project_id).json()["id"]
+    board = f"/projects/{project_id}/board"
+    etag = client.get(board, headers=headers).headers["ETag"]
+    published.clear()
+
+    with queries() as statements:
+        response = set_status(client, headers, task_id, "backlog")
+    assert response.status_code == 200 and response.json()["status"] == "backlog"
+    assert not any(s.startswith(("UPDATE", "INSERT")) for s in statements)
+    assert published == []
+    assert client.get(board, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    assert set_status(client, headers, task_id, "todo").status_code == 200
+    assert published == ["task.status_changed"]
+    assert client.get(board, headers={**headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_status_change_appends_to_the_target_column(client, signup, new_project):
+    _, headers = signup()
+    project_id = new_project(headers)
+    first, second = (create(client, headers, project_id, title).json()["id"] for title in ("a", "b"))
+    set_status(client, headers, second, "todo")
+    set_status(client, headers, first, "todo")
+    todo = client.get(f"/projects/{project_id}/board", params={"status": "todo"}, headers=headers).json()
+    assert [item["id"] for item in todo["columns"][0]["items"]] == [second, first]